@@ -0,0 +1,35 @@
+# Energy consumption estimator of systems made of sensors, a microcontroller and a radio interface.
+# The core model only needs NumPy. Everything that needs pandas or matplotlib is imported the first time it is used
+from .components import Sensor, Microcontroller, RadioInterface, SENSOR_FIELDS, MICROCONTROLLER_FIELDS, RADIO_INTERFACE_FIELDS
+from .schedule import Schedule, merge_intervals, combine_schedules
+from .model import (SystemConsumtion, ElementConsumption, get_sensor_consumption, get_radio_interface_consumption, get_packet_radio_interface_consumption,
+                    get_microcontroller_consumption, get_system_energy_consumption, get_energy_arrays, get_consumption_results)
+from .cache import ConsumptionCache, get_cache_key
+from .instrumentation import Instrumentation
+from .simulation import ConsumptionAggregate, ConsumptionWindow, get_elements, get_current_matrix, simulate_consumption
+from .battery import Battery, BATTERY_FIELDS, get_state_of_charge, get_battery_lifetime, get_battery_lifetime_arrays
+from .harvesting import HarvestingProfile, EnergyBalance, get_daily_harvesting_profile, load_harvesting_profile, get_energy_balance
+from .states import (PowerStateModel, StateConsumption, get_microcontroller_state_model, get_radio_interface_state_model,
+                     get_sensor_state_model, get_state_consumption, get_periodic_state_consumption)
+from .transmission import PacketModel, TransmissionEvents, PACKET_MODEL_FIELDS, get_transmission_events, get_transmission_time_arrays
+from .montecarlo import MonteCarloConsumption, get_monte_carlo_consumption
+from .incremental import SystemConsumptionModel
+from .optimizer import ConfigurationCandidate, ParetoFront, optimize_system_configuration
+from .catalog import ComponentCatalog, parse_sensor, parse_microcontroller, parse_radio_interface, load_components
+
+# Names of the modules with heavy dependencies, loaded on first access
+LAZY_ATTRIBUTES = {
+    "get_fleet_table": "fleet",
+    "FleetConsumption": "fleet",
+    "get_fleet_energy_consumption": "fleet",
+    "sweep_system_energy_consumption": "sweep",
+    "get_consumption_summary": "reporting",
+    "get_consumption_report": "reporting",
+    "show_consumptions": "plotting",
+}
+
+def __getattr__(name):
+    if name in LAZY_ATTRIBUTES:
+        import importlib
+        return getattr(importlib.import_module("." + LAZY_ATTRIBUTES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,240 @@
+import argparse
+import json
+import math
+import sys
+
+from .components import Sensor, Microcontroller, RadioInterface
+from .model import get_system_energy_consumption, get_consumption_results
+from .battery import Battery, get_battery_lifetime, get_battery_lifetime_arrays
+from .montecarlo import get_monte_carlo_consumption
+from .transmission import PacketModel
+from .instrumentation import Instrumentation, NO_INSTRUMENTATION
+from .optimizer import optimize_system_configuration
+from .catalog import ComponentCatalog, load_components, parse_sensor, parse_microcontroller, parse_radio_interface
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(prog="python -m consumption_calculator", description="Estimate the energy consumption of a system of sensors, a microcontroller and a radio interface")
+    subparsers = parser.add_subparsers(dest="command")
+    run_parser = subparsers.add_parser("run", help="Calculate the energy consumption of the system described in a configuration file, without prompts")
+    run_parser.add_argument("config", help="JSON or YAML configuration file")
+    run_parser.add_argument("--output", default=None, help="JSON file where the results are written. Standard output by default")
+    run_parser.add_argument("--report", default=None, help="JSON file where the time of every stage and the counters of the run are written")
+    run_parser.add_argument("--profile", default=None, help="File where the cProfile statistics of the run are written")
+    sweep_parser = subparsers.add_parser("sweep", help="Evaluate every combination of catalog components and rates")
+    sweep_parser.add_argument("--sensors", nargs="+", required=True, help="Sensor subsets as comma-separated positions in sensors.txt (e.g. 0,1 0,1,2)")
+    sweep_parser.add_argument("--microcontrollers", nargs="+", type=int, default=[0], help="Positions in microcontrollers.txt")
+    sweep_parser.add_argument("--radio-interfaces", nargs="+", type=int, default=[0], help="Positions in radio_interfaces.txt")
+    sweep_parser.add_argument("--sampling-rates", nargs="+", type=float, default=[None], help="Sampling rates (Hz) applied to all the sensors. Catalog values by default")
+    sweep_parser.add_argument("--data-refresh-rates", nargs="+", type=float, default=[None], help="Data refresh rates (Hz) of the radio interface. Catalog values by default")
+    sweep_parser.add_argument("--durations", nargs="+", type=int, default=[86400], help="Durations of the measurement (seconds)")
+    sweep_parser.add_argument("--workers", type=int, default=None, help="Number of worker processes. All the cores by default")
+    sweep_parser.add_argument("--output", default="sweep.csv", help="CSV file where the results are written")
+    optimize_parser = subparsers.add_parser("optimize", help="Find the sampling rates and data refresh rate with the lowest energy for every latency")
+    optimize_parser.add_argument("--sensors", required=True, help="Sensors as comma-separated positions in sensors.txt (e.g. 0,1,2)")
+    optimize_parser.add_argument("--microcontrollers", nargs="+", type=int, default=None, help="Positions in microcontrollers.txt. All of them by default")
+    optimize_parser.add_argument("--radio-interfaces", nargs="+", type=int, default=None, help="Positions in radio_interfaces.txt. All of them by default")
+    optimize_parser.add_argument("--duration", type=int, default=86400, help="Duration of the measurement (seconds)")
+    optimize_parser.add_argument("--max-latency", type=float, required=True, help="Longest accepted time (seconds) between a measure and its transmission")
+    optimize_parser.add_argument("--min-latency", type=float, default=60, help="Shortest latency (seconds) of the Pareto front")
+    optimize_parser.add_argument("--min-samples-per-hour", type=float, required=True, help="Minimum number of measures per hour of every sensor. The front always measures at this rate, as more measures only cost energy")
+    optimize_parser.add_argument("--output", default=None, help="JSON file where the Pareto front is written. Standard output by default")
+    benchmark_parser = subparsers.add_parser("benchmark", help="Measure the model, reporting and catalog stages on synthetic workloads")
+    benchmark_parser.add_argument("--quick", action="store_true", help="Only the small workloads")
+    benchmark_parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs of every stage. The best one is kept")
+    benchmark_parser.add_argument("--output", default="benchmark.json", help="JSON file where the results are written")
+    benchmark_parser.add_argument("--baseline", default=None, help="JSON results of a previous run to compare with")
+    benchmark_parser.add_argument("--threshold", type=float, default=0.25, help="Growth over the baseline reported as a regression (0.25 is 25%%)")
+    serve_parser = subparsers.add_parser("serve", help="Serve the energy estimates as a local HTTP/JSON service")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    serve_parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    serve_parser.add_argument("--workers", type=int, default=None, help="Number of worker processes. All the cores by default")
+    serve_parser.add_argument("--database", default=None, help="SQLite catalog served from memory. The text catalogs by default")
+    catalog_parser = subparsers.add_parser("import-catalog", help="Import sensors.txt, microcontrollers.txt and radio_interfaces.txt into a SQLite catalog")
+    catalog_parser.add_argument("--database", default="catalog.db", help="SQLite file of the catalog")
+    return parser.parse_args()
+
+def load_config(file_name):
+    with open(file_name, "r") as file:
+        if file_name.endswith((".yaml", ".yml")):
+            # YAML support is optional
+            try:
+                import yaml
+            except ImportError:
+                raise SystemExit("PyYAML is needed to read YAML configuration files: pip install pyyaml")
+            return yaml.safe_load(file)
+        return json.load(file)
+
+def get_component(description, kind, component_class, catalog):
+    # Components are given by their constructor fields or by their name in the catalog
+    if isinstance(description, str):
+        if catalog is None:
+            raise ValueError(f"The {kind} '{description}' is given by name but the configuration has no catalog")
+        return catalog.get(kind, description)
+    return component_class(**description)
+
+def get_json_lifetime(lifetime):
+    # JSON has no infinity: a battery that outlives max_lifetime or has no load has a null lifetime
+    return lifetime if math.isfinite(lifetime) else None
+
+def run_config(config, instrumentation=None):
+    # Results of the system described by a configuration:
+    # {"duration": 86400, "mode": "analytic", "resolution": 1, "catalog": "catalog.db",
+    #  "sensors": [{"name": ..., ...} or "name in the catalog"], "microcontroller": ..., "radio_interface": ...,
+    #  "battery": {"name": ..., "capacity": ..., ...}, "packet_model": {"header_size": 40, "mtu": 100, "retry_probability": 0.1, "max_retries": 3},
+    #  "monte_carlo": {"samples": 10000, "seed": 0, "percentiles": [5, 50, 95], "distributions": {"sensors.active_consumption": ["tolerance", 0.1]}}}
+    if instrumentation is None:
+        instrumentation = NO_INSTRUMENTATION
+    instrumentation.start_stage("components")
+    catalog = ComponentCatalog(config["catalog"]) if "catalog" in config else None
+    sensors = [get_component(sensor, "sensor", Sensor, catalog) for sensor in config["sensors"]]
+    microcontroller = get_component(config["microcontroller"], "microcontroller", Microcontroller, catalog)
+    radio_interface = get_component(config["radio_interface"], "radio_interface", RadioInterface, catalog)
+    if catalog is not None:
+        catalog.close()
+    mode = config.get("mode", "analytic")
+    packet_model = PacketModel(**config["packet_model"]) if "packet_model" in config else None
+    system_consumption = get_system_energy_consumption(sensors, microcontroller, radio_interface, config["duration"], mode, config.get("resolution", 1), packet_model=packet_model, instrumentation=instrumentation)
+    results = get_consumption_results(system_consumption)
+    if "battery" in config:
+        instrumentation.start_stage("battery_lifetime")
+        battery = Battery(**config["battery"])
+        if mode == "timeline":
+            battery_lifetime = get_battery_lifetime(battery, system_consumption)
+        else:
+            # From the mean current of the energy totals, as every sample of the Monte Carlo analysis, so the nominal
+            # lifetime and the percentiles come from the same current model
+            battery_lifetime = float(get_battery_lifetime_arrays(vars(battery), system_consumption.get_total_energy() / config["duration"]))
+        results["battery_lifetime"] = get_json_lifetime(battery_lifetime)
+    if "monte_carlo" in config:
+        instrumentation.start_stage("monte_carlo")
+        monte_carlo = config["monte_carlo"]
+        monte_carlo_consumption = get_monte_carlo_consumption(
+            sensors, microcontroller, radio_interface, config["duration"], monte_carlo.get("distributions", {}), monte_carlo.get("samples", 10000),
+            Battery(**config["battery"]) if "battery" in config else None, monte_carlo.get("seed"), packet_model=packet_model)
+        results["monte_carlo"] = monte_carlo_consumption.get_percentiles(monte_carlo.get("percentiles", (5, 50, 95)))
+        if "battery_lifetime" in results["monte_carlo"]:
+            results["monte_carlo"]["battery_lifetime"] = {percentile: get_json_lifetime(lifetime) for percentile, lifetime in results["monte_carlo"]["battery_lifetime"].items()}
+    instrumentation.stop_stage()
+    return results
+
+def run(arguments):
+    instrumentation = None
+    if arguments.report is not None or arguments.profile is not None:
+        instrumentation = Instrumentation(profile=arguments.profile is not None)
+    results = run_config(load_config(arguments.config), instrumentation)
+    if arguments.report is not None:
+        instrumentation.write_report(arguments.report)
+    if arguments.profile is not None:
+        instrumentation.dump_profile(arguments.profile)
+    if arguments.output is None:
+        json.dump(results, sys.stdout, indent=4, allow_nan=False)
+        print()
+    else:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent=4, allow_nan=False)
+
+def run_import_catalog(arguments):
+    catalog = ComponentCatalog(arguments.database)
+    for file_name, kind in (("sensors.txt", "sensor"), ("microcontrollers.txt", "microcontroller"), ("radio_interfaces.txt", "radio_interface")):
+        print(f"{catalog.import_text_catalog(file_name, kind)} components imported from {file_name}")
+    catalog.close()
+
+def run_sweep(arguments):
+    from .sweep import sweep_system_energy_consumption
+    all_sensors = load_components("sensors.txt", parse_sensor)
+    all_microcontrollers = load_components("microcontrollers.txt", parse_microcontroller)
+    all_radio_interfaces = load_components("radio_interfaces.txt", parse_radio_interface)
+    sensor_subsets = [[all_sensors[int(index)] for index in subset.split(",")] for subset in arguments.sensors]
+    results = sweep_system_energy_consumption(
+        sensor_subsets,
+        [all_microcontrollers[index] for index in arguments.microcontrollers],
+        [all_radio_interfaces[index] for index in arguments.radio_interfaces],
+        arguments.sampling_rates,
+        arguments.data_refresh_rates,
+        arguments.durations,
+        max_workers=arguments.workers)
+    results.to_csv(arguments.output, index=False)
+    print(f"{len(results)} configurations written to {arguments.output}")
+
+def run_optimize(arguments):
+    all_sensors = load_components("sensors.txt", parse_sensor)
+    microcontrollers = load_components("microcontrollers.txt", parse_microcontroller)
+    radio_interfaces = load_components("radio_interfaces.txt", parse_radio_interface)
+    if arguments.microcontrollers is not None:
+        microcontrollers = [microcontrollers[index] for index in arguments.microcontrollers]
+    if arguments.radio_interfaces is not None:
+        radio_interfaces = [radio_interfaces[index] for index in arguments.radio_interfaces]
+    pareto_front = optimize_system_configuration(
+        [all_sensors[int(index)] for index in arguments.sensors.split(",")],
+        microcontrollers,
+        radio_interfaces,
+        arguments.duration,
+        arguments.max_latency,
+        arguments.min_samples_per_hour,
+        arguments.min_latency)
+    if arguments.output is None:
+        json.dump(pareto_front.get_results(), sys.stdout, indent=4)
+        print()
+    else:
+        with open(arguments.output, "w") as file:
+            json.dump(pareto_front.get_results(), file, indent=4)
+
+def run_benchmark(arguments):
+    from .benchmark import run_benchmarks, compare_benchmarks
+    benchmarks = run_benchmarks(arguments.quick, arguments.repeat)
+    with open(arguments.output, "w") as file:
+        json.dump(benchmarks, file, indent=4)
+    print(f"{len(benchmarks['results'])} stages written to {arguments.output}")
+    if arguments.baseline is not None:
+        with open(arguments.baseline, "r") as file:
+            regressions = compare_benchmarks(benchmarks, json.load(file), arguments.threshold)
+        for regression in regressions:
+            print(f"Regression in {regression['stage']} {regression['parameters']}: {regression['metric']} "
+                  f"{regression['baseline']:.6g} -> {regression['value']:.6g} ({regression['ratio']:.2f}x)")
+        if regressions:
+            raise SystemExit(1)
+        print("No regressions")
+
+def run_serve(arguments):
+    from .service import run_service
+    try:
+        run_service(arguments.host, arguments.port, arguments.workers, arguments.database)
+    except KeyboardInterrupt:
+        print("Service stopped")
+
+def run_interactive():
+    from .interactive import get_user_input, read_sensors, read_microcontroller, read_radio_interface
+    from .plotting import show_consumptions
+    # First ask to the user if wants to enter a new sensor, microcontroller or radio interface
+    get_user_input()
+    # Read from prompt the sensors, microcontroller and radio interface
+    sensors = read_sensors()
+    microcontroller = read_microcontroller()
+    radio_interface = read_radio_interface()
+    # Read from prompt the duration of the measurement
+    duration = int(input("Enter the duration of the measurement (seconds): "))
+    # Calculate the energy consumption of the system
+    system_consumption = get_system_energy_consumption(sensors, microcontroller, radio_interface, duration)
+    # Generate plots and tables with the energy consumption of the system
+    show_consumptions(system_consumption, sensors, microcontroller, radio_interface, duration)
+    print(f"Total energy consumption: {system_consumption} mAs")
+
+def main():
+    arguments = parse_arguments()
+    if arguments.command == "run":
+        run(arguments)
+    elif arguments.command == "sweep":
+        run_sweep(arguments)
+    elif arguments.command == "optimize":
+        run_optimize(arguments)
+    elif arguments.command == "benchmark":
+        run_benchmark(arguments)
+    elif arguments.command == "serve":
+        run_serve(arguments)
+    elif arguments.command == "import-catalog":
+        run_import_catalog(arguments)
+    else:
+        run_interactive()
+
+if __name__ == "__main__":
+    main()
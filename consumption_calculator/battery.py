@@ -0,0 +1,113 @@
+import math
+import numpy as np
+
+from .simulation import simulate_consumption
+
+# Constructor fields of the battery, in order
+BATTERY_FIELDS = ["name", "capacity", "full_voltage", "empty_voltage", "cutoff_voltage", "self_discharge"]
+
+class Battery:
+    def __init__(self, name, capacity, full_voltage, empty_voltage, cutoff_voltage, self_discharge):
+        self.name = name
+        self.capacity = capacity # in mAh
+        self.full_voltage = full_voltage # in V. Open circuit voltage when fully charged
+        self.empty_voltage = empty_voltage # in V. Open circuit voltage when fully discharged
+        self.cutoff_voltage = cutoff_voltage # in V. The system stops working below this voltage
+        self.self_discharge = self_discharge # Fraction of the charge lost per month (30 days) without any load
+
+    def __repr__(self):
+        return (f"Battery(name={self.name}, "
+                f"capacity={self.capacity}, "
+                f"full_voltage={self.full_voltage}, "
+                f"empty_voltage={self.empty_voltage}, "
+                f"cutoff_voltage={self.cutoff_voltage}, "
+                f"self_discharge={self.self_discharge})")
+    def get_self_discharge_rate(self):
+        # Self-discharge is proportional to the remaining charge: dQ/dt = -k*Q. In 1/s
+        return -math.log(1 - self.self_discharge) / (30 * 86400)
+    def get_cutoff_state_of_charge(self):
+        # The open circuit voltage is approximated as linear with the state of charge
+        return min(max((self.cutoff_voltage - self.empty_voltage) / (self.full_voltage - self.empty_voltage), 0), 1)
+    def get_voltage(self, state_of_charge):
+        return self.empty_voltage + (self.full_voltage - self.empty_voltage) * np.asarray(state_of_charge)
+
+def get_discharge_time(rate, time):
+    # Integral of exp(-rate*s) from 0 to time: the time equivalent of a constant current under self-discharge
+    time = np.asarray(time, dtype=float)
+    if rate == 0:
+        return time
+    return -np.expm1(-rate * time) / rate
+
+def get_state_of_charge(battery, currents, resolution=1, initial_state_of_charge=1):
+    # State of charge after every sample of a current timeline (mA). With self-discharge the charge is
+    # Q(t) = exp(-k*t) * (Q0 - sum(I(s) * exp(k*s) * ds)), so the whole timeline is one cumulative sum.
+    # initial_state_of_charge allows chaining the windows of simulate_consumption
+    currents = np.asarray(currents, dtype=float)
+    if currents.ndim == 2:
+        currents = currents.sum(axis=0) # One row per element
+    rate = battery.get_self_discharge_rate()
+    times = np.arange(1, len(currents) + 1) / resolution
+    # The integral of exp(k*s) over a sample ending at t is exp(k*t) * get_discharge_time(k, 1 / resolution)
+    sample_charges = currents * get_discharge_time(rate, 1 / resolution) * np.exp(rate * times)
+    charge = np.exp(-rate * times) * (initial_state_of_charge * battery.capacity * 3600 - np.cumsum(sample_charges))
+    return charge / (battery.capacity * 3600)
+
+def get_battery_lifetime(battery, system_consumption, window=3600, max_lifetime=100*365*86400):
+    # Time (s) until the battery reaches its cutoff voltage when the simulated duration repeats again and again.
+    # The current is taken as constant inside every window of simulate_consumption, so the remaining charge at
+    # any time has a closed form and the lifetime is found by bisection instead of simulating the whole life
+    window_starts = []
+    window_charges = []
+    for consumption_window in simulate_consumption(system_consumption, window):
+        window_starts.append(consumption_window.start)
+        window_charges.append(consumption_window.currents.sum() / consumption_window.aggregate.resolution)
+    window_ends = np.append(window_starts[1:], consumption_window.end)
+    window_starts = np.array(window_starts)
+    window_lengths = window_ends - window_starts
+    window_currents = np.array(window_charges) / window_lengths
+    cycle = window_ends[-1]
+    rate = battery.get_self_discharge_rate()
+    # Within a cycle the charge at the start of window i is Q(T_i) = exp(-k*T_i)*Q(0) - offsets[i]
+    window_offsets = window_currents * get_discharge_time(rate, window_lengths) * np.exp(rate * window_ends)
+    offsets = np.exp(-rate * np.append(window_starts, cycle)) * np.concatenate(([0], np.cumsum(window_offsets)))
+    cycle_decay = math.exp(-rate * cycle)
+    cutoff_charge = battery.get_cutoff_state_of_charge() * battery.capacity * 3600
+
+    def get_remaining_charge(time):
+        # Charge (mAs) left after time seconds, stepping whole cycles and windows in closed form
+        cycles = math.floor(time / cycle)
+        if cycle_decay == 1:
+            charge = battery.capacity * 3600 - offsets[-1] * cycles
+        else:
+            charge = cycle_decay**cycles * battery.capacity * 3600 - offsets[-1] * (1 - cycle_decay**cycles) / (1 - cycle_decay)
+        time_in_cycle = time - cycles * cycle
+        i = min(np.searchsorted(window_ends, time_in_cycle, side='right'), len(window_starts) - 1)
+        charge = math.exp(-rate * window_starts[i]) * charge - offsets[i]
+        elapsed = time_in_cycle - window_starts[i]
+        return math.exp(-rate * elapsed) * charge - window_currents[i] * get_discharge_time(rate, elapsed)
+
+    if get_remaining_charge(max_lifetime) > cutoff_charge:
+        return math.inf
+    # Bracket the lifetime doubling the time, then bisect it to a resolution of one second
+    lower, upper = 0, min(cycle, max_lifetime)
+    while get_remaining_charge(upper) > cutoff_charge:
+        lower, upper = upper, min(upper * 2, max_lifetime)
+    while upper - lower > 1:
+        middle = (lower + upper) / 2
+        if get_remaining_charge(middle) > cutoff_charge:
+            lower = middle
+        else:
+            upper = middle
+    return upper
+
+def get_battery_lifetime_arrays(battery_fields, current):
+    # Lifetime (s) of many batteries under a constant current (mA), e.g. the mean current of get_energy_arrays.
+    # Every field is a NumPy array. Solving exp(-k*t)*Q0 - I*(1 - exp(-k*t))/k = Qc gives
+    # t = log(1 + k*(Q0 - Qc)/(k*Qc + I))/k, and t = (Q0 - Qc)/I without self-discharge
+    current = np.asarray(current, dtype=float)
+    rate = -np.log1p(-np.asarray(battery_fields["self_discharge"], dtype=float)) / (30 * 86400)
+    cutoff_state_of_charge = np.clip((battery_fields["cutoff_voltage"] - battery_fields["empty_voltage"]) / (battery_fields["full_voltage"] - battery_fields["empty_voltage"]), 0, 1)
+    charge = np.asarray(battery_fields["capacity"], dtype=float) * 3600
+    cutoff_charge = cutoff_state_of_charge * charge
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(rate > 0, np.log1p(rate * (charge - cutoff_charge) / (rate * cutoff_charge + current)) / rate, (charge - cutoff_charge) / current)
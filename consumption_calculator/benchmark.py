@@ -0,0 +1,159 @@
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+
+from .components import Sensor, Microcontroller, RadioInterface
+from .model import get_system_energy_consumption
+from .simulation import simulate_consumption
+from .catalog import ComponentCatalog, load_components, parse_sensor
+
+# Sizes of the synthetic workloads. The quick suite is meant for a check before every commit
+DURATIONS = [3600, 86400, 7 * 86400, 30 * 86400, 365 * 86400]
+SENSOR_COUNTS = [1, 10, 100]
+CATALOG_SIZES = [10, 1000, 100000]
+QUICK_DURATIONS = [3600, 86400]
+QUICK_SENSOR_COUNTS = [1, 10]
+QUICK_CATALOG_SIZES = [10, 1000]
+# Timelines of every sample are only built up to this many sensors
+MAX_TIMELINE_SENSORS = 10
+
+def get_synthetic_sensors(number_of_sensors, seed=0):
+    # Sensors measuring every 5 minutes to every hour, always the same for a seed
+    rng = np.random.default_rng(seed)
+    return [Sensor(f"sensor {i}", 3.3, rng.uniform(1, 50), rng.uniform(0.001, 5), rng.uniform(1 / 3600, 1 / 300), rng.uniform(0.1, 10), rng.uniform(2, 64))
+            for i in range(number_of_sensors)]
+
+def get_synthetic_microcontroller():
+    return Microcontroller("microcontroller", 3.3, 36.2, 3.29, 0.0155)
+
+def get_synthetic_radio_interface():
+    return RadioInterface("radio interface", 3.3, 138.0, 66.2, 0.0078, 250000.0, 1 / 600)
+
+def measure(stage, parameters, function, repeat=1):
+    # Wall time (best of repeat runs) and, from one more run under tracemalloc, the peak memory and the memory
+    # and number of memory blocks still allocated at the end of the stage (blocks allocated and freed inside the
+    # stage are not counted). The result of the function is discarded
+    wall_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        wall_times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    first_snapshot = tracemalloc.take_snapshot()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    result = function()
+    current_memory, peak_memory = tracemalloc.get_traced_memory()
+    last_snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained_blocks = sum(statistic.count_diff for statistic in last_snapshot.compare_to(first_snapshot, "filename"))
+    del result
+    return {
+        "stage": stage,
+        "parameters": parameters,
+        "wall_time": min(wall_times),
+        "peak_memory": peak_memory - start_memory,
+        "retained_memory": current_memory - start_memory,
+        "retained_blocks": retained_blocks}
+
+def get_model_benchmarks(durations, sensor_counts, repeat):
+    microcontroller = get_synthetic_microcontroller()
+    radio_interface = get_synthetic_radio_interface()
+    results = []
+    for number_of_sensors in sensor_counts:
+        sensors = get_synthetic_sensors(number_of_sensors)
+        for duration in durations:
+            for mode in ("analytic", "timeline"):
+                results.append(measure("get_system_energy_consumption", {"mode": mode, "duration": duration, "sensors": number_of_sensors},
+                                       lambda: get_system_energy_consumption(sensors, microcontroller, radio_interface, duration, mode), repeat))
+            if number_of_sensors <= MAX_TIMELINE_SENSORS:
+                system_consumption = get_system_energy_consumption(sensors, microcontroller, radio_interface, duration)
+                # Consumes the windows as a long batch job would, keeping only the aggregate
+                def simulate():
+                    for window in simulate_consumption(system_consumption):
+                        pass
+                    return window.aggregate
+                results.append(measure("simulate_consumption", {"duration": duration, "sensors": number_of_sensors}, simulate, repeat))
+    return results
+
+def get_plotting_benchmarks(durations, sensor_counts, repeat):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        from .plotting import show_consumptions
+    except ImportError:
+        return []
+    microcontroller = get_synthetic_microcontroller()
+    radio_interface = get_synthetic_radio_interface()
+    results = []
+    for number_of_sensors in sensor_counts:
+        if number_of_sensors > MAX_TIMELINE_SENSORS:
+            continue
+        sensors = get_synthetic_sensors(number_of_sensors)
+        for duration in durations:
+            system_consumption = get_system_energy_consumption(sensors, microcontroller, radio_interface, duration)
+            def show():
+                show_consumptions(system_consumption, sensors, microcontroller, radio_interface, duration)
+                plt.close("all")
+            results.append(measure("show_consumptions", {"duration": duration, "sensors": number_of_sensors}, show, repeat))
+    return results
+
+def get_catalog_benchmarks(catalog_sizes, repeat):
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for catalog_size in catalog_sizes:
+            file_name = os.path.join(directory, f"sensors_{catalog_size}.txt")
+            with open(file_name, "w") as file:
+                file.writelines(str(sensor) + "\n" for sensor in get_synthetic_sensors(catalog_size))
+            results.append(measure("load_components", {"catalog_size": catalog_size}, lambda: load_components(file_name, parse_sensor), repeat))
+            catalog = ComponentCatalog(os.path.join(directory, f"catalog_{catalog_size}.db"))
+            catalog.import_text_catalog(file_name, "sensor")
+            results.append(measure("ComponentCatalog.find", {"catalog_size": catalog_size},
+                                   lambda: catalog.find("sensor", voltage_range=(3, 5), consumption_range=(None, 10)), repeat))
+            results.append(measure("ComponentCatalog.get", {"catalog_size": catalog_size}, lambda: catalog.get("sensor", f"sensor {catalog_size // 2}"), repeat))
+            catalog.close()
+    return results
+
+def run_benchmarks(quick=False, repeat=3):
+    # Machine-readable results of every stage on the synthetic workloads
+    durations = QUICK_DURATIONS if quick else DURATIONS
+    sensor_counts = QUICK_SENSOR_COUNTS if quick else SENSOR_COUNTS
+    catalog_sizes = QUICK_CATALOG_SIZES if quick else CATALOG_SIZES
+    results = get_model_benchmarks(durations, sensor_counts, repeat) + get_plotting_benchmarks(durations, sensor_counts, repeat) + get_catalog_benchmarks(catalog_sizes, repeat)
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "quick": quick,
+        "results": results}
+
+def get_benchmark_key(result):
+    return result["stage"], json.dumps(result["parameters"], sort_keys=True)
+
+def compare_benchmarks(benchmarks, baseline, threshold=0.25, metrics=("wall_time", "peak_memory"), min_wall_time_increase=0.001):
+    # Stages whose metrics grew more than threshold (a fraction) over the baseline. Stages missing in the baseline are ignored,
+    # and so are wall time increases below min_wall_time_increase seconds, which are within the timer noise
+    baseline_results = {get_benchmark_key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in benchmarks["results"]:
+        baseline_result = baseline_results.get(get_benchmark_key(result))
+        if baseline_result is None:
+            continue
+        for metric in metrics:
+            if result[metric] <= baseline_result[metric] * (1 + threshold) or result[metric] <= 0:
+                continue
+            if metric == "wall_time" and result[metric] - baseline_result[metric] < min_wall_time_increase:
+                continue
+            regressions.append({
+                "stage": result["stage"],
+                "parameters": result["parameters"],
+                "metric": metric,
+                "baseline": baseline_result[metric],
+                "value": result[metric],
+                "ratio": result[metric] / baseline_result[metric] if baseline_result[metric] > 0 else float("inf")})
+    return regressions
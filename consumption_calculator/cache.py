@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+
+from .components import Sensor, Microcontroller, RadioInterface
+
+def get_cache_key(*parts):
+    # Stable hash of components (by their class and field values) and plain values, equal across processes and runs
+    def describe(part):
+        if isinstance(part, (Sensor, Microcontroller, RadioInterface)):
+            return [type(part).__name__, sorted((field, repr(value)) for field, value in vars(part).items())]
+        if isinstance(part, (list, tuple)):
+            return [describe(value) for value in part]
+        return repr(part)
+    return hashlib.sha256(json.dumps([describe(part) for part in parts]).encode()).hexdigest()
+
+class ConsumptionCache:
+    # Memoization of element consumptions with a bounded in-memory LRU and an optional on-disk store.
+    # Cached consumptions are shared between results, so they must not be modified
+    def __init__(self, max_size=256, path=None):
+        self.max_size = max_size
+        self.path = path # Directory of the on-disk store. None keeps the cache only in memory
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+    def __repr__(self):
+        return (f"ConsumptionCache(entries={len(self.entries)}, "
+                f"max_size={self.max_size}, "
+                f"path={self.path}, "
+                f"hits={self.hits}, "
+                f"misses={self.misses})")
+    def get(self, key, compute):
+        # Cached value of key, calling compute() to create it when it is not in the cache
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        file_name = None if self.path is None else os.path.join(self.path, key + ".pickle")
+        if file_name is not None and os.path.exists(file_name):
+            with open(file_name, "rb") as file:
+                value = pickle.load(file)
+            self.hits += 1
+        else:
+            value = compute()
+            self.misses += 1
+            if file_name is not None:
+                with open(file_name, "wb") as file:
+                    pickle.dump(value, file)
+        self.entries[key] = value
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return value
+    def get_hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+class NoCache:
+    def get(self, key, compute):
+        return compute()
+
+NO_CACHE = NoCache()
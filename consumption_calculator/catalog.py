@@ -0,0 +1,110 @@
+import re
+import sqlite3
+import numpy as np
+
+from .components import Sensor, Microcontroller, RadioInterface, SENSOR_FIELDS, MICROCONTROLLER_FIELDS, RADIO_INTERFACE_FIELDS
+
+def parse_component(line, component_class, fields):
+    # Rebuild a component from the line written by get_user_input (its repr). Fields are matched by their
+    # known names and order, so names can contain commas, and quotes around the name are removed
+    pattern = re.escape(component_class.__name__ + "(") + ", ".join(re.escape(field + "=") + "(.*?)" for field in fields) + r"\)"
+    match = re.fullmatch(pattern, line.strip())
+    if match is None:
+        raise ValueError(f"Invalid {component_class.__name__} line: {line.strip()}")
+    values = list(match.groups())
+    name = values[0].strip()
+    if len(name) >= 2 and name[0] == name[-1] and name[0] in "\"'":
+        name = name[1:-1]
+    return component_class(name, *[float(value) for value in values[1:]])
+
+def parse_sensor(line):
+    return parse_component(line, Sensor, SENSOR_FIELDS)
+
+def parse_microcontroller(line):
+    return parse_component(line, Microcontroller, MICROCONTROLLER_FIELDS)
+
+def parse_radio_interface(line):
+    return parse_component(line, RadioInterface, RADIO_INTERFACE_FIELDS)
+
+def load_components(file_name, parse_component):
+    # Load all the components of a catalog file without prompting
+    with open(file_name, "r") as file:
+        return [parse_component(line) for line in file if line.strip()]
+
+# Table, component class, fields and consumption column used for range lookups of every kind of component
+CATALOG_TABLES = {
+    "sensor": ("sensors", Sensor, SENSOR_FIELDS, "active_consumption"),
+    "microcontroller": ("microcontrollers", Microcontroller, MICROCONTROLLER_FIELDS, "active_consumption"),
+    "radio_interface": ("radio_interfaces", RadioInterface, RADIO_INTERFACE_FIELDS, "transmit_consumption")}
+
+class ComponentCatalog:
+    # Catalog of components stored in a single SQLite file, indexed by name (unique), voltage and consumption
+    def __init__(self, path="catalog.db"):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        for table, component_class, fields, consumption_field in CATALOG_TABLES.values():
+            columns = ", ".join(f"{field} {'TEXT' if field == 'name' else 'REAL'} NOT NULL" for field in fields)
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, {columns})")
+            self.connection.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {table}_unique_name ON {table} (name)")
+            for field in ("operating_voltage", consumption_field):
+                self.connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_{field} ON {table} ({field})")
+        self.connection.commit()
+    def __repr__(self):
+        return (f"ComponentCatalog(path={self.path}, "
+                + ", ".join(f"{table}={self.count(kind)}" for kind, (table, _, _, _) in CATALOG_TABLES.items())
+                + ")")
+    def close(self):
+        self.connection.close()
+    def count(self, kind):
+        table = CATALOG_TABLES[kind][0]
+        return self.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    def add(self, kind, components):
+        # Bulk insert of a list of components of one kind. A component with the name of one already in the catalog replaces its fields
+        table, component_class, fields, consumption_field = CATALOG_TABLES[kind]
+        updates = ", ".join(f"{field} = excluded.{field}" for field in fields if field != "name")
+        self.connection.executemany(
+            f"INSERT INTO {table} ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))}) ON CONFLICT(name) DO UPDATE SET {updates}",
+            [[getattr(component, field) for field in fields] for component in components])
+        self.connection.commit()
+    def get_query(self, kind, name=None, voltage_range=None, consumption_range=None):
+        # SQL condition and parameters of a lookup. Ranges are (minimum, maximum) tuples, None for no limit
+        table, component_class, fields, consumption_field = CATALOG_TABLES[kind]
+        conditions = []
+        parameters = []
+        if name is not None:
+            conditions.append("name = ?")
+            parameters.append(name)
+        for field, value_range in (("operating_voltage", voltage_range), (consumption_field, consumption_range)):
+            if value_range is not None:
+                minimum, maximum = value_range
+                if minimum is not None:
+                    conditions.append(f"{field} >= ?")
+                    parameters.append(minimum)
+                if maximum is not None:
+                    conditions.append(f"{field} <= ?")
+                    parameters.append(maximum)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return where + " ORDER BY id", parameters
+    def find(self, kind, name=None, voltage_range=None, consumption_range=None):
+        table, component_class, fields, consumption_field = CATALOG_TABLES[kind]
+        where, parameters = self.get_query(kind, name, voltage_range, consumption_range)
+        rows = self.connection.execute(f"SELECT {', '.join(fields)} FROM {table}{where}", parameters)
+        return [component_class(*row) for row in rows]
+    def get(self, kind, name):
+        components = self.find(kind, name=name)
+        if not components:
+            raise KeyError(f"No {kind} named {name} in the catalog")
+        return components[0]
+    def load_arrays(self, kind, name=None, voltage_range=None, consumption_range=None):
+        # Columns of the matching components as NumPy arrays, e.g. the fields of get_energy_arrays in a sweep
+        table, component_class, fields, consumption_field = CATALOG_TABLES[kind]
+        where, parameters = self.get_query(kind, name, voltage_range, consumption_range)
+        rows = self.connection.execute(f"SELECT {', '.join(fields)} FROM {table}{where}", parameters).fetchall()
+        columns = list(zip(*rows)) if rows else [()] * len(fields)
+        return {field: np.array(column, dtype=object if field == "name" else float) for field, column in zip(fields, columns)}
+    def import_text_catalog(self, file_name, kind):
+        # One-time import of a catalog file written by get_user_input (sensors.txt, microcontrollers.txt or radio_interfaces.txt)
+        parse = {"sensor": parse_sensor, "microcontroller": parse_microcontroller, "radio_interface": parse_radio_interface}[kind]
+        components = load_components(file_name, parse)
+        self.add(kind, components)
+        return len(components)
@@ -0,0 +1,62 @@
+class Sensor:
+    def __init__(self, name, operating_voltage, active_consumption, inactive_consumption, sampling_rate, active_time, data_volume):
+        self.name = name
+        self.operating_voltage = operating_voltage
+        self.active_consumption = active_consumption
+        self.inactive_consumption = inactive_consumption
+        self.sampling_rate = sampling_rate # in Hz. Number of measurements per second
+        self.active_time = active_time # in seconds. Time needed to take the measurement
+        self.data_volume = data_volume # in bytes/sampling
+
+    def __repr__(self):
+        return (f"Sensor(name={self.name}, "
+                f"operating_voltage={self.operating_voltage}, "
+                f"active_consumption={self.active_consumption}, "
+                f"inactive_consumption={self.inactive_consumption}, "
+                f"sampling_rate={self.sampling_rate}, "
+                f"active_time={self.active_time}, "
+                f"data_volume={self.data_volume})")
+    
+    def get_name(self):
+        return self.name
+
+
+class Microcontroller:
+    def __init__(self, name, operating_voltage, active_consumption, light_sleep_consumption, deep_sleep_consumption):
+        self.name = name
+        self.operating_voltage = operating_voltage
+        self.active_consumption = active_consumption # Changes depending on the microcontroller's clock frequency
+        self.light_sleep_consumption = light_sleep_consumption
+        self.deep_sleep_consumption = deep_sleep_consumption
+
+    def __repr__(self):
+        return (f"Microcontroller(name={self.name}, "
+                f"operating_voltage={self.operating_voltage}, "
+                f"active_consumption={self.active_consumption}, "
+                f"light_sleep_consumption={self.light_sleep_consumption}, "
+                f"deep_sleep_consumption={self.deep_sleep_consumption})")
+
+
+class RadioInterface:
+    def __init__(self, name, operating_voltage, transmit_consumption, receive_consumption, inactive_consumption, datarate, data_refresh_rate):
+        self.name = name
+        self.operating_voltage = operating_voltage
+        self.transmit_consumption = transmit_consumption
+        self.receive_consumption = receive_consumption
+        self.inactive_consumption = inactive_consumption
+        self.datarate = datarate
+        self.data_refresh_rate = data_refresh_rate
+
+    def __repr__(self):
+        return (f"RadioInterface(name={self.name}, "
+                f"operating_voltage={self.operating_voltage}, "
+                f"transmit_consumption={self.transmit_consumption}, "
+                f"receive_consumption={self.receive_consumption}, "
+                f"inactive_consumption={self.inactive_consumption}, "
+                f"datarate={self.datarate}, "
+                f"data_refresh_rate={self.data_refresh_rate})")
+
+# Constructor fields of the components, in order
+SENSOR_FIELDS = ["name", "operating_voltage", "active_consumption", "inactive_consumption", "sampling_rate", "active_time", "data_volume"]
+MICROCONTROLLER_FIELDS = ["name", "operating_voltage", "active_consumption", "light_sleep_consumption", "deep_sleep_consumption"]
+RADIO_INTERFACE_FIELDS = ["name", "operating_voltage", "transmit_consumption", "receive_consumption", "inactive_consumption", "datarate", "data_refresh_rate"]
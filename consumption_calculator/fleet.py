@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from .components import SENSOR_FIELDS, MICROCONTROLLER_FIELDS, RADIO_INTERFACE_FIELDS
+from .model import get_energy_arrays
+
+def get_fleet_table(nodes):
+    # Fleet table from a list of (sensors, microcontroller, radio_interface) tuples: one row per sensor of every node,
+    # with the constructor fields prefixed by sensor_, microcontroller_ and radio_interface_
+    rows = []
+    for node, (sensors, microcontroller, radio_interface) in enumerate(nodes):
+        for sensor in sensors:
+            row = {"node": node}
+            row.update({"sensor_" + field: getattr(sensor, field) for field in SENSOR_FIELDS})
+            row.update({"microcontroller_" + field: getattr(microcontroller, field) for field in MICROCONTROLLER_FIELDS})
+            row.update({"radio_interface_" + field: getattr(radio_interface, field) for field in RADIO_INTERFACE_FIELDS})
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+class FleetConsumption:
+    def __init__(self, node_energies):
+        self.node_energies = node_energies # DataFrame with the energy totals (mAs) of every node
+    def __repr__(self):
+        return (f"FleetConsumption(nodes={len(self.node_energies)}, "
+                f"total_energy={self.get_total_energy()})")
+    def get_node_energies(self):
+        return self.node_energies
+    def get_total_energy(self):
+        return float(self.node_energies["total_energy"].sum())
+    def get_distribution(self, percentiles=(0.05, 0.25, 0.5, 0.75, 0.95)):
+        # Distribution of the energies and mean currents over the nodes of the fleet
+        return self.node_energies.drop(columns=["node", "number_of_sensors"]).describe(percentiles=list(percentiles))
+
+def get_fleet_energy_consumption(fleet_table, duration=None):
+    # Energy totals of every node of a fleet table (see get_fleet_table) computed in a single vectorized pass.
+    # Sensors keep the order of the table inside every node. The duration is an argument or a column of the table
+    node_codes, nodes = pd.factorize(fleet_table["node"], sort=True)
+    sensor_positions = fleet_table.groupby(node_codes, sort=False).cumcount().to_numpy()
+    number_of_sensors = np.bincount(node_codes, minlength=len(nodes))
+    sensor_fields = {}
+    for field in SENSOR_FIELDS[2:]:
+        values = np.zeros((len(nodes), number_of_sensors.max(initial=0)))
+        values[node_codes, sensor_positions] = fleet_table["sensor_" + field].to_numpy(dtype=float)
+        sensor_fields[field] = values
+    # Microcontroller, radio interface and duration are the same in every row of a node: take the first one
+    first_rows = np.flatnonzero(sensor_positions == 0)
+    first_rows = first_rows[np.argsort(node_codes[first_rows])]
+    microcontroller_fields = {field: fleet_table["microcontroller_" + field].to_numpy(dtype=float)[first_rows] for field in MICROCONTROLLER_FIELDS[2:]}
+    radio_interface_fields = {field: fleet_table["radio_interface_" + field].to_numpy(dtype=float)[first_rows] for field in RADIO_INTERFACE_FIELDS[2:]}
+    if "duration" in fleet_table:
+        duration = fleet_table["duration"].to_numpy(dtype=float)[first_rows]
+    elif duration is None:
+        raise ValueError("The fleet needs a duration: pass it as an argument or as a 'duration' column of the table")
+    durations = np.broadcast_to(np.asarray(duration, dtype=float), len(nodes))
+    energies = get_energy_arrays(sensor_fields, microcontroller_fields, radio_interface_fields, durations)
+    return FleetConsumption(pd.DataFrame({
+        "node": nodes,
+        "number_of_sensors": number_of_sensors,
+        "sensoring_energy": energies["sensoring_energy"],
+        "communications_energy": energies["communications_energy"],
+        "microcontroller_energy": energies["microcontroller_energy"],
+        "total_energy": energies["total_energy"],
+        "mean_current": energies["total_energy"] / durations}))
@@ -0,0 +1,149 @@
+import math
+import numpy as np
+
+from .schedule import Schedule
+from .battery import get_discharge_time
+
+# Number of steps of the cumulative sums of get_clamped_battery_charge. Short blocks after a clamp, as the next one may
+# be close (e.g. the battery stays full until the sunset), and long ones bound the weights of the self-discharge
+MIN_CLAMP_BLOCK = 16
+MAX_CLAMP_BLOCK = 4096
+
+class HarvestingProfile:
+    def __init__(self, name, operating_voltage, panel_area, efficiency, irradiance, step, periodic=False):
+        self.name = name
+        self.operating_voltage = operating_voltage # in V. Voltage at which the harvested power charges the battery
+        self.panel_area = panel_area # in m2
+        self.efficiency = efficiency # Fraction of the irradiance converted into electrical power
+        self.irradiance = np.asarray(irradiance, dtype=float) # in W/m2. One value per step
+        self.step = step # in seconds
+        self.periodic = periodic # The irradiance repeats after its last value (e.g. a daily curve)
+
+    def __repr__(self):
+        return (f"HarvestingProfile(name={self.name}, "
+                f"operating_voltage={self.operating_voltage}, "
+                f"panel_area={self.panel_area}, "
+                f"efficiency={self.efficiency}, "
+                f"steps={len(self.irradiance)}, "
+                f"step={self.step}, "
+                f"periodic={self.periodic})")
+    def get_harvested_current(self, number_of_steps):
+        # Harvested current (mA) in each of the first number_of_steps steps
+        if self.periodic:
+            irradiance = np.resize(self.irradiance, number_of_steps)
+        elif number_of_steps > len(self.irradiance):
+            raise ValueError(f"The harvesting profile covers {len(self.irradiance) * self.step} seconds, less than the duration")
+        else:
+            irradiance = self.irradiance[:number_of_steps]
+        return irradiance * self.panel_area * self.efficiency / self.operating_voltage * 1000
+
+def get_daily_harvesting_profile(name, operating_voltage, panel_area, efficiency, peak_irradiance, sunrise=6*3600, sunset=18*3600, step=60):
+    # Periodic daily profile with a half sine of irradiance between sunrise and sunset (seconds after midnight)
+    times = np.arange(0, 86400, step) + step / 2
+    irradiance = peak_irradiance * np.clip(np.sin(np.pi * (times - sunrise) / (sunset - sunrise)), 0, None)
+    irradiance[(times < sunrise) | (times > sunset)] = 0
+    return HarvestingProfile(name, operating_voltage, panel_area, efficiency, irradiance, step, periodic=True)
+
+def load_harvesting_profile(file_name, name, operating_voltage, panel_area, efficiency, periodic=False):
+    # Irradiance time series from a CSV file with two columns: time (s) and irradiance (W/m2), equally spaced
+    data = np.loadtxt(file_name, delimiter=",", ndmin=2)
+    step = float(data[1, 0] - data[0, 0])
+    return HarvestingProfile(name, operating_voltage, panel_area, efficiency, data[:, 1], step, periodic)
+
+class EnergyBalance:
+    def __init__(self, step, harvested_current, consumed_current, battery_charge, deficit_schedule):
+        self.step = step # in seconds
+        self.harvested_current = harvested_current # in mA. Mean in every step
+        self.consumed_current = consumed_current # in mA. Mean in every step
+        self.battery_charge = battery_charge # in mAs. At the end of every step, None without a battery
+        self.deficit_schedule = deficit_schedule # Schedule of the time in deficit
+
+    def __repr__(self):
+        return (f"EnergyBalance(steps={len(self.harvested_current)}, "
+                f"step={self.step}, "
+                f"net_charge={self.get_net_charge()}, "
+                f"deficit_time={self.deficit_schedule.get_total_active_time()})")
+    def get_net_current(self):
+        return self.harvested_current - self.consumed_current
+    def get_net_charge(self):
+        return float(np.sum(self.get_net_current()) * self.step) # in mAs
+    def get_deficit_intervals(self):
+        return self.deficit_schedule.get_intervals()
+
+def get_clamped_battery_charge(decay_exponents, step_charges, capacity, initial_charge=None):
+    # Charge (mAs) at the end of every step, from a full battery by default, when every step decays the charge by
+    # exp(-decay_exponent) and adds its step charge, clamped between 0 and capacity. Between two clamps the charge is
+    # Q_i = (Q_s + sum(step_charge_j * W_j)) / W_i with W_i = exp(sum of the exponents since s), one cumulative sum.
+    # The blocks grow while nothing is clamped, so the loop runs about once per clamp instead of once per step
+    number_of_steps = len(step_charges)
+    battery_charge = np.empty(number_of_steps)
+    charge = capacity if initial_charge is None else initial_charge
+    first = 0
+    block = MIN_CLAMP_BLOCK
+    while first < number_of_steps:
+        last = min(first + block, number_of_steps)
+        block_charges = step_charges[first:last]
+        if charge == capacity or charge == 0:
+            # A full battery stays full while a step charges it more than it decays, and an empty one while a step discharges it
+            if charge == capacity:
+                clamped = np.exp(-decay_exponents[first:last]) * capacity + block_charges >= capacity
+            else:
+                clamped = block_charges <= 0
+            clamped_steps = len(clamped) if clamped.all() else int(np.argmin(clamped))
+            if clamped_steps > 0:
+                battery_charge[first:first + clamped_steps] = charge
+                first += clamped_steps
+                block = min(block * 2, MAX_CLAMP_BLOCK) if first == last else MIN_CLAMP_BLOCK
+                continue
+        weights = np.exp(np.cumsum(decay_exponents[first:last]))
+        charges = (charge + np.cumsum(block_charges * weights)) / weights
+        out_of_bounds = (charges < 0) | (charges > capacity)
+        if out_of_bounds.any():
+            clamp = int(np.argmax(out_of_bounds))
+            battery_charge[first:first + clamp] = charges[:clamp]
+            charge = 0 if charges[clamp] < 0 else capacity
+            battery_charge[first + clamp] = charge
+            first += clamp + 1
+            block = MIN_CLAMP_BLOCK
+        else:
+            battery_charge[first:last] = charges
+            charge = charges[-1]
+            first = last
+            block = min(block * 2, MAX_CLAMP_BLOCK)
+    return battery_charge
+
+def get_energy_balance(system_consumption, harvesting_profile, battery=None, duration=None):
+    # Balance between the harvested and the consumed current in every step of the harvesting profile.
+    # Without a battery the system is in deficit when it consumes more than it harvests. With a battery
+    # (starting fully charged) it is in deficit when the charge is under the cutoff state of charge
+    elements = system_consumption.get_sensoring_consumption() + [system_consumption.get_microcontroller_consumption(), system_consumption.get_communications_consumption()]
+    if duration is None:
+        duration = system_consumption.get_microcontroller_consumption().schedule.duration
+    step = harvesting_profile.step
+    number_of_steps = math.ceil(duration / step)
+    step_lengths = np.minimum(step, duration - step * np.arange(number_of_steps))
+    consumed_charge = np.zeros(number_of_steps)
+    for element in elements:
+        if element.schedule is None:
+            # Analytic mode: the consumption is spread evenly over the duration
+            consumed_charge += element.get_total_energy() * step_lengths / duration
+        else:
+            active_time = element.schedule.get_active_time_per_bucket(step)
+            consumed_charge += element.active_consumption * active_time + element.inactive_consumption * (step_lengths - active_time)
+    harvested_current = harvesting_profile.get_harvested_current(number_of_steps)
+    consumed_current = consumed_charge / step_lengths
+    net_charge = harvested_current * step_lengths - consumed_charge
+    step_ends = np.cumsum(step_lengths)
+    battery_charge = None
+    if battery is None:
+        in_deficit = net_charge < 0
+    else:
+        # The battery can neither be charged over its capacity nor discharged under empty, so the charge of every step
+        # is clamped before the next one, and it decays with the self-discharge as in get_state_of_charge
+        capacity = battery.capacity * 3600
+        rate = battery.get_self_discharge_rate()
+        step_charges = net_charge / step_lengths * get_discharge_time(rate, step_lengths)
+        battery_charge = get_clamped_battery_charge(rate * step_lengths, step_charges, capacity)
+        in_deficit = battery_charge < battery.get_cutoff_state_of_charge() * capacity
+    deficit_schedule = Schedule(step_ends[in_deficit] - step_lengths[in_deficit], step_ends[in_deficit], duration)
+    return EnergyBalance(step, harvested_current, consumed_current, battery_charge, deficit_schedule)
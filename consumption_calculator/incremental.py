@@ -0,0 +1,111 @@
+from .components import Sensor, Microcontroller, RadioInterface, SENSOR_FIELDS, MICROCONTROLLER_FIELDS, RADIO_INTERFACE_FIELDS
+from .model import (SystemConsumtion, get_sensor_consumption, get_radio_interface_consumption, get_packet_radio_interface_consumption,
+                    get_microcontroller_consumption, apply_state_model)
+
+# Fields every element consumption depends on. The data volume of a sensor only feeds the radio interface, and the
+# microcontroller only depends on when the sensors and the radio interface are active, not on how much they consume
+SENSOR_DEPENDENCIES = [field for field in SENSOR_FIELDS if field != "data_volume"]
+SENSOR_SCHEDULE_DEPENDENCIES = ["sampling_rate", "active_time"]
+RADIO_INTERFACE_SCHEDULE_DEPENDENCIES = ["datarate", "data_refresh_rate"]
+
+def get_field_values(component, fields):
+    return tuple(getattr(component, field) for field in fields)
+
+class SystemConsumptionModel:
+    # Energy consumption of a system that is kept up to date while its components change, e.g. for what-if sliders.
+    # Every element keeps the inputs it was computed from, and after a change only the elements whose inputs changed
+    # are computed again: the sensor itself and the later ones if its measuring time changed (measures of a sensor start
+    # after the ones of the previous sensors), the radio interface if the data volume changed, and the microcontroller
+    # if any schedule changed. The results are the same as get_system_energy_consumption
+    def __init__(self, sensors, microcontroller, radio_interface, duration, mode="timeline", resolution=1, packet_model=None,
+                 microcontroller_state_model=None, radio_interface_state_model=None, sensor_state_models=None):
+        if mode not in ("timeline", "analytic"):
+            raise ValueError(f"Invalid mode '{mode}'. Expected 'timeline' or 'analytic'")
+        self.sensors = list(sensors)
+        self.microcontroller = microcontroller
+        self.radio_interface = radio_interface
+        self.duration = duration
+        self.mode = mode
+        self.resolution = resolution
+        self.packet_model = packet_model
+        self.microcontroller_state_model = microcontroller_state_model
+        self.radio_interface_state_model = radio_interface_state_model
+        self.sensor_state_models = list(sensor_state_models) if sensor_state_models is not None else [None] * len(self.sensors)
+        self.sensor_inputs = [None] * len(self.sensors)
+        self.sensoring_consumptions = [None] * len(self.sensors)
+        self.sensor_results = [None] * len(self.sensors) # With the sensor power states, if any
+        self.radio_interface_inputs = None
+        self.comm_consumtion = None
+        self.microcontroller_inputs = None
+        self.microcontroller_consumption = None
+        self.recomputed_elements = [] # Elements computed by the last update
+        self.update()
+
+    def __repr__(self):
+        return (f"SystemConsumptionModel(sensors={len(self.sensors)}, "
+                f"microcontroller={self.microcontroller.name}, "
+                f"radio_interface={self.radio_interface.name}, "
+                f"duration={self.duration}, "
+                f"mode={self.mode}, "
+                f"recomputed_elements={self.recomputed_elements})")
+    def set_sensor(self, index, **fields):
+        # Components are replaced instead of modified, so the caller's components are left untouched
+        self.sensors[index] = Sensor(**{**vars(self.sensors[index]), **fields})
+        return self.update()
+    def set_microcontroller(self, **fields):
+        self.microcontroller = Microcontroller(**{**vars(self.microcontroller), **fields})
+        return self.update()
+    def set_radio_interface(self, **fields):
+        self.radio_interface = RadioInterface(**{**vars(self.radio_interface), **fields})
+        return self.update()
+    def set_duration(self, duration):
+        self.duration = duration
+        return self.update()
+    def update(self):
+        # Computes again the elements whose inputs changed and returns the system consumption
+        recomputed_elements = []
+        first_measure_time = 0
+        measuring_time = 0
+        data_vloume = 0
+        for index, sensor in enumerate(self.sensors):
+            inputs = (get_field_values(sensor, SENSOR_DEPENDENCIES), first_measure_time, measuring_time, self.duration)
+            if inputs != self.sensor_inputs[index]:
+                self.sensoring_consumptions[index] = get_sensor_consumption(sensor, self.duration, first_measure_time, measuring_time, self.mode, self.resolution)
+                self.sensor_results[index] = self.sensoring_consumptions[index]
+                if self.sensor_state_models[index] is not None:
+                    self.sensor_results[index] = apply_state_model(self.sensoring_consumptions[index], self.sensor_state_models[index], self.duration)
+                self.sensor_inputs[index] = inputs
+                recomputed_elements.append(f"sensors[{index}]")
+            first_measure_time += sensor.active_time
+            measuring_time += self.sensoring_consumptions[index].active_time
+            data_vloume += sensor.data_volume * sensor.sampling_rate * self.duration
+
+        # With a packet model the payloads depend on when every sensor measures, not only on the total data volume
+        if self.packet_model is None:
+            data_dependencies = (data_vloume,)
+        else:
+            data_dependencies = tuple(get_field_values(sensor, SENSOR_SCHEDULE_DEPENDENCIES + ["data_volume"]) for sensor in self.sensors)
+        inputs = (get_field_values(self.radio_interface, RADIO_INTERFACE_FIELDS), data_dependencies, self.duration)
+        if inputs != self.radio_interface_inputs:
+            if self.packet_model is None:
+                self.comm_consumtion = get_radio_interface_consumption(self.radio_interface, data_vloume, self.duration, self.mode, self.resolution)
+            else:
+                self.comm_consumtion = get_packet_radio_interface_consumption(self.radio_interface, self.sensors, self.duration, self.packet_model, self.mode, self.resolution)
+            if self.radio_interface_state_model is not None:
+                self.comm_consumtion = apply_state_model(self.comm_consumtion, self.radio_interface_state_model, self.duration)
+            self.radio_interface_inputs = inputs
+            recomputed_elements.append("radio_interface")
+
+        inputs = (get_field_values(self.microcontroller, MICROCONTROLLER_FIELDS),
+                  tuple(get_field_values(sensor, SENSOR_SCHEDULE_DEPENDENCIES) for sensor in self.sensors),
+                  get_field_values(self.radio_interface, RADIO_INTERFACE_SCHEDULE_DEPENDENCIES), data_dependencies, self.duration)
+        if inputs != self.microcontroller_inputs:
+            self.microcontroller_consumption = get_microcontroller_consumption(self.microcontroller, self.sensoring_consumptions, self.comm_consumtion, self.duration, self.mode)
+            if self.microcontroller_state_model is not None:
+                self.microcontroller_consumption = apply_state_model(self.microcontroller_consumption, self.microcontroller_state_model, self.duration)
+            self.microcontroller_inputs = inputs
+            recomputed_elements.append("microcontroller")
+        self.recomputed_elements = recomputed_elements
+        return self.get_system_consumption()
+    def get_system_consumption(self):
+        return SystemConsumtion(list(self.sensor_results), self.comm_consumtion, self.microcontroller_consumption)
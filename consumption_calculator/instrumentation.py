@@ -0,0 +1,60 @@
+import cProfile
+import json
+import time
+
+class Instrumentation:
+    # Opt-in timers and counters of the stages of a run (e.g. schedule construction, time series assembly, rendering).
+    # A stage runs from start_stage until stop_stage or the start of the next stage, and repeated stages accumulate.
+    # With profile=True the instrumented stages are also profiled with cProfile
+    def __init__(self, profile=False):
+        self.stage_times = {} # in seconds. {stage: accumulated time}
+        self.stage_calls = {} # {stage: number of times it ran}
+        self.counters = {} # {counter: accumulated value}
+        self.current_stage = None
+        self.stage_start = None
+        self.profiler = cProfile.Profile() if profile else None
+
+    def __repr__(self):
+        return (f"Instrumentation(stage_times={self.stage_times}, "
+                f"counters={self.counters})")
+    def start_stage(self, name):
+        self.stop_stage()
+        self.current_stage = name
+        if self.profiler is not None:
+            self.profiler.enable()
+        self.stage_start = time.perf_counter()
+    def stop_stage(self):
+        if self.current_stage is None:
+            return
+        elapsed = time.perf_counter() - self.stage_start
+        if self.profiler is not None:
+            self.profiler.disable()
+        self.stage_times[self.current_stage] = self.stage_times.get(self.current_stage, 0) + elapsed
+        self.stage_calls[self.current_stage] = self.stage_calls.get(self.current_stage, 0) + 1
+        self.current_stage = None
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+    def get_report(self):
+        return {
+            "stages": {stage: {"time": stage_time, "calls": self.stage_calls[stage]} for stage, stage_time in self.stage_times.items()},
+            "total_time": sum(self.stage_times.values()),
+            "counters": self.counters}
+    def write_report(self, file_name):
+        with open(file_name, "w") as file:
+            json.dump(self.get_report(), file, indent=4)
+    def dump_profile(self, file_name):
+        # Statistics readable with pstats or snakeviz
+        if self.profiler is None:
+            raise ValueError("The instrumentation was created without profile=True")
+        self.profiler.dump_stats(file_name)
+
+class NoInstrumentation:
+    # Used when the instrumentation is disabled: every call returns at once
+    def start_stage(self, name):
+        pass
+    def stop_stage(self):
+        pass
+    def count(self, name, value=1):
+        pass
+
+NO_INSTRUMENTATION = NoInstrumentation()
@@ -0,0 +1,71 @@
+from .components import Sensor, Microcontroller, RadioInterface
+from .catalog import parse_sensor, parse_microcontroller, parse_radio_interface
+
+def get_user_input():
+    while True:
+        choice = input("Do you want to enter a Sensor, Microcontroller, or RadioInterface? (Enter 'exit' to quit): ").strip().lower()
+        if choice == 'sensor':
+            sensor_name = input("Enter sensor name: ")
+            operating_voltage = float(input("Enter operating voltage (V): "))
+            active_consumption = float(input("Enter active consumption (mA): "))
+            inactive_consumption = float(input("Enter inactive consumption (mA): "))
+            sampling_rate = float(input("Enter sampling rate (Hz): "))
+            active_time = float(input("Enter active time (seconds): "))
+            data_volume = float(input("Enter data volume (bytes/sampling): "))
+            sensor = Sensor(sensor_name, operating_voltage, active_consumption, inactive_consumption, sampling_rate, active_time, data_volume)
+            with open("sensors.txt", "a") as file:
+                file.write(str(sensor) + "\n")
+        elif choice == 'microcontroller':
+            microcontroller_name = input("Enter microcontroller name: ")
+            operating_voltage = float(input("Enter operating voltage (V): "))
+            active_consumption = float(input("Enter active consumption (mA): "))
+            light_sleep_consumption = float(input("Enter light sleep consumption (mA): "))
+            deep_sleep_consumption = float(input("Enter deep sleep consumption (mA): "))
+            microcontroller = Microcontroller(microcontroller_name, operating_voltage, active_consumption, light_sleep_consumption, deep_sleep_consumption)
+            with open("microcontrollers.txt", "a") as file:
+                file.write(str(microcontroller) + "\n")
+        elif choice == 'radiointerface':
+            radio_interface_name = input("Enter radio interface name: ")
+            operating_voltage = float(input("Enter operating voltage (V): "))
+            transmit_consumption = float(input("Enter transmit consumption (mA): "))
+            receive_consumption = float(input("Enter receive consumption (mA): "))
+            inactive_consumption = float(input("Enter inactive consumption (mA): "))
+            datarate = float(input("Enter datarate (bps): "))
+            data_refresh_rate = float(input("Enter data refresh rate: "))
+            radio_interface = RadioInterface(radio_interface_name, operating_voltage, transmit_consumption, receive_consumption, inactive_consumption, datarate, data_refresh_rate)
+            with open("radio_interfaces.txt", "a") as file:
+                file.write(str(radio_interface) + "\n")
+        elif choice == 'exit':
+            break
+        else:
+            print("Invalid choice. Please enter 'Sensor', 'Microcontroller', 'RadioInterface', or 'exit'.")
+
+def read_sensors():
+    sensors = []
+    with open("sensors.txt", "r") as file:
+        all_sensors = file.readlines()
+        for i, line in enumerate(all_sensors):
+            print(f"{i}: {line.strip()}")
+        sensor_indices = input("Enter the positions of the sensors to load (comma-separated): ").strip().split(",")
+        sensor_indices = [int(index.strip()) for index in sensor_indices]
+        for index in sensor_indices:
+            sensors.append(parse_sensor(all_sensors[index]))
+    return sensors
+
+def read_microcontroller():
+    with open("microcontrollers.txt", "r") as file:
+        all_microcontrollers = file.readlines()
+        for i, line in enumerate(all_microcontrollers):
+            print(f"{i}: {line.strip()}")
+        microcontroller_index = int(input("Enter the position of the microcontroller to load: ").strip())
+        microcontroller = parse_microcontroller(all_microcontrollers[microcontroller_index])
+    return microcontroller
+
+def read_radio_interface():
+    with open("radio_interfaces.txt", "r") as file:
+        all_radio_interfaces = file.readlines()
+        for i, line in enumerate(all_radio_interfaces):
+            print(f"{i}: {line.strip()}")
+        radio_interface_index = int(input("Enter the position of the radio interface to load: ").strip())
+        radio_interface = parse_radio_interface(all_radio_interfaces[radio_interface_index])
+    return radio_interface
@@ -0,0 +1,300 @@
+import math
+import numpy as np
+
+from .schedule import Schedule
+from .cache import NO_CACHE, get_cache_key
+from .instrumentation import NO_INSTRUMENTATION
+from .harvesting import get_energy_balance
+from .states import get_state_consumption, get_periodic_state_consumption
+from .transmission import PACKET_MODEL_FIELDS, get_transmission_events, get_transmission_time_arrays
+
+class SystemConsumtion:
+    def __init__(self, sensoring_consumption, communications_consumption, microcontroller_consumption):
+        self.sensoring_consumption = sensoring_consumption
+        self.communications_consumption = communications_consumption
+        self.microcontroller_consumption = microcontroller_consumption
+        self.energy_balance = None # Set when a harvesting profile is given
+    def __repr__(self):
+        return (f"SystemConsumtion(sensoring_consumption={self.sensoring_consumption}, "
+                f"communications_consumption={self.communications_consumption}, "
+                f"microcontroller_consumption={self.microcontroller_consumption})")
+    def set_sensoring_consumption(self, sensoring_consumption):
+        self.sensoring_consumption = sensoring_consumption
+    def set_communications_consumption(self, communications_consumption):
+        self.communications_consumption = communications_consumption
+    def set_microcontroller_consumption(self, microcontroller_consumption):
+        self.microcontroller_consumption = microcontroller_consumption
+    def get_sensoring_consumption(self):
+        return self.sensoring_consumption
+    def get_communications_consumption(self):
+        return self.communications_consumption
+    def get_microcontroller_consumption(self):
+        return self.microcontroller_consumption
+    def get_energy_balance(self):
+        return self.energy_balance
+    def get_sensoring_current_consumption(self):
+        return sum(sensor.get_total_energy() for sensor in self.sensoring_consumption)
+    def get_sensors_current_consumption(self):
+        return [sensor.get_total_energy() for sensor in self.sensoring_consumption]
+    def get_communications_energy_consumption(self):
+        return self.communications_consumption.get_total_energy()
+    def get_microcontroller_energy_consumption(self):
+        return self.microcontroller_consumption.get_total_energy()
+    def get_total_energy(self):
+        total_sensoring_consumption = sum(sensor.get_total_energy() for sensor in self.sensoring_consumption)
+        return total_sensoring_consumption + self.communications_consumption.get_total_energy() + self.microcontroller_consumption.get_total_energy()
+
+class ElementConsumption:
+    def __init__(self, name, operating_voltage, active_energy, inactive_energy, schedule, active_consumption=None, inactive_consumption=None, active_time=None, number_of_activities=None):
+        self.name = name
+        self.operating_voltage = operating_voltage
+        self.schedule = schedule
+        self.active_energy = active_energy
+        self.inactive_energy = inactive_energy
+        self.active_consumption = active_consumption # in mA. Current drawn while the schedule is active
+        self.inactive_consumption = inactive_consumption # in mA. Current drawn while the schedule is inactive
+        self.active_time = active_time # in seconds
+        self.number_of_activities = number_of_activities # Measures or transmissions, used by the power states in mode="analytic"
+        self.state_consumption = None # StateConsumption when the element has a power state model
+        self.transmission_events = None # TransmissionEvents of a radio interface with a packet model
+    def __repr__(self):
+        return (f"SensoringConsumption(active_energy={self.active_energy}, "
+                f"inactive_energy={self.inactive_energy})")
+    def set_active_energy(self, active_energy):
+        self.active_energy = active_energy
+    def set_inactive_energy(self, inactive_energy):
+        self.inactive_energy = inactive_energy
+    def get_active_energy(self):
+        return self.active_energy
+    def get_inactive_energy(self):
+        return self.inactive_energy
+    def get_total_energy(self):
+        return self.active_energy + self.inactive_energy
+    def get_dense_schedule(self, resolution=None, dtype=bool, first_sample=0, last_sample=None):
+        return self.schedule.to_dense(resolution, dtype, first_sample, last_sample)
+    def get_current_timeserie(self, resolution=None, first_sample=0, last_sample=None):
+        if self.state_consumption is not None:
+            if resolution is None:
+                resolution = self.schedule.resolution
+            return self.state_consumption.get_current_timeserie(resolution, first_sample, last_sample)
+        return np.where(self.get_dense_schedule(resolution, bool, first_sample, last_sample), self.active_consumption, self.inactive_consumption)
+
+def get_sensor_consumption(sensor, duration, first_measure_time=0, previous_measuring_time=0, mode="timeline", resolution=1):
+    # Measures of a sensor start after the ones of the previous sensors, and previous_measuring_time is the measuring time of those sensors
+    # Calculate the number of measures
+    number_of_measures = sensor.sampling_rate * duration
+    measure_period = duration / number_of_measures
+    sensor_schedule = None
+    if mode == "timeline":
+        # Calculate the start and end time of every measure
+        start_measure_times = first_measure_time + measure_period * np.arange(math.ceil(number_of_measures))
+        start_measure_times = start_measure_times[start_measure_times <= duration]
+        end_measure_times = np.minimum(start_measure_times + sensor.active_time, duration)
+        sensor_schedule = Schedule(start_measure_times, end_measure_times, duration, resolution)
+    sensor_measuring_time = sensor.active_time * number_of_measures
+    measuring_time = previous_measuring_time + sensor_measuring_time # Measures could be parallelized depending on the available ports and maximum current supply
+    active_energy = sensor.active_consumption * measuring_time
+    inactive_energy = sensor.inactive_consumption * (duration - measuring_time)
+    return ElementConsumption(sensor.get_name(), sensor.operating_voltage, active_energy, inactive_energy, sensor_schedule, sensor.active_consumption, sensor.inactive_consumption, sensor_measuring_time, number_of_measures)
+
+def get_radio_interface_consumption(radio_interface, data_vloume, duration, mode="timeline", resolution=1):
+    # Calculate the number of transmissions
+    number_of_transmissions = math.ceil(duration * radio_interface.data_refresh_rate)
+    # Calculate the transmission period
+    transmission_period = 1 / radio_interface.data_refresh_rate
+    # Calculate the time of each transmission
+    transmission_time = data_vloume*8 / radio_interface.datarate
+    radio_schedule = None
+    if mode == "timeline":
+        # Every transmission ends at the end of its period
+        end_transmission_times = transmission_period * np.arange(1, number_of_transmissions + 1)
+        start_transmission_times = end_transmission_times - transmission_time
+        in_duration = start_transmission_times <= duration
+        radio_schedule = Schedule(start_transmission_times[in_duration], np.minimum(end_transmission_times[in_duration], duration), duration, resolution)
+    # Calculate the active time of the radio interface
+    radio_active_time = transmission_time * number_of_transmissions
+    if radio_active_time > duration:
+        radio_active_time = duration
+    inactive_comm_energy = radio_interface.inactive_consumption * (duration - radio_active_time)
+    active_comm_energy = radio_interface.transmit_consumption * radio_active_time
+    return ElementConsumption(radio_interface.name, radio_interface.operating_voltage, active_comm_energy, inactive_comm_energy, radio_schedule, radio_interface.transmit_consumption, radio_interface.inactive_consumption, radio_active_time, number_of_transmissions)
+
+def get_packet_radio_interface_consumption(radio_interface, sensors, duration, packet_model, mode="timeline", resolution=1):
+    # Every transmission sends only the data buffered since the previous one, in packets with protocol overhead and
+    # retries (see transmission.py), instead of the data of the whole duration.
+    # mode="analytic" takes the mean payload of the transmissions instead of counting the measures of every period
+    radio_schedule = None
+    transmission_events = None
+    if mode == "timeline":
+        transmission_events = get_transmission_events(sensors, radio_interface, duration, packet_model)
+        radio_schedule = Schedule(transmission_events.start_times, transmission_events.start_times + transmission_events.airtimes, duration, resolution)
+        radio_active_time = transmission_events.get_total_airtime()
+        number_of_transmissions = transmission_events.get_number_of_transmissions()
+    else:
+        number_of_transmissions = math.ceil(duration * radio_interface.data_refresh_rate)
+        data_vloume = sum(sensor.data_volume * sensor.sampling_rate * duration for sensor in sensors)
+        mtu = packet_model.mtu if packet_model.mtu is not None else np.inf
+        radio_active_time = float(get_transmission_time_arrays(data_vloume / number_of_transmissions, radio_interface.datarate, packet_model.header_size, mtu,
+                                                               packet_model.retry_probability, packet_model.max_retries)) * number_of_transmissions
+    if radio_active_time > duration:
+        radio_active_time = duration
+    inactive_comm_energy = radio_interface.inactive_consumption * (duration - radio_active_time)
+    active_comm_energy = radio_interface.transmit_consumption * radio_active_time
+    element = ElementConsumption(radio_interface.name, radio_interface.operating_voltage, active_comm_energy, inactive_comm_energy, radio_schedule, radio_interface.transmit_consumption, radio_interface.inactive_consumption, radio_active_time, number_of_transmissions)
+    element.transmission_events = transmission_events
+    return element
+
+def get_microcontroller_consumption(microcontroller, sensoring_consumptions, comm_consumtion, duration, mode="timeline"):
+    microcontroller_active_time = sum(sensor.active_time for sensor in sensoring_consumptions) + comm_consumtion.active_time
+    if microcontroller_active_time > duration:
+        microcontroller_active_time = duration
+    microcontroller_active_energy = microcontroller.active_consumption * microcontroller_active_time
+    microcontroller_inactive_energy = microcontroller.deep_sleep_consumption * (duration - microcontroller_active_time)
+    # Microcontroller is active when sensoring is active or when the radio interface is active
+    # Sensoring is active when some sensor is active
+    microcontroller_schedule = None
+    if mode == "timeline":
+        microcontroller_schedule = comm_consumtion.schedule.union(*[sensor.schedule for sensor in sensoring_consumptions])
+    number_of_activities = sum(sensor.number_of_activities for sensor in sensoring_consumptions) + comm_consumtion.number_of_activities
+    return ElementConsumption(microcontroller.name, microcontroller.operating_voltage, microcontroller_active_energy, microcontroller_inactive_energy, microcontroller_schedule, microcontroller.active_consumption, microcontroller.deep_sleep_consumption, microcontroller_active_time, number_of_activities)
+
+def apply_state_model(element_consumption, state_model, duration=None):
+    # Energy of an element from the dwell times and transitions of its power states: the sleep states are its inactive energy
+    # and the rest (active, trailing and transition states and the transitions) its active energy.
+    # They are counted over the schedule, or in mode="analytic" (no schedule) from the number of activities and the duration
+    if element_consumption.schedule is None:
+        state_consumption = get_periodic_state_consumption(state_model, element_consumption.number_of_activities, element_consumption.active_time, duration)
+    else:
+        state_consumption = get_state_consumption(state_model, element_consumption.schedule)
+    element = ElementConsumption(element_consumption.name, element_consumption.operating_voltage, state_consumption.get_awake_energy(), state_consumption.get_sleep_energy(),
+                                 element_consumption.schedule, element_consumption.active_consumption, element_consumption.inactive_consumption, state_consumption.get_awake_time(),
+                                 element_consumption.number_of_activities)
+    element.state_consumption = state_consumption
+    element.transmission_events = element_consumption.transmission_events
+    return element
+
+def get_system_energy_consumption(sensors, microcontroller, radio_interface, duration, mode="timeline", resolution=1, harvesting_profile=None, battery=None, cache=None,
+                                  microcontroller_state_model=None, radio_interface_state_model=None, packet_model=None, instrumentation=None, sensor_state_models=None):
+    # mode="timeline" also builds the schedule of every element, needed to plot the consumption over the time.
+    # mode="analytic" only computes the energy totals, in a time independent of the duration.
+    # resolution is the number of samples per second of the dense schedules (e.g. 1000 for 1 ms).
+    # With a harvesting profile the energy balance of the system (and the charge of the battery, if given) is also computed.
+    # With a ConsumptionCache every element is looked up before computing it, so unchanged elements are reused.
+    # With power state models (see states.py) the energy of the microcontroller and the radio interface comes from the
+    # dwell time in every state (e.g. light sleep, receive) and the number of transitions (e.g. wake-ups). sensor_state_models has
+    # one model (or None) per sensor. In mode="analytic" the dwell times come from the number of activities (see get_periodic_state_consumption).
+    # With a PacketModel every transmission sends only the data buffered since the previous one, with packet overhead and retries.
+    # With an Instrumentation (see instrumentation.py) every stage is timed and the measures, transmissions and intervals are counted
+    if mode not in ("timeline", "analytic"):
+        raise ValueError(f"Invalid mode '{mode}'. Expected 'timeline' or 'analytic'")
+    if cache is None:
+        cache = NO_CACHE
+    if instrumentation is None:
+        instrumentation = NO_INSTRUMENTATION
+    data_vloume = 0
+    measuring_time = 0
+    first_measure_time = 0
+    # Calculate energy consumption for sensors
+    sensoring_consumptions = []
+    sensor_keys = []
+    instrumentation.start_stage("sensor_schedules")
+    for sensor in sensors:
+        sensor_key = get_cache_key("sensor", sensor, duration, first_measure_time, measuring_time, mode, resolution)
+        sensor_consumption = cache.get(sensor_key, lambda: get_sensor_consumption(sensor, duration, first_measure_time, measuring_time, mode, resolution))
+        first_measure_time += sensor.active_time
+        measuring_time += sensor_consumption.active_time
+        data_vloume += sensor.data_volume * sensor.sampling_rate * duration
+        sensoring_consumptions.append(sensor_consumption)
+        sensor_keys.append(sensor_key)
+        instrumentation.count("measurements", math.ceil(sensor.sampling_rate * duration))
+    # The microcontroller is active while the sensors measure, so the sensor power states only change the sensor energies
+    sensor_results = list(sensoring_consumptions)
+    if sensor_state_models is not None:
+        instrumentation.start_stage("sensor_states")
+        for i, sensor_state_model in enumerate(sensor_state_models):
+            if sensor_state_model is not None:
+                sensor_state_key = get_cache_key("sensor_states", sensor_keys[i], repr(sensor_state_model))
+                sensor_results[i] = cache.get(sensor_state_key, lambda: apply_state_model(sensoring_consumptions[i], sensor_state_model, duration))
+
+    # Calculate energy consumption for radio interface
+    instrumentation.start_stage("radio_interface_schedule")
+    instrumentation.count("transmissions", math.ceil(duration * radio_interface.data_refresh_rate))
+    if packet_model is None:
+        radio_key = get_cache_key("radio_interface", radio_interface, data_vloume, duration, mode, resolution)
+        comm_consumtion = cache.get(radio_key, lambda: get_radio_interface_consumption(radio_interface, data_vloume, duration, mode, resolution))
+    else:
+        radio_key = get_cache_key("radio_interface_packets", radio_interface, list(sensors), repr(packet_model), duration, mode, resolution)
+        comm_consumtion = cache.get(radio_key, lambda: get_packet_radio_interface_consumption(radio_interface, sensors, duration, packet_model, mode, resolution))
+    if radio_interface_state_model is not None:
+        instrumentation.start_stage("radio_interface_states")
+        radio_key = get_cache_key("radio_interface_states", radio_key, repr(radio_interface_state_model))
+        comm_consumtion = cache.get(radio_key, lambda: apply_state_model(comm_consumtion, radio_interface_state_model, duration))
+
+    # Calculate energy consumption for microcontroller
+    instrumentation.start_stage("microcontroller_schedule")
+    microcontroller_key = get_cache_key("microcontroller", microcontroller, sensor_keys, radio_key, duration, mode)
+    microcontroller_consumption = cache.get(microcontroller_key, lambda: get_microcontroller_consumption(microcontroller, sensoring_consumptions, comm_consumtion, duration, mode))
+    if microcontroller_state_model is not None:
+        instrumentation.start_stage("microcontroller_states")
+        microcontroller_key = get_cache_key("microcontroller_states", microcontroller_key, repr(microcontroller_state_model))
+        microcontroller_consumption = cache.get(microcontroller_key, lambda: apply_state_model(microcontroller_consumption, microcontroller_state_model, duration))
+    system_consumption = SystemConsumtion(sensor_results, comm_consumtion, microcontroller_consumption)
+    if harvesting_profile is not None:
+        instrumentation.start_stage("energy_balance")
+        system_consumption.energy_balance = get_energy_balance(system_consumption, harvesting_profile, battery, duration)
+    instrumentation.stop_stage()
+    if mode == "timeline":
+        instrumentation.count("schedule_intervals", sum(element.schedule.get_number_of_intervals() for element in sensoring_consumptions + [comm_consumtion, microcontroller_consumption]))
+    return system_consumption
+
+def get_consumption_results(system_consumption):
+    # Energy totals (mAs) of a system consumption as plain values, ready to be written as JSON
+    def get_element_results(element):
+        return {
+            "name": element.name,
+            "operating_voltage": element.operating_voltage,
+            "active_energy": element.get_active_energy(),
+            "inactive_energy": element.get_inactive_energy(),
+            "total_energy": element.get_total_energy(),
+            "active_time": element.active_time}
+    return {
+        "sensors": [get_element_results(sensor) for sensor in system_consumption.get_sensoring_consumption()],
+        "microcontroller": get_element_results(system_consumption.get_microcontroller_consumption()),
+        "radio_interface": get_element_results(system_consumption.get_communications_consumption()),
+        "sensoring_energy": system_consumption.get_sensoring_current_consumption(),
+        "communications_energy": system_consumption.get_communications_energy_consumption(),
+        "microcontroller_energy": system_consumption.get_microcontroller_energy_consumption(),
+        "total_energy": system_consumption.get_total_energy()}
+
+def get_energy_arrays(sensor_fields, microcontroller_fields, radio_interface_fields, duration):
+    # Same energy totals as the analytic mode of get_system_energy_consumption, for many systems at once.
+    # Every field is a NumPy array: sensor fields have the sensors in the last axis (padded with zeros when
+    # systems have fewer sensors) and the other fields and the duration broadcast against the rest of the axes
+    duration = np.asarray(duration, dtype=float)
+    number_of_measures = sensor_fields["sampling_rate"] * duration[..., np.newaxis]
+    # Measures are taken one sensor after the other, so the measuring time accumulates over the sensors
+    measuring_time = np.cumsum(sensor_fields["active_time"] * number_of_measures, axis=-1)
+    sensor_energy = sensor_fields["active_consumption"] * measuring_time + sensor_fields["inactive_consumption"] * (duration[..., np.newaxis] - measuring_time)
+    data_volume = np.sum(sensor_fields["data_volume"] * number_of_measures, axis=-1)
+    number_of_transmissions = np.ceil(duration * radio_interface_fields["data_refresh_rate"])
+    if any(field in radio_interface_fields for field in PACKET_MODEL_FIELDS):
+        # Packet model fields: every transmission sends the mean payload of the transmissions, as the analytic mode of get_packet_radio_interface_consumption
+        with np.errstate(divide='ignore', invalid='ignore'):
+            payloads = np.where(number_of_transmissions > 0, data_volume / number_of_transmissions, 0)
+        transmission_time = get_transmission_time_arrays(payloads, radio_interface_fields["datarate"], radio_interface_fields.get("header_size", 0), radio_interface_fields.get("mtu", np.inf),
+                                                         radio_interface_fields.get("retry_probability", 0), radio_interface_fields.get("max_retries", 0))
+    else:
+        transmission_time = data_volume * 8 / radio_interface_fields["datarate"]
+    # Optional mean number of retransmissions of every transmission
+    transmission_time = transmission_time * (1 + radio_interface_fields.get("retransmissions", 0))
+    radio_active_time = np.minimum(transmission_time * number_of_transmissions, duration)
+    communications_energy = radio_interface_fields["transmit_consumption"] * radio_active_time + radio_interface_fields["inactive_consumption"] * (duration - radio_active_time)
+    microcontroller_active_time = np.minimum(np.sum(sensor_fields["active_time"] * number_of_measures, axis=-1) + radio_active_time, duration)
+    microcontroller_energy = microcontroller_fields["active_consumption"] * microcontroller_active_time + microcontroller_fields["deep_sleep_consumption"] * (duration - microcontroller_active_time)
+    sensoring_energy = np.sum(sensor_energy, axis=-1)
+    return {
+        "sensor_energy": sensor_energy,
+        "sensoring_energy": sensoring_energy,
+        "communications_energy": communications_energy,
+        "microcontroller_energy": microcontroller_energy,
+        "total_energy": sensoring_energy + communications_energy + microcontroller_energy}
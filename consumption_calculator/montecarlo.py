@@ -0,0 +1,137 @@
+import numpy as np
+
+from .components import SENSOR_FIELDS, MICROCONTROLLER_FIELDS, RADIO_INTERFACE_FIELDS
+from .model import get_energy_arrays
+from .battery import BATTERY_FIELDS, get_battery_lifetime_arrays
+from .transmission import PACKET_MODEL_FIELDS, PacketModel
+
+# Fields that can be given a distribution, besides the constructor fields of the components
+EXTRA_FIELDS = {"radio_interface": ["retransmissions"]}
+ENERGY_NAMES = ["total_energy", "sensoring_energy", "communications_energy", "microcontroller_energy"]
+
+class MonteCarloConsumption:
+    def __init__(self, duration, energies, battery_lifetimes=None):
+        self.duration = duration
+        self.energies = energies # in mAs. {name: one value per sample}
+        self.battery_lifetimes = battery_lifetimes # in seconds. One value per sample
+
+    def __repr__(self):
+        return (f"MonteCarloConsumption(duration={self.duration}, "
+                f"number_of_samples={self.get_number_of_samples()}, "
+                f"mean_total_energy={np.mean(self.energies['total_energy'])})")
+    def get_number_of_samples(self):
+        return len(self.energies["total_energy"])
+    def get_mean_currents(self):
+        # Mean current (mA) of every sample
+        return self.energies["total_energy"] / self.duration
+    def get_percentiles(self, percentiles=(5, 50, 95)):
+        # {name: {percentile: value}} of the energies (mAs) and the battery lifetime (s).
+        # The 95% of the samples last longer than the 5th percentile of the lifetime.
+        # The nearest sample is taken so that infinite lifetimes are not interpolated
+        values = dict(self.energies)
+        if self.battery_lifetimes is not None:
+            values["battery_lifetime"] = self.battery_lifetimes
+        return {name: dict(zip(percentiles, np.percentile(samples, percentiles, method="nearest").tolist())) for name, samples in values.items()}
+
+def draw_samples(distribution, nominal, size, rng):
+    # A distribution is a constant, a callable(rng, size) or a tuple with its name and parameters:
+    # ("normal", mean, standard deviation), ("uniform", low, high), ("triangular", low, mode, high),
+    # ("lognormal", mean, sigma) of the underlying normal, ("poisson", mean) or
+    # ("tolerance", fraction), uniform between nominal*(1 - fraction) and nominal*(1 + fraction)
+    if callable(distribution):
+        samples = distribution(rng, size)
+    elif not isinstance(distribution, (tuple, list)):
+        samples = np.full(size, distribution, dtype=float)
+    else:
+        kind, *parameters = distribution
+        if kind == "normal":
+            samples = rng.normal(*parameters, size)
+        elif kind == "uniform":
+            samples = rng.uniform(*parameters, size)
+        elif kind == "triangular":
+            samples = rng.triangular(*parameters, size)
+        elif kind == "lognormal":
+            samples = rng.lognormal(*parameters, size)
+        elif kind == "poisson":
+            samples = rng.poisson(*parameters, size)
+        elif kind == "tolerance":
+            samples = nominal * rng.uniform(1 - parameters[0], 1 + parameters[0], size)
+        else:
+            raise ValueError(f"Unknown distribution '{kind}'")
+    # Consumptions, times, rates and volumes can not be negative
+    return np.maximum(np.broadcast_to(np.asarray(samples, dtype=float), size), 0)
+
+def get_sample_fields(kind, components, fields, distributions, number_of_samples, rng):
+    # Arrays of number_of_samples values of every field of a component, or of
+    # (number_of_samples, number of components) values when components is a list
+    is_list = isinstance(components, list)
+    shape = (number_of_samples, len(components)) if is_list else (number_of_samples,)
+    sample_fields = {}
+    for field in fields + EXTRA_FIELDS.get(kind, []):
+        if field == "name":
+            continue
+        nominal = np.array([getattr(component, field, 0) for component in components] if is_list else getattr(components, field, 0), dtype=float)
+        if field in distributions:
+            values = draw_samples(distributions[field], nominal, shape, rng)
+        else:
+            values = np.broadcast_to(nominal, shape)
+        if is_list:
+            # Distributions of a single sensor, by its position in the list
+            values = values.copy()
+            for index in range(len(components)):
+                if f"{index}.{field}" in distributions:
+                    values[:, index] = draw_samples(distributions[f"{index}.{field}"], nominal[index], number_of_samples, rng)
+        sample_fields[field] = values
+    return sample_fields
+
+def get_monte_carlo_consumption(sensors, microcontroller, radio_interface, duration, distributions, number_of_samples=10000, battery=None, seed=None, batch_size=100000, packet_model=None):
+    # Draws number_of_samples systems whose fields follow the given distributions and evaluates them with the
+    # analytic expressions of get_energy_arrays, batch_size samples at a time to bound the memory.
+    # distributions is {"component.field": distribution} (see draw_samples), e.g. "microcontroller.active_consumption",
+    # "radio_interface.retransmissions", "battery.capacity", "sensors.active_time" (every sensor, independently)
+    # or "sensors.0.active_consumption" (the first sensor). Fields without distribution keep their nominal value.
+    # The battery lifetime of every sample comes from its mean current, like the lifetime of run_config in analytic mode.
+    # In timeline mode run_config follows the current over the time (get_battery_lifetime), a few percent apart (see the README).
+    # With a PacketModel its fields (e.g. "packet_model.retry_probability") can also be given distributions
+    components = {"sensors": SENSOR_FIELDS, "microcontroller": MICROCONTROLLER_FIELDS, "radio_interface": RADIO_INTERFACE_FIELDS, "battery": BATTERY_FIELDS, "packet_model": PACKET_MODEL_FIELDS}
+    component_distributions = {kind: {} for kind in components}
+    sensors = list(sensors)
+    for key, distribution in distributions.items():
+        kind, _, field = key.partition(".")
+        if kind == "sensors" and "." in field:
+            # A single sensor, by its position in the list
+            index, _, field = field.partition(".")
+            if not index.isdigit() or int(index) >= len(sensors):
+                raise ValueError(f"Unknown sensor in '{key}'. Expected a position below {len(sensors)}")
+            index = int(index)
+        else:
+            index = None
+        if kind not in components or field == "name" or field not in components[kind] + EXTRA_FIELDS.get(kind, []):
+            raise ValueError(f"Unknown field '{key}'")
+        if kind == "battery" and battery is None:
+            raise ValueError(f"A distribution is given for '{key}' but there is no battery")
+        if kind == "packet_model" and packet_model is None:
+            raise ValueError(f"A distribution is given for '{key}' but there is no packet model")
+        component_distributions[kind][field if index is None else f"{index}.{field}"] = distribution
+    if packet_model is not None and packet_model.mtu is None:
+        packet_model = PacketModel(packet_model.header_size, np.inf, packet_model.retry_probability, packet_model.max_retries)
+    rng = np.random.default_rng(seed)
+    energies = {name: [] for name in ENERGY_NAMES}
+    battery_lifetimes = []
+    for first in range(0, number_of_samples, batch_size):
+        size = min(batch_size, number_of_samples - first)
+        sensor_fields = get_sample_fields("sensors", sensors, SENSOR_FIELDS, component_distributions["sensors"], size, rng)
+        microcontroller_fields = get_sample_fields("microcontroller", microcontroller, MICROCONTROLLER_FIELDS, component_distributions["microcontroller"], size, rng)
+        radio_interface_fields = get_sample_fields("radio_interface", radio_interface, RADIO_INTERFACE_FIELDS, component_distributions["radio_interface"], size, rng)
+        if packet_model is not None:
+            radio_interface_fields.update(get_sample_fields("packet_model", packet_model, PACKET_MODEL_FIELDS, component_distributions["packet_model"], size, rng))
+        energy_arrays = get_energy_arrays(sensor_fields, microcontroller_fields, radio_interface_fields, duration)
+        for name in ENERGY_NAMES:
+            energies[name].append(np.broadcast_to(energy_arrays[name], (size,)))
+        if battery is not None:
+            battery_fields = get_sample_fields("battery", battery, BATTERY_FIELDS, component_distributions["battery"], size, rng)
+            battery_lifetimes.append(get_battery_lifetime_arrays(battery_fields, energy_arrays["total_energy"] / duration))
+    return MonteCarloConsumption(
+        duration,
+        {name: np.concatenate(values) for name, values in energies.items()},
+        np.concatenate(battery_lifetimes) if battery is not None else None)
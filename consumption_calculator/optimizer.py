@@ -0,0 +1,153 @@
+import numpy as np
+
+from .components import SENSOR_FIELDS, MICROCONTROLLER_FIELDS, RADIO_INTERFACE_FIELDS
+from .model import get_energy_arrays
+from .transmission import PACKET_MODEL_FIELDS
+
+class ConfigurationCandidate:
+    def __init__(self, microcontroller, radio_interface, sampling_rates, data_refresh_rate, energy):
+        self.microcontroller = microcontroller
+        self.radio_interface = radio_interface
+        self.sampling_rates = sampling_rates # in Hz. One per sensor
+        self.data_refresh_rate = data_refresh_rate # in Hz
+        self.energy = energy # in mAs
+
+    def __repr__(self):
+        return (f"ConfigurationCandidate(microcontroller={self.microcontroller.name}, "
+                f"radio_interface={self.radio_interface.name}, "
+                f"sampling_rates={self.sampling_rates}, "
+                f"data_refresh_rate={self.data_refresh_rate}, "
+                f"energy={self.energy})")
+    def get_latency(self):
+        # Longest time (s) a measure waits in the buffer before it is transmitted
+        return 1 / self.data_refresh_rate
+    def get_results(self):
+        return {
+            "microcontroller": self.microcontroller.name,
+            "radio_interface": self.radio_interface.name,
+            "sampling_rates": self.sampling_rates,
+            "data_refresh_rate": self.data_refresh_rate,
+            "latency": self.get_latency(),
+            "total_energy": self.energy}
+
+class ParetoFront:
+    # Configurations where the energy can only be lowered by accepting a longer latency, sorted by latency
+    def __init__(self, candidates, number_of_evaluated_pairs, number_of_pruned_pairs):
+        self.candidates = candidates
+        self.number_of_evaluated_pairs = number_of_evaluated_pairs
+        self.number_of_pruned_pairs = number_of_pruned_pairs # Microcontroller and radio interface pairs discarded by their energy bound
+
+    def __repr__(self):
+        return (f"ParetoFront(candidates={len(self.candidates)}, "
+                f"number_of_evaluated_pairs={self.number_of_evaluated_pairs}, "
+                f"number_of_pruned_pairs={self.number_of_pruned_pairs})")
+    def get_lowest_energy(self, max_latency=np.inf):
+        # Candidate with the lowest energy among the ones with a latency up to max_latency
+        feasible = [candidate for candidate in self.candidates if candidate.get_latency() <= max_latency]
+        return min(feasible, key=lambda candidate: candidate.energy) if feasible else None
+    def get_results(self):
+        return [candidate.get_results() for candidate in self.candidates]
+
+def get_component_fields(component, fields):
+    return {field: np.array(getattr(component, field), dtype=float) for field in fields if field != "name"}
+
+def get_pareto_mask(latencies, energies):
+    # Points not dominated by another point with lower or equal latency and lower energy
+    order = np.lexsort((energies, latencies))
+    sorted_energies = energies[order]
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = sorted_energies[1:] < np.minimum.accumulate(sorted_energies)[:-1]
+    mask = np.zeros(len(order), dtype=bool)
+    mask[order] = keep
+    return mask
+
+def optimize_sampling_rates(sensor_fields, microcontroller_fields, radio_interface_fields, data_refresh_rates, rate_grids, duration, max_passes=4):
+    # Lowest energy sampling rates of one microcontroller and radio interface for every data refresh rate.
+    # The energy of get_energy_arrays is piecewise linear in every sampling rate, so a coordinate descent over
+    # grids that include the bounds of every rate finds its minimum. All the refresh rates and the grid of a
+    # sensor are evaluated in one call
+    number_of_sensors, number_of_rates = rate_grids.shape
+
+    def get_total_energy(sampling_rates, data_refresh_rates):
+        return get_energy_arrays({**sensor_fields, "sampling_rate": sampling_rates}, microcontroller_fields,
+                                 {**radio_interface_fields, "data_refresh_rate": data_refresh_rates}, duration)["total_energy"]
+
+    sampling_rates = np.tile(rate_grids[:, 0], (len(data_refresh_rates), 1))
+    energies = get_total_energy(sampling_rates, data_refresh_rates)
+    for _ in range(max_passes):
+        improved = False
+        for sensor in range(number_of_sensors):
+            trials = np.repeat(sampling_rates[:, np.newaxis, :], number_of_rates, axis=1)
+            trials[:, :, sensor] = rate_grids[sensor]
+            trial_energies = get_total_energy(trials, data_refresh_rates[:, np.newaxis])
+            best = np.argmin(trial_energies, axis=1)
+            best_energies = trial_energies[np.arange(len(data_refresh_rates)), best]
+            better = best_energies < energies * (1 - 1e-12)
+            sampling_rates[better, sensor] = rate_grids[sensor, best[better]]
+            energies = np.where(better, best_energies, energies)
+            improved = improved or bool(np.any(better))
+        if not improved:
+            break
+    return sampling_rates, energies
+
+def optimize_system_configuration(sensors, microcontrollers, radio_interfaces, duration, max_latency, min_samples_per_hour, min_latency=60, max_sampling_rates=None,
+                                  packet_model=None, number_of_latencies=32, number_of_rates=16):
+    # Sampling rate of every sensor and data refresh rate with the lowest energy (analytic expressions of get_energy_arrays)
+    # for every pair of the catalog microcontrollers and radio interfaces, subject to a latency between min_latency and
+    # max_latency seconds and at least min_samples_per_hour measures per hour (a value or one per sensor). Sampling rates
+    # go up to max_sampling_rates (the catalog rates by default). The energy only grows with the sampling rates, so the
+    # minimum rates are the ones of the front and must be positive: a sensor that never measures is not a configuration.
+    # Branch and bound over the pairs: the sensor energy does not depend on the pair, and the radio and microcontroller
+    # energies only grow or only shrink with the sampling rates, so evaluating all the pairs with every rate at its lower
+    # and at its upper bound gives a lower bound of the energy of every pair and latency. Pairs are explored from the lowest
+    # energy, and a latency of a pair is only optimized while its bound is below the best energy found up to that latency
+    latencies = np.geomspace(min_latency, max_latency, number_of_latencies) if max_latency > min_latency else np.array([float(max_latency)])
+    data_refresh_rates = 1 / latencies
+    sensor_fields = {field: np.array([getattr(sensor, field) for sensor in sensors], dtype=float) for field in SENSOR_FIELDS if field != "name"}
+    lower_rates = np.broadcast_to(np.asarray(min_samples_per_hour, dtype=float) / 3600, (len(sensors),))
+    if not np.all(lower_rates > 0):
+        raise ValueError(f"The minimum number of measures per hour must be positive, got {min_samples_per_hour}")
+    upper_rates = np.maximum(sensor_fields["sampling_rate"] if max_sampling_rates is None else np.asarray(max_sampling_rates, dtype=float), lower_rates)
+    rate_grids = np.linspace(lower_rates, upper_rates, number_of_rates, axis=1)
+    packet_fields = {}
+    if packet_model is not None:
+        packet_fields = get_component_fields(packet_model, [field for field in PACKET_MODEL_FIELDS if field != "mtu"])
+        packet_fields["mtu"] = np.array(packet_model.mtu if packet_model.mtu is not None else np.inf, dtype=float)
+
+    pairs = [(microcontroller, radio_interface) for microcontroller in microcontrollers for radio_interface in radio_interfaces]
+    microcontroller_fields = {field: np.array([getattr(microcontroller, field) for microcontroller, radio_interface in pairs], dtype=float)[:, np.newaxis] for field in MICROCONTROLLER_FIELDS if field != "name"}
+    radio_interface_fields = {field: np.array([getattr(radio_interface, field) for microcontroller, radio_interface in pairs], dtype=float)[:, np.newaxis] for field in RADIO_INTERFACE_FIELDS if field != "name"}
+    radio_interface_fields.update(packet_fields)
+    radio_interface_fields["data_refresh_rate"] = data_refresh_rates
+    lower_energies = get_energy_arrays({**sensor_fields, "sampling_rate": lower_rates}, microcontroller_fields, radio_interface_fields, duration)
+    upper_energies = get_energy_arrays({**sensor_fields, "sampling_rate": upper_rates}, microcontroller_fields, radio_interface_fields, duration)
+    # Lowest sensor energy in the box of rates: sum_i c_i*cumsum(t*n)_i = sum_k t_k*n_k*(sum of c_i for i >= k)
+    coefficients = np.cumsum((sensor_fields["active_consumption"] - sensor_fields["inactive_consumption"])[::-1])[::-1]
+    lowest_measuring_times = sensor_fields["active_time"] * np.where(coefficients >= 0, lower_rates, upper_rates) * duration
+    sensoring_bound = np.sum(sensor_fields["inactive_consumption"]) * duration + np.sum(coefficients * lowest_measuring_times)
+    bounds = (sensoring_bound + np.minimum(lower_energies["communications_energy"], upper_energies["communications_energy"])
+              + np.minimum(lower_energies["microcontroller_energy"], upper_energies["microcontroller_energy"]))
+
+    best_energies = np.full(len(latencies), np.inf)
+    number_of_evaluated_pairs = 0
+    points = []
+    for index in np.argsort(lower_energies["total_energy"][:, -1], kind='stable'):
+        # Latencies where the pair may improve the front: the best energy up to every latency is the cumulative minimum
+        open_latencies = np.flatnonzero(bounds[index] < np.minimum.accumulate(best_energies))
+        if len(open_latencies) == 0:
+            continue
+        microcontroller, radio_interface = pairs[index]
+        sampling_rates, energies = optimize_sampling_rates(
+            sensor_fields, get_component_fields(microcontroller, MICROCONTROLLER_FIELDS),
+            {**get_component_fields(radio_interface, RADIO_INTERFACE_FIELDS), **packet_fields}, data_refresh_rates[open_latencies], rate_grids, duration)
+        number_of_evaluated_pairs += 1
+        best_energies[open_latencies] = np.minimum(best_energies[open_latencies], energies)
+        points.extend((energies[i], latencies[j], microcontroller, radio_interface, sampling_rates[i]) for i, j in enumerate(open_latencies))
+
+    energies = np.array([point[0] for point in points])
+    point_latencies = np.array([point[1] for point in points])
+    mask = get_pareto_mask(point_latencies, energies)
+    candidates = [ConfigurationCandidate(microcontroller, radio_interface, sampling_rates.tolist(), 1 / latency, float(energy))
+                  for (energy, latency, microcontroller, radio_interface, sampling_rates), keep in zip(points, mask) if keep]
+    candidates.sort(key=lambda candidate: candidate.get_latency())
+    return ParetoFront(candidates, number_of_evaluated_pairs, len(pairs) - number_of_evaluated_pairs)
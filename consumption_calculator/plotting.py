@@ -0,0 +1,241 @@
+import random
+import matplotlib.pyplot as plt
+import matplotlib
+import matplotlib.table
+import numpy as np
+import pandas as pd
+
+from .reporting import get_consumption_summary, get_stacked_currents, get_bucket_size, get_bucket_min_max_indices, get_summary_table_data
+from .simulation import simulate_consumption, check_timeline
+from .instrumentation import NO_INSTRUMENTATION
+
+def show_consumptions(system_consumption, sensors, microcontroller, radio_interface, duration, max_points=4000, instrumentation=None):
+    # This method plots a pie chart with the energy consumption of each element in a fingure
+    #  and another three figures for sensoring, communications and microcontroller energy consumption distinguishing between active and inactive consumption.
+    # The time series is reduced to about max_points points keeping the peaks of the total current (None to draw every sample).
+    # With an Instrumentation every figure and the time series assembly are timed
+    check_timeline(system_consumption)
+    if instrumentation is None:
+        instrumentation = NO_INSTRUMENTATION
+
+
+    def slices_values_curr(value):
+        return '{:.2f}%,\nAbs: {:.0f} mAs,\nAvg: {:.0f} mA'.format(100*value/total, value, value/duration)
+    
+    def slices_values_pwr(value):
+        return '{:.2f}%,\nAbs: {:.0f} mWs,\nAvg: {:.0f} mW'.format(100*value/total, value, value/duration)
+    
+    def create_labels(widges, labels):
+        bbox_props = dict(boxstyle="square,pad=0.3", fc="w", ec="k", lw=0.72)
+        kw = dict(arrowprops=dict(arrowstyle="-"),
+                bbox=bbox_props, zorder=0, va="center")
+        for i, p in enumerate(wedges):
+            ang = (p.theta2 - p.theta1)/2. + p.theta1
+            y = np.sin(np.deg2rad(ang))
+            x = np.cos(np.deg2rad(ang))
+            horizontalalignment = {-1: "right", 1: "left"}[int(np.sign(x))]
+            connectionstyle = f"angle,angleA=0,angleB={ang}"
+            kw["arrowprops"].update({"connectionstyle": connectionstyle})
+            ax.annotate(curr_consumptions[i], xy=(x, y), xytext=((1.6-abs(y))*np.sign(x), 1.1*y),
+                        horizontalalignment=horizontalalignment, **kw)
+            
+    instrumentation.start_stage("settings_tables")
+    plt.figure(figsize=(12, 8))
+    # Display duration
+    ax = plt.subplot(6, 1, 1)
+    duration_table = matplotlib.table.table(
+        ax,
+        [[str(duration) + " seconds"]],
+        colLabels=['Duration (s)'],
+        cellLoc='center',
+        loc='center',
+        rowLabels=[''])
+    duration_table.set_fontsize(8)
+    duration_table.scale(1, 2)
+    plt.axis('off')
+    # Display the microcontroller table
+    ax = plt.subplot(6, 1, 2)
+    microcontroller_df = pd.DataFrame([vars(microcontroller)])
+    microcontroller_table = matplotlib.table.table(
+        ax,
+        microcontroller_df[['name','operating_voltage', 'active_consumption', 'light_sleep_consumption', 'deep_sleep_consumption']].values,
+        colLabels=['MC name', 'Voltage (V)', 'Active\nCurr. Cons. (mA)', 'Light Sleep\nCurr. Cons. (mA)', 'Deep Sleep\nCurr. Cons. (mA)'],
+        # rowLabels=[microcontroller.name],
+        # colWidths=[0.18]*5,
+        colColours=['#f0f0f0']*5,
+        cellLoc='center',
+        loc='center')
+    microcontroller_table.set_fontsize(8)
+    microcontroller_table.scale(1, 2)
+    plt.axis('off')
+    # Display the radio interface table
+    ax = plt.subplot(6, 1, 3)
+    radio_interface_df = pd.DataFrame([vars(radio_interface)])
+    radio_interface_table = matplotlib.table.table(
+        ax,
+        radio_interface_df[['name', 'operating_voltage', 'transmit_consumption', 'receive_consumption', 'inactive_consumption', 'datarate', 'data_refresh_rate']].values,
+        colLabels=['Radio name', 'Voltage (V)', 'Transmit\nCurr. Cons. (mA)', 'Receive\nCurr. Cons. (mA)', 'Inactive\nCurr. Cons. (mA)', 'Datarate (bps)', 'Update Rate (Hz)'],
+        # rowLabels=[radio_interface.name],
+        # colWidths=[0.18]*7,
+        colColours=['#f0f0f0']*7,
+        cellLoc='center',
+        loc='center')
+    radio_interface_table.set_fontsize(8)
+    radio_interface_table.scale(1, 2)
+    plt.axis('off')
+    # Display the sensors table
+    ax = plt.subplot(6, 1, 4)
+    sensors_df = pd.DataFrame([vars(sensor) for sensor in sensors])
+    sensors_table = matplotlib.table.table(
+        ax,
+        sensors_df[['name','operating_voltage', 'active_consumption', 'inactive_consumption', 'sampling_rate', 'active_time', 'data_volume']].values,
+        colLabels=['Sensor name', 'Voltage (V)', 'Active\nCurr. Cons. (mA)', 'Inactive\nCurr. Cons. (mA)', 'Sampling Rate (Hz)', 'Active Time (s)', 'Data\nVolume (bytes)'],
+        # rowLabels=[sensor.get_name() for sensor in sensors],
+        # colWidths=[0.2]*7,
+        colColours=['#f0f0f0']*7,
+        cellLoc='center',
+        loc='center')
+    sensors_table.set_fontsize(8)
+    sensors_table.scale(1, 2)
+    plt.axis('off')
+
+    instrumentation.start_stage("energy_pie_charts")
+    plt.figure(figsize=(12, 8))
+    # Plot the sensoring energy consumption distinguishing between active and inactive consumption
+    plt.subplot(1, 3, 1)
+    plt.title("Sensoring Energy\nConsumption")
+    sensoring_actticve_energy_consumption = 0
+    sensoring_inactive_energy_consumption = 0
+    for sensor in system_consumption.get_sensoring_consumption():
+        sensoring_actticve_energy_consumption += sensor.get_active_energy()
+        sensoring_inactive_energy_consumption += sensor.get_inactive_energy()
+    labels = ['Active Consumption', 'Inactive Consumption']
+    sizes = [sensoring_actticve_energy_consumption, sensoring_inactive_energy_consumption]
+    colors = ['gold', 'lightcoral']
+    explode = (0.1, 0)  # explode the first slice
+    total = sensoring_inactive_energy_consumption + sensoring_actticve_energy_consumption
+    wedges, texts, autotexts = plt.pie(sizes, explode=explode, colors=colors, autopct=slices_values_curr, shadow=True, startangle=140)
+    plt.setp(autotexts, size=8, weight="bold")
+    plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle.
+    # plt.table([["%.2f mAh" % (size/3600) for size in sizes]], loc='bottom', cellLoc='center', colLabels=['Active Consumption', 'Inactive Consumption'])
+    
+    # Plot the communications energy consumption distinguishing between active and inactive consumption
+    plt.subplot(1, 3, 2)
+    plt.title("Communications Energy\nConsumption")
+    sizes = [system_consumption.get_communications_consumption().get_active_energy(), system_consumption.get_communications_consumption().get_inactive_energy()]
+    explode = (0.1, 0)  # explode the first slice
+    total = system_consumption.get_communications_energy_consumption()
+    wedges, texts, autotexts = plt.pie(sizes, colors=colors, explode=explode, autopct=slices_values_curr, shadow=True, startangle=140)
+    plt.legend(wedges, labels, loc="lower center" )
+    plt.setp(autotexts, size=8, weight="bold")
+    plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle.
+    # plt.table([["%.2f mAh" % (size/3600) for size in sizes]], loc='bottom', cellLoc='center', colLabels=['Active Consumption', 'Inactive Consumption'])
+    
+    # Plot the microcontroller energy consumption distinguishing between active and inactive consumption
+    plt.subplot(1, 3, 3)
+    plt.title("Microcontroller Energy\nConsumption")
+    sizes = [system_consumption.get_microcontroller_consumption().get_active_energy(), system_consumption.get_microcontroller_consumption().get_inactive_energy()]
+    total = system_consumption.get_microcontroller_energy_consumption()
+    wedges, texts, autotexts = plt.pie(sizes, colors=colors, explode=explode, autopct=slices_values_curr, shadow=True, startangle=140)
+    plt.setp(autotexts, size=8, weight="bold")
+    plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle.
+    # plt.table([["%.2f mAh" % (size/3600) for size in sizes]], loc='bottom', cellLoc='center', colLabels=['Active Consumption', 'Inactive Consumption'])
+   
+    instrumentation.start_stage("consumption_pie_charts")
+    plt.figure(figsize=(12, 8))
+    
+    # # Plot the current consumption of the system
+    # ax = plt.subplot(2, 2, 1)
+    # print(system_consumption.get_sensors_current_consumption())
+    # sizes = [system_consumption.get_sensoring_current_consumption(), system_consumption.get_microcontroller_energy_consumption(), system_consumption.get_communications_energy_consumption()]
+    # total = sum(sizes)
+    # curr_consumptions = ["Sensors:\n" + slices_values_curr(system_consumption.get_sensoring_current_consumption()), "Microcontroller:\n" + slices_values_curr(system_consumption.get_microcontroller_energy_consumption()), "Radio Interface:\n" + slices_values_curr(system_consumption.get_communications_energy_consumption())]
+    # wedges, texts = plt.pie(sizes, wedgeprops=dict(width=0.5), startangle=-80)
+    # create_labels(wedges, curr_consumptions)
+    # ax.set_title("Current Consumption")
+    # plt.axis('equal')
+
+    # Plot the current consumption of the system
+    ax = plt.subplot(3, 2, 1)
+    # sizes = [system_consumption.get_sensoring_current_consumption(), system_consumption.get_microcontroller_energy_consumption(), system_consumption.get_communications_energy_consumption()]
+    sizes_curr = system_consumption.get_sensors_current_consumption()
+    sizes_curr.extend([system_consumption.get_microcontroller_energy_consumption(), system_consumption.get_communications_energy_consumption()])
+    total = sum(sizes_curr)
+    colors = ["#"+''.join([random.choice('0123456789ABCDEF') for j in range(6)])
+             for i in range(len(sizes_curr))]
+    curr_consumptions = [sensor.name + "\n" + slices_values_curr(sensor.get_total_energy()) for sensor in system_consumption.get_sensoring_consumption()]
+    curr_consumptions.extend([system_consumption.get_microcontroller_consumption().name + ":\n" + slices_values_curr(system_consumption.get_microcontroller_energy_consumption()), system_consumption.get_communications_consumption().name + ":\n" + slices_values_pwr(system_consumption.get_communications_energy_consumption())])
+    # curr_consumptions = ["Sensors:\n" + slices_values_curr(system_consumption.get_sensoring_current_consumption()), "Microcontroller:\n" + slices_values_curr(system_consumption.get_microcontroller_energy_consumption()), "Radio Interface:\n" + slices_values_curr(system_consumption.get_communications_energy_consumption())]
+    wedges, texts = plt.pie(sizes_curr, wedgeprops=dict(width=0.5), startangle=-80, colors=colors)
+    create_labels(wedges, curr_consumptions)
+    ax.set_title("Current Consumption")
+    plt.axis('equal')
+
+
+    # Plot power consumption of each elment in a pie chart
+    ax = plt.subplot(3, 2, 2)
+    sensoring_power_consumption = sum([sensor.operating_voltage * sensor.get_total_energy() for sensor in system_consumption.get_sensoring_consumption()])
+    microcontroller_power_consumption = microcontroller.operating_voltage * system_consumption.get_microcontroller_energy_consumption()
+    radio_power_consumption = radio_interface.operating_voltage * system_consumption.get_communications_energy_consumption()
+    sizes_pwr = [sensor.operating_voltage * sensor.get_total_energy() for sensor in system_consumption.get_sensoring_consumption()]
+    sizes_pwr.extend([microcontroller_power_consumption, radio_power_consumption])
+    # sizes = [sensoring_power_consumption, microcontroller_power_consumption, radio_power_consumption]
+    total = sum(sizes_pwr)
+    curr_consumptions = [sensor.name + "\n" + slices_values_pwr(sensor.get_total_energy() * sensor.operating_voltage) for sensor in system_consumption.get_sensoring_consumption()]
+    curr_consumptions.extend([system_consumption.get_microcontroller_consumption().name + ":\n" + slices_values_pwr(microcontroller_power_consumption), system_consumption.get_communications_consumption().name + ":\n" + slices_values_pwr(radio_power_consumption)])
+    # curr_consumptions = ["Sensors:\n" + slices_values_pwr(sensoring_power_consumption), system_consumption.get_microcontroller_consumption().name + ":\n" + slices_values_pwr(microcontroller_power_consumption), system_consumption.get_radio_interface_consumption().name + ":\n" + slices_values_pwr(radio_power_consumption)]
+    wedges, texts = plt.pie(sizes_pwr, wedgeprops=dict(width=0.5), startangle=-80, colors=colors)
+    create_labels(wedges, curr_consumptions)
+    ax.set_title("Power Consumption")
+    plt.axis('equal')
+
+    ax = plt.subplot(3, 1, 2)
+    # Plot a time series of the current consumption splitting between sensoring, communication and microcontroller consumptions
+    plt.title("Current Consumption Time Series")
+
+    # Current consumption of every element (sensors, microcontroller and radio interface) over the time. The timeline is
+    # simulated in windows of whole buckets of the min/max reduction, so only the kept samples of every window stay in memory,
+    # and the summary table comes from the aggregates of the simulation
+    instrumentation.start_stage("time_series_assembly")
+    resolution = system_consumption.get_microcontroller_consumption().schedule.resolution
+    number_of_samples = system_consumption.get_microcontroller_consumption().schedule.get_number_of_samples(resolution)
+    bucket_size = get_bucket_size(number_of_samples, max_points)
+    window_samples = bucket_size * max(int(round(86400 * resolution)) // bucket_size, 1)
+    # Stack the microcontroller at the bottom, then the radio interface and the sensors
+    order = [len(sensors), len(sensors) + 1] + list(range(len(sensors)))
+    window_stacked_currents = []
+    window_x_values = []
+    first_sample = 0
+    for window in simulate_consumption(system_consumption, window_samples / resolution, resolution):
+        instrumentation.count("timeline_samples", window.currents.shape[1])
+        instrumentation.count("timeline_values", window.currents.size)
+        window_currents = get_stacked_currents(window.currents, order)
+        # The same samples are kept for every line so the stack stays consistent, and so are the first and last samples of the timeline
+        indices = get_bucket_min_max_indices(window_currents[-1], bucket_size)
+        ends = np.array([0, number_of_samples - 1]) - first_sample
+        indices = np.union1d(indices, ends[(ends >= 0) & (ends < window.currents.shape[1])])
+        window_stacked_currents.append(window_currents[:, indices])
+        window_x_values.append((first_sample + indices) / resolution)
+        first_sample += window.currents.shape[1]
+    summary = get_consumption_summary(window.aggregate)
+    stacked_currents = np.concatenate(window_stacked_currents, axis=1)
+    x_values = np.concatenate(window_x_values)
+    instrumentation.count("plotted_points", len(x_values))
+    instrumentation.start_stage("time_series_plot")
+    labels = [microcontroller.name, radio_interface.name] + [sensor.get_name() for sensor in sensors]
+    stack_colors = [colors[-2], colors[-1]] + colors[:len(sensors)]
+    for i in range(len(order)):
+        plt.fill_between(x_values, stacked_currents[i], stacked_currents[i + 1], step='post', color=stack_colors[i], linewidth=0)
+    plt.legend(labels, loc='upper left', bbox_to_anchor=(0, 0, 0.5, 1))
+    plt.xlabel("Time (s)")
+    plt.ylabel("Current (mA)")
+    instrumentation.start_stage("summary_table")
+    table_data = get_summary_table_data(summary)
+    ax = plt.subplot(3, 1, 3)
+    table = matplotlib.table.table(ax, table_data, loc='center', cellLoc='center', colLabels=['Current Consumption (mAh)', 'Maximum Current (mA)', 'Average Current (mA)','Power Consumption (mWh)', 'Maximum Power (mW)', 'Average Power (mW)'], rowLabels=[sensor.get_name() for sensor in sensors] + [microcontroller.name, radio_interface.name])
+    table.set_fontsize(24)
+    table.scale(1, 2)
+    plt.axis('off')
+    instrumentation.start_stage("render")
+    plt.show()
+    instrumentation.stop_stage()
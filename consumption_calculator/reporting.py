@@ -0,0 +1,73 @@
+import math
+import numpy as np
+import pandas as pd
+
+from .simulation import ConsumptionAggregate, get_elements, get_current_matrix, check_timeline
+
+# Columns of the summary table with their units
+SUMMARY_UNITS = {
+    "charge": "mAh",
+    "peak_current": "mA",
+    "mean_current": "mA",
+    "energy": "mWh",
+    "peak_power": "mW",
+    "mean_power": "mW"}
+
+def get_consumption_summary(aggregate):
+    # Summary table with one row per element from the aggregates of a simulation
+    return pd.DataFrame({
+        "charge": aggregate.get_charge(),
+        "peak_current": aggregate.get_peak_current(),
+        "mean_current": aggregate.get_mean_current(),
+        "energy": aggregate.get_energy(),
+        "peak_power": aggregate.get_peak_power(),
+        "mean_power": aggregate.get_mean_power()},
+        index=pd.Index(aggregate.names, name="name"))
+
+def get_consumption_report(system_consumption, resolution=None):
+    # Current matrix (elements x samples) of the whole timeline and its summary table, computed in one vectorized reduction.
+    # Elements are in the order of the summary table: sensors, microcontroller and radio interface
+    check_timeline(system_consumption)
+    elements = get_elements(system_consumption)
+    if resolution is None:
+        resolution = system_consumption.get_microcontroller_consumption().schedule.resolution
+    currents = get_current_matrix(elements, resolution)
+    aggregate = ConsumptionAggregate([element.name for element in elements], [element.operating_voltage for element in elements], resolution)
+    aggregate.update(currents)
+    return currents, get_consumption_summary(aggregate)
+
+def get_stacked_currents(currents, order):
+    # Upper line of every element when the currents are stacked in the given order of rows, plus a zero line at the bottom
+    stacked_currents = np.zeros((len(order) + 1, currents.shape[1]))
+    np.cumsum(currents[order], axis=0, out=stacked_currents[1:])
+    return stacked_currents
+
+def get_bucket_size(number_of_samples, max_points):
+    # Number of consecutive samples reduced to their minimum and maximum so a line can be drawn with about max_points points
+    if max_points is None or number_of_samples <= max_points:
+        return 1
+    return math.ceil(number_of_samples / max(max_points // 2, 1))
+
+def get_bucket_min_max_indices(values, bucket_size):
+    # Indices of the minimum and maximum of every bucket of bucket_size consecutive samples (the last one may be shorter).
+    # Windows of a multiple of bucket_size samples can be reduced one by one with the same result as the whole line
+    if bucket_size == 1:
+        return np.arange(len(values))
+    number_of_buckets = math.ceil(len(values) / bucket_size)
+    padding = number_of_buckets * bucket_size - len(values)
+    buckets = np.pad(values, (0, padding), mode='edge').reshape(number_of_buckets, bucket_size)
+    offsets = np.arange(number_of_buckets) * bucket_size
+    indices = np.concatenate((offsets + buckets.argmin(axis=1), offsets + buckets.argmax(axis=1)))
+    return np.unique(np.minimum(indices, len(values) - 1))
+
+def get_min_max_indices(values, max_points):
+    # Indices of the samples to keep so a line of values can be drawn with about max_points points: the minimum
+    # and maximum of every bucket of consecutive samples, so short peaks (e.g. transmissions) stay visible
+    if len(values) <= max_points:
+        return np.arange(len(values))
+    indices = get_bucket_min_max_indices(values, get_bucket_size(len(values), max_points))
+    return np.unique(np.concatenate(([0, len(values) - 1], indices)))
+
+def get_summary_table_data(summary):
+    # Values of the summary table formatted with their units
+    return [["%.2f %s" % (value, SUMMARY_UNITS[column]) for column, value in row.items()] for _, row in summary.iterrows()]
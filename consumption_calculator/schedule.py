@@ -0,0 +1,89 @@
+import numpy as np
+
+class Schedule:
+    # Activity of an element over the time, stored as sorted and non-overlapping [start, end) intervals in seconds.
+    # Memory and operations scale with the number of intervals instead of with the duration
+    def __init__(self, starts, ends, duration, resolution=1):
+        starts = np.clip(np.asarray(starts, dtype=float), 0, duration)
+        ends = np.clip(np.asarray(ends, dtype=float), 0, duration)
+        non_empty = ends > starts
+        self.starts, self.ends = merge_intervals(starts[non_empty], ends[non_empty])
+        self.duration = duration
+        self.resolution = resolution # Number of samples per second of the dense view
+    def __repr__(self):
+        return (f"Schedule(intervals={len(self.starts)}, "
+                f"active_time={self.get_total_active_time()}, "
+                f"duration={self.duration}, "
+                f"resolution={self.resolution})")
+    def get_intervals(self):
+        return list(zip(self.starts.tolist(), self.ends.tolist()))
+    def get_number_of_intervals(self):
+        return len(self.starts)
+    def get_total_active_time(self):
+        return float(np.sum(self.ends - self.starts))
+    def union(self, *schedules):
+        # Active when any of the schedules is active
+        return combine_schedules((self,) + schedules, 1)
+    def intersection(self, *schedules):
+        # Active when all the schedules are active
+        return combine_schedules((self,) + schedules, len(schedules) + 1)
+    def get_active_time_per_bucket(self, bucket_length):
+        # Active time inside every bucket of bucket_length seconds, from the cumulative active time at the bucket edges
+        edges = np.append(np.arange(0, self.duration, bucket_length), self.duration)
+        cumulative_active_time = np.concatenate(([0], np.cumsum(self.ends - self.starts)))
+        previous = np.searchsorted(self.starts, edges, side='right')
+        # Time of the intervals started before every edge, minus the part of the last one that is after the edge
+        active_time = cumulative_active_time[previous]
+        inside = previous > 0
+        active_time[inside] -= np.maximum(self.ends[previous[inside] - 1] - edges[inside], 0)
+        return np.diff(active_time)
+    def get_number_of_samples(self, resolution=None):
+        if resolution is None:
+            resolution = self.resolution
+        return int(round(self.duration * resolution))
+    def to_dense(self, resolution=None, dtype=bool, first_sample=0, last_sample=None):
+        # View with one entry per sample, only built when requested. Sample i is active when it is inside some interval.
+        # Every interval adds +1 at its first sample and -1 after its last one, so a cumulative sum fills all the intervals at once.
+        # first_sample and last_sample select a window of the timeline, so long timelines can be built piece by piece
+        if resolution is None:
+            resolution = self.resolution
+        if last_sample is None:
+            last_sample = self.get_number_of_samples(resolution)
+        num_samples = last_sample - first_sample
+        # Only the intervals that may overlap the window are converted to samples
+        first_interval = np.searchsorted(self.ends, first_sample / resolution, side='left')
+        last_interval = np.searchsorted(self.starts, (last_sample + 1) / resolution, side='left')
+        start_samples = np.floor(self.starts[first_interval:last_interval] * resolution).astype(np.int64) - first_sample
+        end_samples = np.floor(self.ends[first_interval:last_interval] * resolution).astype(np.int64) - first_sample
+        start_samples = np.clip(start_samples, 0, num_samples)
+        end_samples = np.clip(end_samples, 0, num_samples)
+        changes = np.bincount(start_samples, minlength=num_samples + 1) - np.bincount(end_samples, minlength=num_samples + 1)
+        return (np.cumsum(changes[:num_samples]) > 0).astype(dtype, copy=False)
+
+def merge_intervals(starts, ends):
+    # Sort the intervals and join the ones that overlap or touch each other
+    if len(starts) == 0:
+        return starts, ends
+    order = np.argsort(starts, kind='stable')
+    starts = starts[order]
+    running_end = np.maximum.accumulate(ends[order])
+    new_interval = np.empty(len(starts), dtype=bool)
+    new_interval[0] = True
+    new_interval[1:] = starts[1:] > running_end[:-1]
+    last_of_interval = np.append(new_interval[1:], True)
+    return starts[new_interval], running_end[last_of_interval]
+
+def combine_schedules(schedules, min_active):
+    # Sweep over the start (+1) and end (-1) events of all the schedules and keep the time where
+    # at least min_active of them are active. Starts go before ends at the same time so touching intervals are joined
+    duration = max(schedule.duration for schedule in schedules)
+    resolution = max(schedule.resolution for schedule in schedules)
+    times = np.concatenate([schedule.starts for schedule in schedules] + [schedule.ends for schedule in schedules])
+    steps = np.concatenate([np.ones(len(schedule.starts), dtype=int) for schedule in schedules] + [-np.ones(len(schedule.ends), dtype=int) for schedule in schedules])
+    order = np.lexsort((-steps, times))
+    times, steps = times[order], steps[order]
+    active = np.cumsum(steps)
+    previous_active = active - steps
+    opened = (previous_active < min_active) & (active >= min_active)
+    closed = (previous_active >= min_active) & (active < min_active)
+    return Schedule(times[opened], times[closed], duration, resolution)
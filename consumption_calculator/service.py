@@ -0,0 +1,176 @@
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from urllib.parse import unquote, urlsplit
+
+from .catalog import ComponentCatalog, CATALOG_TABLES, load_components, parse_sensor, parse_microcontroller, parse_radio_interface
+
+# Text catalogs loaded when the service has no SQLite catalog
+CATALOG_FILES = {
+    "sensor": ("sensors.txt", parse_sensor),
+    "microcontroller": ("microcontrollers.txt", parse_microcontroller),
+    "radio_interface": ("radio_interfaces.txt", parse_radio_interface)}
+# Errors of a request that are reported as a bad request instead of a server error
+REQUEST_ERRORS = (KeyError, ValueError, TypeError)
+
+def load_worker():
+    # Imports the model in a worker process before the first request
+    from . import __main__
+    return os.getpid()
+
+def evaluate_config(config):
+    # Runs in the worker processes
+    from .__main__ import run_config
+    return run_config(config)
+
+def load_catalog(database=None):
+    # Fields of every component of the catalog by kind and name, kept in memory: {kind: {name: fields}}
+    if database is not None:
+        catalog = ComponentCatalog(database)
+        components = {kind: catalog.find(kind) for kind in CATALOG_TABLES}
+        catalog.close()
+    else:
+        components = {kind: load_components(file_name, parse) if os.path.exists(file_name) else [] for kind, (file_name, parse) in CATALOG_FILES.items()}
+    return {kind: {component.name: vars(component) for component in kind_components} for kind, kind_components in components.items()}
+
+class ConsumptionService:
+    # Local HTTP/JSON service of the energy estimates. Requests are read by an asyncio loop and the runs go to a pool of
+    # worker processes, so the model and its imports are loaded once. Identical runs in flight at the same time are
+    # computed once, and components given by name are taken from the catalog in memory.
+    #   POST /run                    Results of a configuration, as the run command (see run_config)
+    #   GET /catalog/<kind>          Components of a kind: sensor, microcontroller or radio_interface
+    #   GET /catalog/<kind>/<name>   Fields of a component
+    #   GET /health                  Counters of the service
+    def __init__(self, catalog, max_workers=None):
+        self.catalog = catalog # {kind: {name: fields}}
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = None
+        self.in_flight = {} # {canonical configuration: future of its results}
+        self.requests = 0
+        self.coalesced_requests = 0
+
+    def __repr__(self):
+        return (f"ConsumptionService(max_workers={self.max_workers}, "
+                f"in_flight={len(self.in_flight)}, "
+                f"requests={self.requests}, "
+                f"coalesced_requests={self.coalesced_requests})")
+    def get_component(self, kind, description):
+        if isinstance(description, str):
+            if description not in self.catalog[kind]:
+                raise KeyError(f"No {kind} named {description} in the catalog")
+            return self.catalog[kind][description]
+        return description
+    def resolve_components(self, config):
+        # Configuration with the components given by name replaced by their fields, so workers never open the catalog
+        if not isinstance(config, dict):
+            raise TypeError("The configuration must be a JSON object")
+        config = dict(config)
+        config.pop("catalog", None)
+        config["sensors"] = [self.get_component("sensor", sensor) for sensor in config["sensors"]]
+        config["microcontroller"] = self.get_component("microcontroller", config["microcontroller"])
+        config["radio_interface"] = self.get_component("radio_interface", config["radio_interface"])
+        return config
+    async def run(self, config):
+        config = self.resolve_components(config)
+        key = json.dumps(config, sort_keys=True, separators=(",", ":"))
+        self.requests += 1
+        future = self.in_flight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, evaluate_config, config)
+            self.in_flight[key] = future
+            future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        else:
+            self.coalesced_requests += 1
+        # A client that disconnects does not cancel the run of the other clients waiting for it
+        return await asyncio.shield(future)
+    def get_health(self):
+        return {
+            "status": "ok",
+            "workers": self.max_workers,
+            "in_flight": len(self.in_flight),
+            "requests": self.requests,
+            "coalesced_requests": self.coalesced_requests,
+            "catalog": {kind: len(components) for kind, components in self.catalog.items()}}
+    async def handle_request(self, method, target, body):
+        # Status and JSON response of a request
+        parts = [unquote(part) for part in urlsplit(target).path.strip("/").split("/")]
+        if parts == ["run"]:
+            if method != "POST":
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use POST"}
+            try:
+                return HTTPStatus.OK, await self.run(json.loads(body))
+            except json.JSONDecodeError as error:
+                return HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON: {error}"}
+            except REQUEST_ERRORS as error:
+                return HTTPStatus.BAD_REQUEST, {"error": f"{type(error).__name__}: {error}"}
+        if method != "GET":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use GET"}
+        if parts == ["health"]:
+            return HTTPStatus.OK, self.get_health()
+        if len(parts) in (2, 3) and parts[0] == "catalog" and parts[1] in self.catalog:
+            if len(parts) == 2:
+                return HTTPStatus.OK, list(self.catalog[parts[1]].values())
+            if parts[2] in self.catalog[parts[1]]:
+                return HTTPStatus.OK, self.catalog[parts[1]][parts[2]]
+        return HTTPStatus.NOT_FOUND, {"error": f"Not found: {target}"}
+    async def handle_connection(self, reader, writer):
+        # HTTP/1.1 with keep-alive: requests of a connection are answered in order until the client closes it
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                    body = await reader.readexactly(int(headers.get("content-length", 0)))
+                except ValueError:
+                    await self.write_response(writer, HTTPStatus.BAD_REQUEST, {"error": "Malformed request"}, False)
+                    break
+                try:
+                    status, response = await self.handle_request(method, target, body)
+                except Exception as error:
+                    status, response = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(error).__name__}: {error}"}
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self.write_response(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+    async def write_response(self, writer, status, response, keep_alive):
+        # JSON has no infinity or NaN, and clients fail on the bare Infinity written by default (see run_config)
+        try:
+            body = json.dumps(response, allow_nan=False).encode()
+        except ValueError as error:
+            status = HTTPStatus.INTERNAL_SERVER_ERROR
+            body = json.dumps({"error": f"ValueError: {error}"}).encode()
+        writer.write((f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                      f"Content-Type: application/json\r\n"
+                      f"Content-Length: {len(body)}\r\n"
+                      f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+    async def serve(self, host="127.0.0.1", port=8080):
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            self.executor = executor
+            # Workers are started before accepting connections, so no request waits for an interpreter to start
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*[loop.run_in_executor(executor, load_worker) for _ in range(self.max_workers)])
+            server = await asyncio.start_server(self.handle_connection, host, port)
+            host, port = server.sockets[0].getsockname()[:2]
+            print(f"Serving on http://{host}:{port} with {self.max_workers} workers", flush=True)
+            async with server:
+                await server.serve_forever()
+
+def run_service(host="127.0.0.1", port=8080, max_workers=None, database=None):
+    service = ConsumptionService(load_catalog(database), max_workers)
+    asyncio.run(service.serve(host, port))
@@ -0,0 +1,90 @@
+import numpy as np
+
+class ConsumptionAggregate:
+    # Running aggregates of the current consumption of some elements, updated window by window so
+    # the totals of a long simulation never need the whole timeline in memory
+    def __init__(self, names, operating_voltages, resolution):
+        self.names = names
+        self.operating_voltages = np.asarray(operating_voltages, dtype=float)
+        self.resolution = resolution
+        self.charge = np.zeros(len(names)) # in mAs
+        self.peak_current = np.zeros(len(names)) # in mA
+        self.number_of_samples = 0
+    def __repr__(self):
+        return (f"ConsumptionAggregate(names={self.names}, "
+                f"charge={self.get_charge().tolist()}, "
+                f"peak_current={self.get_peak_current().tolist()}, "
+                f"mean_current={self.get_mean_current().tolist()})")
+    def update(self, currents):
+        # currents has one row per element and one column per sample
+        self.charge += currents.sum(axis=1) / self.resolution
+        self.peak_current = np.maximum(self.peak_current, currents.max(axis=1, initial=0))
+        self.number_of_samples += currents.shape[1]
+    def get_charge(self):
+        return self.charge / 3600 # in mAh
+    def get_peak_current(self):
+        return self.peak_current
+    def get_mean_current(self):
+        if self.number_of_samples == 0:
+            return np.zeros(len(self.names))
+        return self.charge * self.resolution / self.number_of_samples
+    def get_energy(self):
+        return self.get_charge() * self.operating_voltages # in mWh
+    def get_peak_power(self):
+        return self.peak_current * self.operating_voltages
+    def get_mean_power(self):
+        return self.get_mean_current() * self.operating_voltages
+
+class ConsumptionWindow:
+    def __init__(self, start, end, names, currents, aggregate):
+        self.start = start # in seconds
+        self.end = end # in seconds
+        self.names = names
+        self.currents = currents # in mA. One row per element and one column per sample of the window
+        self.aggregate = aggregate # Aggregates from the beginning of the simulation up to the end of this window
+    def __repr__(self):
+        return (f"ConsumptionWindow(start={self.start}, "
+                f"end={self.end}, "
+                f"names={self.names})")
+    def get_current(self, name):
+        return self.currents[self.names.index(name)]
+
+def get_elements(system_consumption):
+    # Elements of a system consumption in the order of the summary table: sensors, microcontroller and radio interface
+    return system_consumption.get_sensoring_consumption() + [system_consumption.get_microcontroller_consumption(), system_consumption.get_communications_consumption()]
+
+def check_timeline(system_consumption):
+    # The consumption over the time comes from the schedules, which the analytic mode does not build
+    if system_consumption.get_microcontroller_consumption().schedule is None:
+        raise ValueError("The consumption over the time needs the schedules: use mode='timeline'")
+
+def get_current_matrix(elements, resolution, first_sample=0, last_sample=None):
+    # Current (mA) of every element (rows) in every sample (columns): the dense schedules are stacked
+    # and turned into currents with a single np.where
+    schedules = np.stack([element.get_dense_schedule(resolution, bool, first_sample, last_sample) for element in elements])
+    active_consumptions = np.array([element.active_consumption for element in elements], dtype=float)
+    inactive_consumptions = np.array([element.inactive_consumption for element in elements], dtype=float)
+    currents = np.where(schedules, active_consumptions[:, np.newaxis], inactive_consumptions[:, np.newaxis])
+    # Elements with power states draw a different current in every state
+    for i, element in enumerate(elements):
+        if element.state_consumption is not None:
+            currents[i] = element.get_current_timeserie(resolution, first_sample, last_sample)
+    return currents
+
+def simulate_consumption(system_consumption, window=86400, resolution=None):
+    # Walk the timeline of a system consumption in windows of a fixed number of seconds (one day by default),
+    # yielding the current of every element in the window and the aggregates so far. Memory depends on the window, not on the duration.
+    # Elements are in the order of the summary table: sensors, microcontroller and radio interface
+    check_timeline(system_consumption)
+    elements = get_elements(system_consumption)
+    if resolution is None:
+        resolution = system_consumption.get_microcontroller_consumption().schedule.resolution
+    names = [element.name for element in elements]
+    aggregate = ConsumptionAggregate(names, [element.operating_voltage for element in elements], resolution)
+    num_samples = system_consumption.get_microcontroller_consumption().schedule.get_number_of_samples(resolution)
+    window_samples = max(int(round(window * resolution)), 1)
+    for first_sample in range(0, num_samples, window_samples):
+        last_sample = min(first_sample + window_samples, num_samples)
+        currents = get_current_matrix(elements, resolution, first_sample, last_sample)
+        aggregate.update(currents)
+        yield ConsumptionWindow(first_sample / resolution, last_sample / resolution, names, currents, aggregate)
@@ -0,0 +1,217 @@
+import numpy as np
+
+# State of the time spent waking up (the latency of a transition into the active state)
+TRANSITION_STATE = "transition"
+
+class PowerStateModel:
+    # Power states of a component. The component is in active_state while its schedule is active. After every activity it
+    # stays trailing_time seconds in trailing_state (e.g. a receive window after a transmission) and then sleeps in the
+    # deepest of sleep_states whose minimum idle time fits in the rest of the gap.
+    # transitions gives the energy (mAs) and latency (s) of moving between two states. The latency of waking up is taken from the sleep time
+    def __init__(self, name, operating_voltage, state_consumptions, active_state, sleep_states, transitions=None, trailing_state=None, trailing_time=0):
+        self.name = name
+        self.operating_voltage = operating_voltage
+        self.state_consumptions = state_consumptions # in mA. {state: consumption}
+        self.active_state = active_state
+        self.sleep_states = sorted(sleep_states, key=lambda sleep_state: sleep_state[1]) # [(state, minimum idle time in seconds)]
+        self.transitions = transitions or {} # {(from_state, to_state): (energy in mAs, latency in seconds)}
+        self.trailing_state = trailing_state
+        self.trailing_time = trailing_time # in seconds
+
+    def __repr__(self):
+        return (f"PowerStateModel(name={self.name}, "
+                f"operating_voltage={self.operating_voltage}, "
+                f"state_consumptions={self.state_consumptions}, "
+                f"active_state={self.active_state}, "
+                f"sleep_states={self.sleep_states}, "
+                f"transitions={self.transitions}, "
+                f"trailing_state={self.trailing_state}, "
+                f"trailing_time={self.trailing_time})")
+    def get_states(self):
+        return list(self.state_consumptions) + [TRANSITION_STATE]
+    def get_transition(self, from_state, to_state):
+        return self.transitions.get((from_state, to_state), (0, 0))
+
+def get_microcontroller_state_model(microcontroller, deep_sleep_threshold=1, wake_up_energy=0, wake_up_latency=0, light_wake_up_energy=0, light_wake_up_latency=0):
+    # Idle gaps shorter than deep_sleep_threshold seconds are spent in light sleep, the longer ones in deep sleep
+    return PowerStateModel(
+        microcontroller.name,
+        microcontroller.operating_voltage,
+        {"active": microcontroller.active_consumption, "light_sleep": microcontroller.light_sleep_consumption, "deep_sleep": microcontroller.deep_sleep_consumption},
+        "active",
+        [("light_sleep", 0), ("deep_sleep", deep_sleep_threshold)],
+        {("deep_sleep", "active"): (wake_up_energy, wake_up_latency), ("light_sleep", "active"): (light_wake_up_energy, light_wake_up_latency)})
+
+def get_radio_interface_state_model(radio_interface, receive_time=0, wake_up_energy=0, wake_up_latency=0):
+    # After every transmission the radio listens receive_time seconds (e.g. for the acknowledgement or downlink)
+    return PowerStateModel(
+        radio_interface.name,
+        radio_interface.operating_voltage,
+        {"transmit": radio_interface.transmit_consumption, "receive": radio_interface.receive_consumption, "inactive": radio_interface.inactive_consumption},
+        "transmit",
+        [("inactive", 0)],
+        {("inactive", "transmit"): (wake_up_energy, wake_up_latency)},
+        trailing_state="receive",
+        trailing_time=receive_time)
+
+def get_sensor_state_model(sensor, wake_up_energy=0, wake_up_latency=0):
+    return PowerStateModel(
+        sensor.name,
+        sensor.operating_voltage,
+        {"active": sensor.active_consumption, "inactive": sensor.inactive_consumption},
+        "active",
+        [("inactive", 0)],
+        {("inactive", "active"): (wake_up_energy, wake_up_latency)})
+
+class StateConsumption:
+    def __init__(self, state_model, dwell_times, transition_counts, segment_starts, segment_states, duration):
+        self.state_model = state_model
+        self.dwell_times = dwell_times # in seconds. {state: time}
+        self.transition_counts = transition_counts # {(from_state, to_state): count}
+        self.segment_starts = segment_starts # in seconds. Start of every segment of constant state
+        self.segment_states = segment_states # Index in state_model.get_states() of every segment
+        self.duration = duration
+
+    def __repr__(self):
+        return (f"StateConsumption(name={self.state_model.name}, "
+                f"dwell_times={self.dwell_times}, "
+                f"transition_counts={self.transition_counts}, "
+                f"total_energy={self.get_total_energy()})")
+    def get_state_energies(self):
+        # Energy (mAs) spent in every state, without the transitions
+        return {state: self.state_model.state_consumptions.get(state, 0) * dwell_time for state, dwell_time in self.dwell_times.items()}
+    def get_transition_energy(self):
+        return sum(self.state_model.get_transition(*transition)[0] * count for transition, count in self.transition_counts.items())
+    def get_sleep_energy(self):
+        sleep_states = [state for state, minimum_idle_time in self.state_model.sleep_states]
+        return sum(energy for state, energy in self.get_state_energies().items() if state in sleep_states)
+    def get_awake_energy(self):
+        # Energy of the active, trailing and transition states and of the transitions
+        return self.get_total_energy() - self.get_sleep_energy()
+    def get_awake_time(self):
+        sleep_states = [state for state, minimum_idle_time in self.state_model.sleep_states]
+        return sum(dwell_time for state, dwell_time in self.dwell_times.items() if state not in sleep_states)
+    def get_total_energy(self):
+        return sum(self.get_state_energies().values()) + self.get_transition_energy()
+    def to_dense(self, resolution=1, first_sample=0, last_sample=None):
+        # Index of the state in every sample, only built when requested
+        if last_sample is None:
+            last_sample = int(round(self.duration * resolution))
+        boundaries = np.clip(np.floor(self.segment_starts * resolution).astype(np.int64), first_sample, last_sample) - first_sample
+        lengths = np.diff(np.append(boundaries, last_sample - first_sample))
+        return np.repeat(self.segment_states, lengths)
+    def get_current_timeserie(self, resolution=1, first_sample=0, last_sample=None):
+        # Current (mA) in every sample. The transition energy is spread over the latency of the transitions
+        states = self.state_model.get_states()
+        currents = np.array([self.state_model.state_consumptions.get(state, 0) for state in states], dtype=float)
+        transition_time = self.dwell_times.get(TRANSITION_STATE, 0)
+        if transition_time > 0:
+            currents[states.index(TRANSITION_STATE)] = self.get_transition_energy() / transition_time
+        return currents[self.to_dense(resolution, first_sample, last_sample)]
+
+def get_state_consumption(state_model, schedule):
+    # Dwell time in every state and number of transitions of a component whose active state follows a schedule.
+    # Everything is counted over the intervals and idle gaps of the schedule, without building a timeline
+    states = state_model.get_states()
+    state_codes = {state: code for code, state in enumerate(states)}
+    active_code = state_codes[state_model.active_state]
+    sleep_codes = np.array([state_codes[state] for state, minimum_idle_time in state_model.sleep_states])
+    minimum_idle_times = np.array([minimum_idle_time for state, minimum_idle_time in state_model.sleep_states], dtype=float)
+    duration = schedule.duration
+    starts, ends = schedule.starts, schedule.ends
+    # Idle gaps: before the first activity, between activities and after the last one
+    gap_starts = np.concatenate(([0], ends))
+    gap_ends = np.concatenate((starts, [duration]))
+    after_activity = np.arange(len(gap_starts)) > 0
+    before_activity = np.arange(len(gap_starts)) < len(starts)
+    gap_lengths = gap_ends - gap_starts
+    trailing_times = np.where(after_activity, np.minimum(state_model.trailing_time if state_model.trailing_state else 0, gap_lengths), 0)
+    sleep_times = gap_lengths - trailing_times
+    sleeping = sleep_times > 0
+    sleep_classes = np.clip(np.searchsorted(minimum_idle_times, sleep_times, side='right') - 1, 0, None)
+    gap_sleep_codes = sleep_codes[sleep_classes]
+    # Waking up takes the latency of the transition from the sleep state out of the sleep time
+    wake_up_latencies = np.array([state_model.get_transition(state, state_model.active_state)[1] for state, minimum_idle_time in state_model.sleep_states], dtype=float)
+    latencies = np.where(before_activity & sleeping, np.minimum(wake_up_latencies[sleep_classes], sleep_times), 0)
+
+    dwell_times = dict.fromkeys(states, 0.0)
+    dwell_times[state_model.active_state] = float(np.sum(ends - starts))
+    if state_model.trailing_state:
+        dwell_times[state_model.trailing_state] += float(np.sum(trailing_times))
+    for code in np.unique(sleep_codes):
+        dwell_times[states[code]] += float(np.sum((sleep_times - latencies)[sleeping & (gap_sleep_codes == code)]))
+    dwell_times[TRANSITION_STATE] = float(np.sum(latencies))
+
+    # Every gap goes through: [active ->] [trailing ->] [sleep ->] [active]. Count the consecutive pairs of states
+    trailing_code = state_codes[state_model.trailing_state] if state_model.trailing_state else -1
+    sequence = np.full((len(gap_starts), 4), -1)
+    sequence[after_activity, 0] = active_code
+    sequence[trailing_times > 0, 1] = trailing_code
+    sequence[sleeping, 2] = gap_sleep_codes[sleeping]
+    sequence[before_activity, 3] = active_code
+    from_codes = []
+    to_codes = []
+    previous = np.full(len(gap_starts), -1)
+    for column in range(4):
+        present = sequence[:, column] >= 0
+        changes = present & (previous >= 0)
+        from_codes.append(previous[changes])
+        to_codes.append(sequence[changes, column])
+        previous = np.where(present, sequence[:, column], previous)
+    pairs, counts = np.unique(np.stack((np.concatenate(from_codes), np.concatenate(to_codes)), axis=1), axis=0, return_counts=True)
+    transition_counts = {(states[from_code], states[to_code]): int(count) for (from_code, to_code), count in zip(pairs, counts)}
+
+    # Segments of constant state for the dense view: activity, trailing, sleep and wake-up of every gap
+    transition_code = state_codes[TRANSITION_STATE]
+    segment_starts = np.concatenate((starts, gap_starts[trailing_times > 0], (gap_starts + trailing_times)[sleeping], (gap_ends - latencies)[latencies > 0]))
+    segment_states = np.concatenate((np.full(len(starts), active_code), np.full(np.count_nonzero(trailing_times > 0), trailing_code), gap_sleep_codes[sleeping], np.full(np.count_nonzero(latencies > 0), transition_code)))
+    order = np.argsort(segment_starts, kind='stable')
+    return StateConsumption(state_model, dwell_times, transition_counts, segment_starts[order], segment_states[order], duration)
+
+def get_periodic_state_consumption(state_model, number_of_activities, active_time, duration):
+    # Dwell times and transitions of a component without its schedule (mode="analytic"): the idle time is split evenly in
+    # one gap after every activity, as in a periodic schedule. This is the timeline count up to the gaps at the ends of the
+    # duration for a sensor or the radio interface, and an approximation for the microcontroller, whose activities come from
+    # several schedules. The arguments can be NumPy arrays that broadcast together, e.g. one value per system of a sweep
+    states = state_model.get_states()
+    sleep_states = [state for state, minimum_idle_time in state_model.sleep_states]
+    minimum_idle_times = np.array([minimum_idle_time for state, minimum_idle_time in state_model.sleep_states], dtype=float)
+    wake_up_latencies = np.array([state_model.get_transition(state, state_model.active_state)[1] for state in sleep_states], dtype=float)
+    number_of_activities, active_time, duration = np.broadcast_arrays(*[np.asarray(value, dtype=float) for value in (number_of_activities, active_time, duration)])
+    active = number_of_activities > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gap_lengths = np.where(active, np.maximum(duration - active_time, 0) / number_of_activities, duration)
+    number_of_gaps = np.where(active, number_of_activities, 1)
+    trailing_times = np.where(active, np.minimum(state_model.trailing_time if state_model.trailing_state else 0, gap_lengths), 0)
+    sleep_times = gap_lengths - trailing_times
+    sleeping = sleep_times > 0
+    trailing = trailing_times > 0
+    sleep_classes = np.clip(np.searchsorted(minimum_idle_times, sleep_times, side='right') - 1, 0, None)
+    latencies = np.where(active & sleeping, np.minimum(wake_up_latencies[sleep_classes], sleep_times), 0)
+
+    active_state = state_model.active_state
+    trailing_state = state_model.trailing_state
+    dwell_times = {state: np.zeros(number_of_activities.shape) for state in states}
+    dwell_times[active_state] = np.where(active, active_time, 0)
+    transition_counts = {}
+
+    def add_transitions(transition, condition):
+        transition_counts[transition] = transition_counts.get(transition, 0) + np.where(condition, number_of_activities, 0)
+
+    # Every gap goes through: active -> [trailing ->] [sleep ->] active
+    if trailing_state:
+        dwell_times[trailing_state] = dwell_times[trailing_state] + number_of_activities * trailing_times
+        add_transitions((active_state, trailing_state), trailing)
+        add_transitions((trailing_state, active_state), trailing & ~sleeping)
+    for code, state in enumerate(sleep_states):
+        in_state = sleeping & (sleep_classes == code)
+        dwell_times[state] = dwell_times[state] + np.where(in_state, number_of_gaps * (sleep_times - latencies), 0)
+        if trailing_state:
+            add_transitions((trailing_state, state), in_state & trailing)
+        add_transitions((active_state, state), in_state & ~trailing)
+        add_transitions((state, active_state), in_state)
+    dwell_times[TRANSITION_STATE] = number_of_activities * latencies
+    if number_of_activities.ndim == 0:
+        dwell_times = {state: float(dwell_time) for state, dwell_time in dwell_times.items()}
+        transition_counts = {transition: float(count) for transition, count in transition_counts.items() if count > 0}
+    return StateConsumption(state_model, dwell_times, transition_counts, np.zeros(0), np.zeros(0, dtype=np.int64), duration)
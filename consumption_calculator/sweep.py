@@ -0,0 +1,71 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from .components import Sensor, RadioInterface
+from .model import get_system_energy_consumption
+from .states import get_sensor_state_model, get_microcontroller_state_model, get_radio_interface_state_model
+
+# Grids and power state options of the sweep being evaluated by a worker process. Set once per worker by init_sweep_worker
+sweep_grids = None
+sweep_state_options = None
+
+def init_sweep_worker(grids, state_options=(None, None, None)):
+    global sweep_grids, sweep_state_options
+    sweep_grids = grids
+    sweep_state_options = state_options
+
+def evaluate_sweep_batch(first_configuration, last_configuration):
+    # Evaluate the configurations of the sweep with flat indices in [first_configuration, last_configuration)
+    sensor_subsets, microcontrollers, radio_interfaces, sampling_rates, data_refresh_rates, durations = sweep_grids
+    grid_shape = tuple(len(grid) for grid in sweep_grids)
+    sensor_state_options, microcontroller_state_options, radio_interface_state_options = sweep_state_options
+    results = []
+    for indices in zip(*np.unravel_index(np.arange(first_configuration, last_configuration), grid_shape)):
+        sensor_subset, microcontroller, radio_interface, sampling_rate, data_refresh_rate, duration = [grid[i] for grid, i in zip(sweep_grids, indices)]
+        # None keeps the sampling rate and data refresh rate of the catalog
+        if sampling_rate is not None:
+            sensor_subset = [Sensor(**{**vars(sensor), "sampling_rate": sampling_rate}) for sensor in sensor_subset]
+        if data_refresh_rate is not None:
+            radio_interface = RadioInterface(**{**vars(radio_interface), "data_refresh_rate": data_refresh_rate})
+        # Power state models are built from the components of every configuration
+        system_consumption = get_system_energy_consumption(
+            sensor_subset, microcontroller, radio_interface, duration, mode="analytic",
+            microcontroller_state_model=get_microcontroller_state_model(microcontroller, **microcontroller_state_options) if microcontroller_state_options is not None else None,
+            radio_interface_state_model=get_radio_interface_state_model(radio_interface, **radio_interface_state_options) if radio_interface_state_options is not None else None,
+            sensor_state_models=[get_sensor_state_model(sensor, **sensor_state_options) for sensor in sensor_subset] if sensor_state_options is not None else None)
+        results.append({
+            "sensors": ", ".join(sensor.get_name() for sensor in sensor_subset),
+            "microcontroller": microcontroller.name,
+            "radio_interface": radio_interface.name,
+            "sampling_rate": sampling_rate,
+            "data_refresh_rate": radio_interface.data_refresh_rate,
+            "duration": duration,
+            "sensoring_energy": system_consumption.get_sensoring_current_consumption(),
+            "communications_energy": system_consumption.get_communications_energy_consumption(),
+            "microcontroller_energy": system_consumption.get_microcontroller_energy_consumption(),
+            "total_energy": system_consumption.get_total_energy()})
+    return results
+
+def sweep_system_energy_consumption(sensor_subsets, microcontrollers, radio_interfaces, sampling_rates=(None,), data_refresh_rates=(None,), durations=(86400,), max_workers=None, batch_size=None,
+                                    sensor_state_options=None, microcontroller_state_options=None, radio_interface_state_options=None):
+    # Evaluate the energy totals (mAs) of every combination of the parameter grids in a pool of processes.
+    # Workers receive the grids once and then batches of flat configuration indices, so the tasks are cheap to send.
+    # The state options are the keyword arguments of get_sensor_state_model, get_microcontroller_state_model and
+    # get_radio_interface_state_model (e.g. {"deep_sleep_threshold": 1, "wake_up_energy": 0.5}), to sweep with power state models
+    grids = (list(sensor_subsets), list(microcontrollers), list(radio_interfaces), list(sampling_rates), list(data_refresh_rates), list(durations))
+    number_of_configurations = math.prod(len(grid) for grid in grids)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if batch_size is None:
+        # A few batches per worker keeps all the cores busy until the end of the sweep
+        batch_size = max(1, math.ceil(number_of_configurations / (max_workers * 4)))
+    results = []
+    state_options = (sensor_state_options, microcontroller_state_options, radio_interface_state_options)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_sweep_worker, initargs=(grids, state_options)) as executor:
+        batches = range(0, number_of_configurations, batch_size)
+        for batch_results in executor.map(evaluate_sweep_batch, batches, [min(first + batch_size, number_of_configurations) for first in batches]):
+            results.extend(batch_results)
+    return pd.DataFrame(results)
@@ -0,0 +1,100 @@
+import math
+import numpy as np
+
+# Constructor fields of the packet model, in order
+PACKET_MODEL_FIELDS = ["header_size", "mtu", "retry_probability", "max_retries"]
+
+class PacketModel:
+    # How the radio interface sends the data buffered since the previous transmission: the payload is split in
+    # packets of at most mtu bytes, every packet carries header_size bytes of protocol overhead, and every attempt
+    # fails with retry_probability and is retried up to max_retries times
+    def __init__(self, header_size=0, mtu=None, retry_probability=0, max_retries=0):
+        self.header_size = header_size # in bytes per packet
+        self.mtu = mtu # in bytes. Maximum payload of a packet. None for no limit
+        self.retry_probability = retry_probability # Probability that an attempt fails
+        self.max_retries = max_retries # Maximum number of retries of a failed packet
+
+    def __repr__(self):
+        return (f"PacketModel(header_size={self.header_size}, "
+                f"mtu={self.mtu}, "
+                f"retry_probability={self.retry_probability}, "
+                f"max_retries={self.max_retries})")
+
+def get_expected_attempts(retry_probability, max_retries):
+    # Mean number of attempts of a packet: 1 + p + p^2 + ... + p^max_retries
+    retry_probability = np.asarray(retry_probability, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(retry_probability < 1, (1 - retry_probability**(max_retries + 1)) / (1 - retry_probability), max_retries + 1)
+
+def get_number_of_packets(payloads, mtu):
+    # Packets of every payload: a payload needs at least one packet, also without mtu (infinite)
+    payloads = np.asarray(payloads, dtype=float)
+    return np.where(payloads > 0, np.maximum(np.ceil(payloads / mtu), 1), 0)
+
+def get_transmission_time_arrays(payloads, datarate, header_size=0, mtu=np.inf, retry_probability=0, max_retries=0):
+    # Expected airtime (s) of transmissions of the given payloads (bytes), as NumPy arrays that broadcast together
+    payloads = np.asarray(payloads, dtype=float)
+    packets = get_number_of_packets(payloads, mtu)
+    return (payloads + packets * header_size) * 8 / datarate * get_expected_attempts(retry_probability, max_retries)
+
+class TransmissionEvents:
+    def __init__(self, start_times, payloads, packets, attempts, airtimes, lost_packets):
+        # One value per transmission
+        self.start_times = start_times # in seconds
+        self.payloads = payloads # in bytes. Data buffered since the previous transmission
+        self.packets = packets
+        self.attempts = attempts # Expected number of attempts of all the packets
+        self.airtimes = airtimes # in seconds. Expected airtime, with the headers and the retries
+        self.lost_packets = lost_packets # Expected number of packets that fail all their attempts
+
+    def __repr__(self):
+        return (f"TransmissionEvents(number_of_transmissions={self.get_number_of_transmissions()}, "
+                f"total_payload={self.get_total_payload()}, "
+                f"total_packets={self.get_total_packets()}, "
+                f"total_attempts={self.get_total_attempts()}, "
+                f"delivery_ratio={self.get_delivery_ratio()})")
+    def get_number_of_transmissions(self):
+        return len(self.start_times)
+    def get_total_payload(self):
+        return float(np.sum(self.payloads))
+    def get_mean_payload(self):
+        return self.get_total_payload() / max(self.get_number_of_transmissions(), 1)
+    def get_total_packets(self):
+        return int(np.sum(self.packets))
+    def get_total_attempts(self):
+        return float(np.sum(self.attempts))
+    def get_total_airtime(self):
+        return float(np.sum(self.airtimes))
+    def get_expected_lost_packets(self):
+        return float(np.sum(self.lost_packets))
+    def get_delivery_ratio(self):
+        total_packets = self.get_total_packets()
+        return 1 - self.get_expected_lost_packets() / total_packets if total_packets > 0 else 1.0
+
+def get_transmission_events(sensors, radio_interface, duration, packet_model):
+    # Every transmission ends at the end of its period (as in get_radio_interface_consumption) and sends the data
+    # measured during that period: the measures of a sensor start after the ones of the previous sensors, so the bytes
+    # buffered at every transmission are counted from the measure times of every sensor, one pass over all the transmissions
+    number_of_transmissions = math.ceil(duration * radio_interface.data_refresh_rate)
+    transmission_period = 1 / radio_interface.data_refresh_rate
+    # The last transmission flushes the buffer at the end of the duration, with the measures up to the end
+    period_ends = np.minimum(transmission_period * np.arange(1, number_of_transmissions + 1), duration)
+    count_times = np.append(period_ends[:-1], np.inf)
+    payloads = np.zeros(number_of_transmissions)
+    first_measure_time = 0
+    for sensor in sensors:
+        number_of_measures = sensor.sampling_rate * duration
+        measure_period = duration / number_of_measures
+        # Measures taken before every period end, as get_sensor_consumption schedules them
+        last_measure = min(math.ceil(number_of_measures), math.floor((duration - first_measure_time) / measure_period) + 1)
+        measures = np.clip(np.ceil((count_times - first_measure_time) / measure_period), 0, max(last_measure, 0))
+        payloads += sensor.data_volume * np.diff(measures, prepend=0)
+        first_measure_time += sensor.active_time
+    mtu = packet_model.mtu if packet_model.mtu is not None else np.inf
+    packets = get_number_of_packets(payloads, mtu)
+    attempts = packets * get_expected_attempts(packet_model.retry_probability, packet_model.max_retries)
+    airtimes = get_transmission_time_arrays(payloads, radio_interface.datarate, packet_model.header_size, mtu, packet_model.retry_probability, packet_model.max_retries)
+    lost_packets = packets * packet_model.retry_probability**(packet_model.max_retries + 1)
+    # Nothing is sent when the buffer is empty
+    sent = packets > 0
+    return TransmissionEvents(period_ends[sent] - airtimes[sent], payloads[sent], packets[sent], attempts[sent], airtimes[sent], lost_packets[sent])
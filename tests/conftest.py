@@ -0,0 +1,18 @@
+import pytest
+
+from consumption_calculator import Sensor, Microcontroller, RadioInterface
+
+@pytest.fixture
+def sensors():
+    return [
+        Sensor("humidity sensor", 5, 36.2, 5.0, 0.0017, 1.0, 10.0),
+        Sensor("temperature sensor", 5, 20.0, 3.0, 0.0017, 10.0, 10.0),
+        Sensor("solar irradiance", 5.0, 50.0, 5.0, 0.001, 3.0, 2.0)]
+
+@pytest.fixture
+def microcontroller():
+    return Microcontroller("ESP32-S3", 3.3, 36.2, 3.29, 0.0155)
+
+@pytest.fixture
+def radio_interface():
+    return RadioInterface("nb-iot SIM7020E", 3.3, 138.0, 66.2, 0.0078, 250.0, 0.0003)
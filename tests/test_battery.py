@@ -0,0 +1,46 @@
+import math
+import numpy as np
+import pytest
+
+from consumption_calculator import (Battery, get_system_energy_consumption, simulate_consumption, get_state_of_charge, get_battery_lifetime,
+                                    get_battery_lifetime_arrays)
+
+def get_stepped_state_of_charge(battery, currents, resolution):
+    # Reference: the exact solution of dQ/dt = -k*Q - I over every sample with a constant current, one sample at a time
+    rate = battery.get_self_discharge_rate()
+    decay = math.exp(-rate / resolution)
+    charge = battery.capacity * 3600
+    charges = []
+    for current in currents:
+        charge = decay * charge - current * (1 - decay) / rate
+        charges.append(charge)
+    return np.array(charges) / (battery.capacity * 3600)
+
+@pytest.mark.parametrize("resolution", [1, 0.01, 0.0001])
+def test_state_of_charge_matches_exact_stepping(resolution):
+    battery = Battery("battery", 2000, 4.2, 3.0, 3.3, 0.9)
+    currents = np.random.default_rng(0).uniform(0, 50, 2000)
+    assert get_state_of_charge(battery, currents, resolution) == pytest.approx(get_stepped_state_of_charge(battery, currents, resolution), rel=1e-9)
+
+def test_state_of_charge_of_chained_windows():
+    battery = Battery("battery", 2000, 4.2, 3.0, 3.3, 0.9)
+    currents = np.random.default_rng(0).uniform(0, 50, (2, 3000))
+    whole = get_state_of_charge(battery, currents, 0.01)
+    first = get_state_of_charge(battery, currents[:, :1000], 0.01)
+    second = get_state_of_charge(battery, currents[:, 1000:], 0.01, initial_state_of_charge=first[-1])
+    assert np.concatenate([first, second]) == pytest.approx(whole, rel=1e-12)
+
+@pytest.mark.parametrize("self_discharge", [0, 0.03])
+def test_lifetime_of_the_timeline_follows_its_mean_current(sensors, microcontroller, radio_interface, self_discharge):
+    # Over months the current of every window averages out, so the lifetime is the one of the mean current up to a cycle
+    battery = Battery("18650", 2000, 4.2, 3.0, 3.3, self_discharge)
+    system_consumption = get_system_energy_consumption(sensors, microcontroller, radio_interface, 86400)
+    for window in simulate_consumption(system_consumption):
+        pass
+    mean_current = window.aggregate.get_mean_current().sum()
+    lifetime = get_battery_lifetime(battery, system_consumption)
+    assert lifetime == pytest.approx(float(get_battery_lifetime_arrays(vars(battery), mean_current)), abs=86400)
+
+def test_lifetime_without_load_is_infinite():
+    battery = Battery("18650", 2000, 4.2, 3.0, 3.3, 0)
+    assert get_battery_lifetime_arrays(vars(battery), 0) == math.inf
@@ -0,0 +1,35 @@
+import pytest
+
+from consumption_calculator.benchmark import measure, compare_benchmarks, get_catalog_benchmarks
+
+def get_result(stage, wall_time, peak_memory, **parameters):
+    return {"stage": stage, "parameters": parameters, "wall_time": wall_time, "peak_memory": peak_memory, "retained_memory": 0, "retained_blocks": 0}
+
+def test_regressions_over_the_threshold():
+    baseline = {"results": [get_result("model", 0.1, 1000, duration=3600), get_result("model", 0.1, 1000, duration=86400), get_result("catalog", 0.1, 1000, size=10)]}
+    benchmarks = {"results": [
+        get_result("model", 0.2, 1000, duration=3600), # Slower
+        get_result("model", 0.11, 2000, duration=86400), # More memory
+        get_result("catalog", 0.12, 1200, size=10), # Within the threshold
+        get_result("plotting", 10.0, 10 ** 9, duration=3600)]} # Not in the baseline
+    regressions = compare_benchmarks(benchmarks, baseline, threshold=0.25)
+    assert [(regression["stage"], regression["parameters"], regression["metric"]) for regression in regressions] == [
+        ("model", {"duration": 3600}, "wall_time"), ("model", {"duration": 86400}, "peak_memory")]
+    assert regressions[0]["ratio"] == pytest.approx(2)
+
+def test_small_wall_time_increases_are_noise():
+    baseline = {"results": [get_result("model", 0.0001, 1000, duration=3600)]}
+    benchmarks = {"results": [get_result("model", 0.0005, 1000, duration=3600)]}
+    assert compare_benchmarks(benchmarks, baseline) == []
+    assert len(compare_benchmarks(benchmarks, baseline, min_wall_time_increase=0)) == 1
+
+def test_measure_reports_the_retained_memory():
+    retained = []
+    result = measure("allocation", {"size": 1000}, lambda: retained.append(bytearray(10 ** 6)), repeat=2)
+    assert result["stage"] == "allocation" and result["parameters"] == {"size": 1000}
+    assert result["wall_time"] >= 0
+    assert result["peak_memory"] >= 10 ** 6 and result["retained_memory"] >= 10 ** 6 and result["retained_blocks"] >= 1
+
+def test_catalog_benchmarks_run():
+    results = get_catalog_benchmarks([10], 1)
+    assert [result["stage"] for result in results] == ["load_components", "ComponentCatalog.find", "ComponentCatalog.get"]
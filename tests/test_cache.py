@@ -0,0 +1,44 @@
+import pytest
+
+from consumption_calculator import Sensor, ConsumptionCache, get_cache_key, get_system_energy_consumption, get_consumption_results
+
+def test_hits_and_misses():
+    cache = ConsumptionCache()
+    calls = []
+    for key in ("a", "b", "a", "a"):
+        cache.get(key, lambda: calls.append(key) or key.upper())
+    assert calls == ["a", "b"]
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert cache.get_hit_rate() == 0.5
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ConsumptionCache(max_size=2)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+    cache.get("a", lambda: 1)
+    cache.get("c", lambda: 3)
+    assert list(cache.entries) == ["a", "c"]
+    assert cache.get("b", lambda: 4) == 4
+    assert cache.misses == 4
+
+def test_disk_store_is_shared_between_caches(tmp_path):
+    ConsumptionCache(path=str(tmp_path)).get("a", lambda: [1, 2])
+    cache = ConsumptionCache(path=str(tmp_path))
+    assert cache.get("a", lambda: pytest.fail("computed again")) == [1, 2]
+    assert (cache.hits, cache.misses) == (1, 0)
+
+def test_keys_follow_the_field_values(sensors):
+    same_sensor = Sensor(**vars(sensors[0]))
+    assert get_cache_key("sensor", sensors[0], 3600) == get_cache_key("sensor", same_sensor, 3600)
+    assert get_cache_key("sensor", sensors[0], 3600) != get_cache_key("sensor", sensors[0], 3601)
+    assert get_cache_key("sensor", sensors[0], 3600) != get_cache_key("sensor", Sensor(**{**vars(sensors[0]), "active_time": 2.0}), 3600)
+
+@pytest.mark.parametrize("mode", ["timeline", "analytic"])
+def test_cached_results_match_the_uncached_ones(sensors, microcontroller, radio_interface, mode):
+    cache = ConsumptionCache()
+    expected = get_consumption_results(get_system_energy_consumption(sensors, microcontroller, radio_interface, 86400, mode))
+    for _ in range(2):
+        results = get_consumption_results(get_system_energy_consumption(sensors, microcontroller, radio_interface, 86400, mode, cache=cache))
+        assert results["total_energy"] == expected["total_energy"]
+    # Sensors, radio interface and microcontroller are computed once
+    assert (cache.hits, cache.misses) == (5, 5)
@@ -0,0 +1,53 @@
+import os
+import numpy as np
+import pytest
+
+from consumption_calculator import ComponentCatalog, Sensor, Microcontroller, parse_sensor, parse_microcontroller, parse_radio_interface, load_components
+
+@pytest.mark.parametrize("name", ["humidity sensor", "humidity, temperature sensor", "O'Brien \"probe\"", "a=1, b=2"])
+def test_parse_component_round_trips_the_repr(name):
+    sensor = Sensor(name, 5, 36.2, 5.0, 0.0017, 1.0, 10.0)
+    parsed = parse_sensor(repr(sensor))
+    assert vars(parsed) == vars(sensor)
+
+@pytest.mark.parametrize("line, name", [
+    ('Microcontroller(name="ESP32-S3, rev 2", operating_voltage=3.3, active_consumption=36.2, light_sleep_consumption=3.29, deep_sleep_consumption=0.0155)', "ESP32-S3, rev 2"),
+    ("Microcontroller(name='ESP32-S3', operating_voltage=3.3, active_consumption=36.2, light_sleep_consumption=3.29, deep_sleep_consumption=0.0155)", "ESP32-S3")])
+def test_quotes_around_the_name_are_removed(line, name):
+    microcontroller = parse_microcontroller(line)
+    assert microcontroller.name == name and microcontroller.deep_sleep_consumption == 0.0155
+
+@pytest.mark.parametrize("line", ["Sensor(name=x, operating_voltage=5)", "RadioInterface(name=x)", "not a component"])
+def test_invalid_lines(line):
+    with pytest.raises(ValueError):
+        parse_radio_interface(line)
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_text_catalogs_of_the_repository():
+    for file_name, parse in (("sensors.txt", parse_sensor), ("microcontrollers.txt", parse_microcontroller), ("radio_interfaces.txt", parse_radio_interface)):
+        assert len(load_components(os.path.join(REPOSITORY, file_name), parse)) > 0
+
+def test_adding_a_name_again_replaces_the_component(tmp_path, sensors):
+    catalog = ComponentCatalog(str(tmp_path / "catalog.db"))
+    catalog.add("sensor", sensors)
+    catalog.add("sensor", [Sensor("humidity sensor", 3.3, 10.0, 1.0, 0.01, 2.0, 4.0)])
+    assert catalog.count("sensor") == len(sensors)
+    assert catalog.get("sensor", "humidity sensor").active_consumption == 10.0
+    catalog.close()
+    # Opening the catalog again keeps all the components
+    catalog = ComponentCatalog(str(tmp_path / "catalog.db"))
+    assert catalog.count("sensor") == len(sensors)
+    catalog.close()
+
+def test_lookups(tmp_path, sensors, microcontroller):
+    catalog = ComponentCatalog(str(tmp_path / "catalog.db"))
+    catalog.add("sensor", sensors)
+    catalog.add("microcontroller", [microcontroller])
+    assert [sensor.name for sensor in catalog.find("sensor", consumption_range=(None, 40))] == ["humidity sensor", "temperature sensor"]
+    assert catalog.find("microcontroller", voltage_range=(5, None)) == []
+    arrays = catalog.load_arrays("sensor", voltage_range=(5, 5))
+    assert np.array_equal(arrays["active_consumption"], [36.2, 20.0, 50.0])
+    with pytest.raises(KeyError):
+        catalog.get("sensor", "pressure sensor")
+    catalog.close()
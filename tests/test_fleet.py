@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from consumption_calculator import get_system_energy_consumption, get_fleet_table, get_fleet_energy_consumption
+
+def get_nodes(sensors, microcontroller, radio_interface):
+    return [(sensors, microcontroller, radio_interface), (sensors[:1], microcontroller, radio_interface), (sensors[::-1], microcontroller, radio_interface)]
+
+def test_fleet_matches_every_node(sensors, microcontroller, radio_interface):
+    nodes = get_nodes(sensors, microcontroller, radio_interface)
+    # Rows of the nodes are shuffled: sensors keep their order inside every node
+    fleet_table = get_fleet_table(nodes).iloc[[3, 0, 4, 1, 5, 2, 6]]
+    node_energies = get_fleet_energy_consumption(fleet_table, 86400).get_node_energies()
+    assert node_energies["number_of_sensors"].tolist() == [3, 1, 3]
+    for (_, row), (node_sensors, node_microcontroller, node_radio_interface) in zip(node_energies.iterrows(), nodes):
+        system_consumption = get_system_energy_consumption(node_sensors, node_microcontroller, node_radio_interface, 86400, "analytic")
+        assert row["total_energy"] == pytest.approx(system_consumption.get_total_energy())
+        assert row["sensoring_energy"] == pytest.approx(system_consumption.get_sensoring_current_consumption())
+        assert row["mean_current"] == pytest.approx(system_consumption.get_total_energy() / 86400)
+
+def test_duration_column(sensors, microcontroller, radio_interface):
+    fleet_table = get_fleet_table(get_nodes(sensors, microcontroller, radio_interface))
+    fleet_table["duration"] = np.where(fleet_table["node"] == 1, 3600, 86400)
+    node_energies = get_fleet_energy_consumption(fleet_table).get_node_energies()
+    expected = get_system_energy_consumption(sensors[:1], microcontroller, radio_interface, 3600, "analytic")
+    assert node_energies["total_energy"][1] == pytest.approx(expected.get_total_energy())
+
+def test_fleet_needs_a_duration(sensors, microcontroller, radio_interface):
+    with pytest.raises(ValueError, match="duration"):
+        get_fleet_energy_consumption(get_fleet_table(get_nodes(sensors, microcontroller, radio_interface)))
@@ -0,0 +1,51 @@
+import math
+import numpy as np
+import pytest
+
+from consumption_calculator import (Sensor, Battery, HarvestingProfile, get_system_energy_consumption, get_daily_harvesting_profile, get_energy_balance)
+from consumption_calculator.harvesting import get_clamped_battery_charge
+
+def get_stepped_battery_charge(decay_exponents, step_charges, capacity):
+    # Reference: the charge of every step, clamped one step at a time
+    charge = capacity
+    charges = []
+    for decay_exponent, step_charge in zip(decay_exponents, step_charges):
+        charge = min(max(math.exp(-decay_exponent) * charge + step_charge, 0), capacity)
+        charges.append(charge)
+    return np.array(charges)
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("decay_exponent", [0, 1e-4, 1e-2])
+def test_clamped_charge_matches_stepping(seed, decay_exponent):
+    rng = np.random.default_rng(seed)
+    decay_exponents = np.full(5000, decay_exponent)
+    step_charges = rng.normal(rng.uniform(-5, 5), 20, 5000)
+    assert get_clamped_battery_charge(decay_exponents, step_charges, 500.0) == pytest.approx(get_stepped_battery_charge(decay_exponents, step_charges, 500.0), abs=1e-6)
+
+@pytest.mark.parametrize("mode", ["timeline", "analytic"])
+def test_energy_balance_clamps_the_battery(microcontroller, radio_interface, mode):
+    # The 20 mAh battery is empty within the first hour of 5 dark days, and is charged again in the first bright hour
+    sensors = [Sensor("humidity sensor", 5, 36.2, 5.0, 0.0017, 1.0, 10.0)]
+    system_consumption = get_system_energy_consumption(sensors, microcontroller, radio_interface, 10 * 86400, mode)
+    harvesting_profile = HarvestingProfile("panel", 3.3, 0.01, 0.2, np.concatenate([np.zeros(5 * 24), np.full(5 * 24, 500.0)]), 3600)
+    battery = Battery("battery", 20, 4.2, 3.0, 3.3, 0.5)
+    energy_balance = get_energy_balance(system_consumption, harvesting_profile, battery, 10 * 86400)
+    assert np.all(energy_balance.battery_charge >= 0)
+    assert np.all(energy_balance.battery_charge <= battery.capacity * 3600)
+    assert energy_balance.battery_charge[-1] == battery.capacity * 3600
+    assert energy_balance.get_deficit_intervals() == [(0, 5 * 86400)]
+
+def test_energy_balance_without_battery(sensors, microcontroller, radio_interface):
+    # In analytic mode the consumption is spread evenly over the steps
+    system_consumption = get_system_energy_consumption(sensors, microcontroller, radio_interface, 2 * 86400, "analytic")
+    harvesting_profile = get_daily_harvesting_profile("panel", 3.3, 0.01, 0.2, 1000)
+    energy_balance = get_energy_balance(system_consumption, harvesting_profile, duration=2 * 86400)
+    assert energy_balance.battery_charge is None
+    assert np.sum(energy_balance.consumed_current) * 60 == pytest.approx(system_consumption.get_total_energy())
+    in_deficit = energy_balance.deficit_schedule.to_dense(resolution=1 / 60).astype(bool)
+    assert np.array_equal(in_deficit, energy_balance.get_net_current() < 0)
+
+def test_profile_shorter_than_the_duration(sensors, microcontroller, radio_interface):
+    system_consumption = get_system_energy_consumption(sensors, microcontroller, radio_interface, 86400)
+    with pytest.raises(ValueError):
+        get_energy_balance(system_consumption, HarvestingProfile("panel", 3.3, 0.01, 0.2, np.zeros(10), 60))
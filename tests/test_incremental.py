@@ -0,0 +1,63 @@
+import pytest
+
+from consumption_calculator import (SystemConsumptionModel, PacketModel, get_system_energy_consumption, get_consumption_results,
+                                    get_microcontroller_state_model, get_radio_interface_state_model, get_sensor_state_model)
+
+CHANGES = [
+    ("sensor", 0, {"active_time": 2.0}, ["sensors[0]", "sensors[1]", "sensors[2]", "microcontroller"]),
+    ("sensor", 1, {"active_consumption": 25.0}, ["sensors[1]"]),
+    ("sensor", 2, {"data_volume": 20.0}, ["radio_interface", "microcontroller"]),
+    ("sensor", 1, {"sampling_rate": 0.003}, ["sensors[1]", "sensors[2]", "radio_interface", "microcontroller"]),
+    ("microcontroller", None, {"active_consumption": 40.0}, ["microcontroller"]),
+    ("radio_interface", None, {"inactive_consumption": 0.01}, ["radio_interface"]),
+    ("radio_interface", None, {"data_refresh_rate": 0.001}, ["radio_interface", "microcontroller"]),
+    ("duration", None, 2 * 86400, ["sensors[0]", "sensors[1]", "sensors[2]", "radio_interface", "microcontroller"])]
+
+def apply_change(model, component, index, fields):
+    if component == "sensor":
+        return model.set_sensor(index, **fields)
+    if component == "microcontroller":
+        return model.set_microcontroller(**fields)
+    if component == "radio_interface":
+        return model.set_radio_interface(**fields)
+    return model.set_duration(fields)
+
+def get_state_models(sensors, microcontroller, radio_interface):
+    return {
+        "microcontroller_state_model": get_microcontroller_state_model(microcontroller, deep_sleep_threshold=30, wake_up_energy=0.5, wake_up_latency=0.01),
+        "radio_interface_state_model": get_radio_interface_state_model(radio_interface, receive_time=0.5, wake_up_energy=1, wake_up_latency=0.002),
+        "sensor_state_models": [get_sensor_state_model(sensor, wake_up_energy=0.2, wake_up_latency=0.05) for sensor in sensors]}
+
+def assert_same_results(system_consumption, expected):
+    results = get_consumption_results(system_consumption)
+    expected = get_consumption_results(expected)
+    for name in ("sensoring_energy", "communications_energy", "microcontroller_energy", "total_energy"):
+        assert results[name] == pytest.approx(expected[name], rel=1e-12)
+    for element, expected_element in zip(results["sensors"] + [results["microcontroller"], results["radio_interface"]],
+                                         expected["sensors"] + [expected["microcontroller"], expected["radio_interface"]]):
+        assert element == pytest.approx(expected_element, rel=1e-12)
+
+@pytest.mark.parametrize("mode", ["timeline", "analytic"])
+def test_updates_match_a_full_recompute(sensors, microcontroller, radio_interface, mode):
+    model = SystemConsumptionModel(sensors, microcontroller, radio_interface, 86400, mode)
+    for component, index, fields, recomputed_elements in CHANGES:
+        system_consumption = apply_change(model, component, index, fields)
+        assert model.recomputed_elements == recomputed_elements
+        assert_same_results(system_consumption, get_system_energy_consumption(model.sensors, model.microcontroller, model.radio_interface, model.duration, mode))
+
+@pytest.mark.parametrize("mode", ["timeline", "analytic"])
+def test_updates_with_packets_and_states_match_a_full_recompute(sensors, microcontroller, radio_interface, mode):
+    packet_model = PacketModel(40, 100, 0.1, 3)
+    state_models = get_state_models(sensors, microcontroller, radio_interface)
+    model = SystemConsumptionModel(sensors, microcontroller, radio_interface, 86400, mode, packet_model=packet_model, **state_models)
+    for component, index, fields, recomputed_elements in CHANGES:
+        system_consumption = apply_change(model, component, index, fields)
+        expected = get_system_energy_consumption(model.sensors, model.microcontroller, model.radio_interface, model.duration, mode,
+                                                 packet_model=packet_model, **state_models)
+        assert_same_results(system_consumption, expected)
+
+def test_components_of_the_caller_are_not_modified(sensors, microcontroller, radio_interface):
+    model = SystemConsumptionModel(sensors, microcontroller, radio_interface, 3600)
+    model.set_sensor(0, active_time=5.0)
+    model.set_microcontroller(active_consumption=10.0)
+    assert sensors[0].active_time == 1.0 and microcontroller.active_consumption == 36.2
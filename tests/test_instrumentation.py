@@ -0,0 +1,42 @@
+import json
+import math
+import pytest
+
+from consumption_calculator import Instrumentation, get_system_energy_consumption
+from consumption_calculator.__main__ import run_config
+
+def test_stages_accumulate():
+    instrumentation = Instrumentation()
+    for _ in range(3):
+        instrumentation.start_stage("a")
+        instrumentation.start_stage("b")
+        instrumentation.count("items", 2)
+    instrumentation.stop_stage()
+    report = instrumentation.get_report()
+    assert {stage: values["calls"] for stage, values in report["stages"].items()} == {"a": 3, "b": 3}
+    assert report["total_time"] == pytest.approx(sum(values["time"] for values in report["stages"].values()))
+    assert report["counters"] == {"items": 6}
+
+def test_run_report(sensors, microcontroller, radio_interface, tmp_path):
+    battery = {"name": "18650", "capacity": 2000, "full_voltage": 4.2, "empty_voltage": 3.0, "cutoff_voltage": 3.3, "self_discharge": 0.03}
+    config = {"duration": 86400, "mode": "timeline", "sensors": [vars(sensor) for sensor in sensors], "microcontroller": vars(microcontroller),
+              "radio_interface": vars(radio_interface), "battery": battery}
+    instrumentation = Instrumentation()
+    results = run_config(config, instrumentation)
+    assert results == run_config(config)
+    instrumentation.write_report(str(tmp_path / "report.json"))
+    with open(tmp_path / "report.json") as file:
+        report = json.load(file)
+    # Every stage runs once, also with the battery lifetime
+    assert set(report["stages"]) >= {"components", "sensor_schedules", "radio_interface_schedule", "microcontroller_schedule", "battery_lifetime"}
+    assert all(values["calls"] == 1 for values in report["stages"].values())
+    assert report["counters"]["measurements"] == sum(math.ceil(sensor.sampling_rate * 86400) for sensor in sensors)
+    assert report["counters"]["transmissions"] == math.ceil(86400 * radio_interface.data_refresh_rate)
+
+def test_profile(sensors, microcontroller, radio_interface, tmp_path):
+    with pytest.raises(ValueError):
+        Instrumentation().dump_profile(str(tmp_path / "run.prof"))
+    instrumentation = Instrumentation(profile=True)
+    get_system_energy_consumption(sensors, microcontroller, radio_interface, 86400, instrumentation=instrumentation)
+    instrumentation.dump_profile(str(tmp_path / "run.prof"))
+    assert (tmp_path / "run.prof").stat().st_size > 0
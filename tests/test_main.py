@@ -0,0 +1,34 @@
+import argparse
+import json
+import pytest
+
+from consumption_calculator import get_system_energy_consumption
+from consumption_calculator.__main__ import run_config, run
+
+def get_config(sensors, microcontroller, radio_interface, **fields):
+    return {"duration": 86400, "sensors": [vars(sensor) for sensor in sensors], "microcontroller": vars(microcontroller),
+            "radio_interface": vars(radio_interface), **fields}
+
+BATTERY = {"name": "18650", "capacity": 2000, "full_voltage": 4.2, "empty_voltage": 3.0, "cutoff_voltage": 3.3, "self_discharge": 0}
+
+@pytest.mark.parametrize("mode", ["analytic", "timeline"])
+def test_run_config(sensors, microcontroller, radio_interface, mode):
+    results = run_config(get_config(sensors, microcontroller, radio_interface, mode=mode, battery=BATTERY))
+    system_consumption = get_system_energy_consumption(sensors, microcontroller, radio_interface, 86400, mode)
+    assert results["total_energy"] == pytest.approx(system_consumption.get_total_energy())
+    assert [sensor["name"] for sensor in results["sensors"]] == [sensor.name for sensor in sensors]
+    assert 0 < results["battery_lifetime"] < 365 * 86400
+
+def test_battery_without_load_has_a_null_lifetime(microcontroller, radio_interface, tmp_path):
+    # Without self-discharge and without any current the battery never reaches its cutoff voltage
+    config = get_config([], microcontroller, radio_interface, battery=BATTERY,
+                        monte_carlo={"samples": 100, "seed": 0, "distributions": {"battery.capacity": ["tolerance", 0.1]}})
+    config["microcontroller"].update(active_consumption=0, light_sleep_consumption=0, deep_sleep_consumption=0)
+    config["radio_interface"].update(transmit_consumption=0, receive_consumption=0, inactive_consumption=0)
+    results = run_config(config)
+    assert results["battery_lifetime"] is None
+    assert set(results["monte_carlo"]["battery_lifetime"].values()) == {None}
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(config))
+    run(argparse.Namespace(config=str(config_file), output=str(tmp_path / "results.json"), report=None, profile=None))
+    assert json.loads((tmp_path / "results.json").read_text())["battery_lifetime"] is None
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from consumption_calculator import (Sensor, Microcontroller, RadioInterface, PacketModel, SENSOR_FIELDS, MICROCONTROLLER_FIELDS, RADIO_INTERFACE_FIELDS,
+                                    get_system_energy_consumption, get_energy_arrays, get_consumption_results)
+
+@pytest.mark.parametrize("duration", [3600, 86400, 7 * 86400 + 123])
+def test_analytic_totals_match_timeline_totals(sensors, microcontroller, radio_interface, duration):
+    timeline = get_consumption_results(get_system_energy_consumption(sensors, microcontroller, radio_interface, duration, "timeline"))
+    analytic = get_consumption_results(get_system_energy_consumption(sensors, microcontroller, radio_interface, duration, "analytic"))
+    for name in ("sensoring_energy", "communications_energy", "microcontroller_energy", "total_energy"):
+        assert analytic[name] == pytest.approx(timeline[name])
+    for timeline_element, analytic_element in zip(timeline["sensors"] + [timeline["microcontroller"], timeline["radio_interface"]],
+                                                  analytic["sensors"] + [analytic["microcontroller"], analytic["radio_interface"]]):
+        assert analytic_element == pytest.approx(timeline_element)
+
+def test_analytic_mode_has_no_schedules(sensors, microcontroller, radio_interface):
+    system_consumption = get_system_energy_consumption(sensors, microcontroller, radio_interface, 86400, "analytic")
+    assert system_consumption.get_microcontroller_consumption().schedule is None
+    assert all(sensor.schedule is None for sensor in system_consumption.get_sensoring_consumption())
+
+def test_invalid_mode(sensors, microcontroller, radio_interface):
+    with pytest.raises(ValueError):
+        get_system_energy_consumption(sensors, microcontroller, radio_interface, 86400, "dense")
+
+def get_random_systems(rng, number_of_systems):
+    systems = []
+    for i in range(number_of_systems):
+        sensors = [Sensor(f"sensor {j}", 3.3, rng.uniform(1, 50), rng.uniform(0.001, 5), rng.uniform(1 / 3600, 1 / 60), rng.uniform(0.1, 10), rng.uniform(2, 64))
+                   for j in range(rng.integers(1, 5))]
+        microcontroller = Microcontroller("microcontroller", 3.3, rng.uniform(10, 50), rng.uniform(1, 5), rng.uniform(0.001, 0.1))
+        radio_interface = RadioInterface("radio interface", 3.3, rng.uniform(50, 200), rng.uniform(20, 80), rng.uniform(0.001, 0.1), rng.uniform(250, 250000), rng.uniform(1 / 3600, 1 / 60))
+        systems.append((sensors, microcontroller, radio_interface))
+    return systems
+
+def get_system_arrays(systems):
+    # Fields of get_energy_arrays with one row per system, padding the sensors with zeros
+    max_sensors = max(len(sensors) for sensors, microcontroller, radio_interface in systems)
+    sensor_fields = {field: np.zeros((len(systems), max_sensors)) for field in SENSOR_FIELDS if field != "name"}
+    for i, (sensors, microcontroller, radio_interface) in enumerate(systems):
+        for j, sensor in enumerate(sensors):
+            for field in sensor_fields:
+                sensor_fields[field][i, j] = getattr(sensor, field)
+    microcontroller_fields = {field: np.array([getattr(system[1], field) for system in systems]) for field in MICROCONTROLLER_FIELDS if field != "name"}
+    radio_interface_fields = {field: np.array([getattr(system[2], field) for system in systems]) for field in RADIO_INTERFACE_FIELDS if field != "name"}
+    return sensor_fields, microcontroller_fields, radio_interface_fields
+
+@pytest.mark.parametrize("packet_model", [None, PacketModel(40, 100, 0.1, 3), PacketModel(40)])
+def test_energy_arrays_match_every_system(packet_model):
+    systems = get_random_systems(np.random.default_rng(0), 20)
+    sensor_fields, microcontroller_fields, radio_interface_fields = get_system_arrays(systems)
+    if packet_model is not None:
+        mtu = packet_model.mtu if packet_model.mtu is not None else np.inf
+        radio_interface_fields.update(header_size=packet_model.header_size, mtu=mtu, retry_probability=packet_model.retry_probability, max_retries=packet_model.max_retries)
+    energies = get_energy_arrays(sensor_fields, microcontroller_fields, radio_interface_fields, 86400)
+    for i, (sensors, microcontroller, radio_interface) in enumerate(systems):
+        results = get_consumption_results(get_system_energy_consumption(sensors, microcontroller, radio_interface, 86400, "analytic", packet_model=packet_model))
+        for name in ("sensoring_energy", "communications_energy", "microcontroller_energy", "total_energy"):
+            assert energies[name][i] == pytest.approx(results[name])
+
+def test_energy_arrays_broadcast_the_duration():
+    systems = get_random_systems(np.random.default_rng(1), 5)
+    durations = np.array([[3600], [86400]])
+    energies = get_energy_arrays(*get_system_arrays(systems), durations)
+    assert energies["total_energy"].shape == (2, 5)
+    assert energies["total_energy"][1] == pytest.approx(get_energy_arrays(*get_system_arrays(systems), 86400)["total_energy"])
+
+@pytest.mark.parametrize("packet_model", [PacketModel(40, 100, 0.1, 3), PacketModel(40)])
+def test_packet_totals_follow_the_timeline(sensors, microcontroller, radio_interface, packet_model):
+    # The analytic mode spreads the data evenly over the transmissions instead of counting the packets of every one
+    timeline = get_system_energy_consumption(sensors, microcontroller, radio_interface, 86400, "timeline", packet_model=packet_model)
+    analytic = get_system_energy_consumption(sensors, microcontroller, radio_interface, 86400, "analytic", packet_model=packet_model)
+    assert analytic.get_communications_energy_consumption() == pytest.approx(timeline.get_communications_energy_consumption(), rel=1e-2)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from consumption_calculator import Battery, get_system_energy_consumption, get_monte_carlo_consumption
+from consumption_calculator.__main__ import run_config
+
+def test_samples_without_distributions_are_the_nominal_system(sensors, microcontroller, radio_interface):
+    monte_carlo_consumption = get_monte_carlo_consumption(sensors, microcontroller, radio_interface, 86400, {}, 10)
+    expected = get_system_energy_consumption(sensors, microcontroller, radio_interface, 86400, "analytic").get_total_energy()
+    assert monte_carlo_consumption.energies["total_energy"] == pytest.approx(np.full(10, expected))
+
+def test_analytic_battery_lifetime_matches_monte_carlo(sensors, microcontroller, radio_interface):
+    battery = Battery("18650", 2000, 4.2, 3.0, 3.3, 0.03)
+    config = {"duration": 86400, "sensors": [vars(sensor) for sensor in sensors], "microcontroller": vars(microcontroller),
+              "radio_interface": vars(radio_interface), "battery": vars(battery)}
+    monte_carlo_consumption = get_monte_carlo_consumption(sensors, microcontroller, radio_interface, 86400, {}, 10, battery)
+    assert run_config(config)["battery_lifetime"] == pytest.approx(monte_carlo_consumption.battery_lifetimes[0], rel=1e-12)
+
+def test_distribution_of_a_single_sensor(sensors, microcontroller, radio_interface):
+    nominal = get_monte_carlo_consumption(sensors, microcontroller, radio_interface, 86400, {}, 1000)
+    first_sensor = get_monte_carlo_consumption(sensors, microcontroller, radio_interface, 86400, {"sensors.0.active_consumption": ["tolerance", 0.5]}, 1000, seed=0)
+    sensoring_energy = first_sensor.energies["sensoring_energy"]
+    assert np.ptp(sensoring_energy) > 0
+    # Only the active energy of the first sensor changes, by at most half of it
+    active_energy = sensors[0].active_consumption * sensors[0].active_time * sensors[0].sampling_rate * 86400
+    assert np.all(np.abs(sensoring_energy - nominal.energies["sensoring_energy"]) <= 0.5 * active_energy * (1 + 1e-9))
+
+def test_percentiles_are_ordered(sensors, microcontroller, radio_interface):
+    monte_carlo_consumption = get_monte_carlo_consumption(sensors, microcontroller, radio_interface, 86400, {"sensors.active_time": ["tolerance", 0.2]}, 1000,
+                                                          Battery("18650", 2000, 4.2, 3.0, 3.3, 0.03), seed=0)
+    percentiles = monte_carlo_consumption.get_percentiles()
+    assert percentiles["total_energy"][5] < percentiles["total_energy"][50] < percentiles["total_energy"][95]
+    assert percentiles["battery_lifetime"][5] < percentiles["battery_lifetime"][95]
+
+@pytest.mark.parametrize("key", ["microcontroller.0.active_consumption", "sensors.9.active_time", "sensors.x.active_time", "sensors.-1.active_time",
+                                 "sensors.name", "sensors.0.name", "radio_interface.speed", "antenna.gain"])
+def test_unknown_fields_are_rejected(sensors, microcontroller, radio_interface, key):
+    with pytest.raises(ValueError):
+        get_monte_carlo_consumption(sensors, microcontroller, radio_interface, 86400, {key: ["tolerance", 0.5]}, 10)
+
+def test_battery_distribution_needs_a_battery(sensors, microcontroller, radio_interface):
+    with pytest.raises(ValueError, match="no battery"):
+        get_monte_carlo_consumption(sensors, microcontroller, radio_interface, 86400, {"battery.capacity": ["tolerance", 0.1]}, 10)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from consumption_calculator import Sensor, Microcontroller, RadioInterface, get_system_energy_consumption, optimize_system_configuration
+
+def get_catalog(microcontroller, radio_interface):
+    microcontrollers = [microcontroller, Microcontroller("low power", 3.3, 5.0, 1.0, 0.002), Microcontroller("high power", 3.3, 80.0, 10.0, 1.0)]
+    radio_interfaces = [radio_interface, RadioInterface("lora", 3.3, 40.0, 11.0, 0.001, 5470.0, 0.001), RadioInterface("wifi", 3.3, 300.0, 100.0, 0.1, 1e6, 0.01)]
+    return microcontrollers, radio_interfaces
+
+@pytest.mark.parametrize("min_samples_per_hour", [0, -1, [2, 0, 2]])
+def test_minimum_sampling_rates_must_be_positive(sensors, microcontroller, radio_interface, min_samples_per_hour):
+    with pytest.raises(ValueError):
+        optimize_system_configuration(sensors, [microcontroller], [radio_interface], 86400, 3600, min_samples_per_hour)
+
+def test_front_respects_the_constraints(sensors, microcontroller, radio_interface):
+    pareto_front = optimize_system_configuration(sensors, *get_catalog(microcontroller, radio_interface), 86400, 3600, [2, 1, 3])
+    assert len(pareto_front.candidates) > 0
+    latencies = [candidate.get_latency() for candidate in pareto_front.candidates]
+    energies = [candidate.energy for candidate in pareto_front.candidates]
+    # Sorted by latency, and a longer latency is only on the front if it lowers the energy
+    assert latencies == sorted(latencies) and np.all(np.diff(energies) < 0)
+    for candidate in pareto_front.candidates:
+        assert 60 * (1 - 1e-9) <= candidate.get_latency() <= 3600 * (1 + 1e-9)
+        assert np.all(np.array(candidate.sampling_rates) * 3600 >= np.array([2, 1, 3]) * (1 - 1e-9))
+        configured_sensors = [Sensor(**{**vars(sensor), "sampling_rate": sampling_rate}) for sensor, sampling_rate in zip(sensors, candidate.sampling_rates)]
+        configured_radio_interface = RadioInterface(**{**vars(candidate.radio_interface), "data_refresh_rate": candidate.data_refresh_rate})
+        system_consumption = get_system_energy_consumption(configured_sensors, candidate.microcontroller, configured_radio_interface, 86400, "analytic")
+        assert candidate.energy == pytest.approx(system_consumption.get_total_energy())
+
+def test_lowest_energy_matches_every_pair(sensors, microcontroller, radio_interface):
+    # The energy only grows with the sampling rates and the data refresh rate here, so the optimum of every pair is at the bounds
+    microcontrollers, radio_interfaces = get_catalog(microcontroller, radio_interface)
+    pareto_front = optimize_system_configuration(sensors, microcontrollers, radio_interfaces, 86400, 3600, 2)
+    configured_sensors = [Sensor(**{**vars(sensor), "sampling_rate": 2 / 3600}) for sensor in sensors]
+    lowest_energy = min(get_system_energy_consumption(configured_sensors, pair_microcontroller, RadioInterface(**{**vars(pair_radio_interface), "data_refresh_rate": 1 / 3600}),
+                                                      86400, "analytic").get_total_energy()
+                        for pair_microcontroller in microcontrollers for pair_radio_interface in radio_interfaces)
+    assert pareto_front.get_lowest_energy().energy == pytest.approx(lowest_energy)
+    assert pareto_front.number_of_evaluated_pairs + pareto_front.number_of_pruned_pairs == 9
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from consumption_calculator.reporting import get_min_max_indices, get_bucket_size, get_bucket_min_max_indices
+
+def test_short_lines_are_kept():
+    values = np.random.default_rng(0).uniform(size=100)
+    assert np.array_equal(get_min_max_indices(values, 100), np.arange(100))
+
+@pytest.mark.parametrize("number_of_samples", [10001, 86400, 123457])
+def test_minimum_and_maximum_of_every_bucket_are_kept(number_of_samples):
+    values = np.random.default_rng(number_of_samples).uniform(size=number_of_samples)
+    indices = get_min_max_indices(values, 4000)
+    assert len(indices) <= 4000 + 2
+    assert indices[0] == 0 and indices[-1] == number_of_samples - 1
+    assert np.all(np.diff(indices) > 0)
+    bucket_size = get_bucket_size(number_of_samples, 4000)
+    for first in range(0, number_of_samples, bucket_size):
+        bucket = values[first:first + bucket_size]
+        kept = values[indices[(indices >= first) & (indices < first + bucket_size)]]
+        assert kept.min() == bucket.min() and kept.max() == bucket.max()
+
+def test_short_peaks_stay_visible():
+    values = np.zeros(1000000)
+    values[[12345, 777777]] = 138.0
+    indices = get_min_max_indices(values, 4000)
+    assert {12345, 777777} <= set(indices.tolist())
+
+def test_windows_of_whole_buckets_match_the_whole_line():
+    values = np.random.default_rng(0).uniform(size=100000)
+    bucket_size = get_bucket_size(len(values), 4000)
+    window = 7 * bucket_size
+    windows = [first + get_bucket_min_max_indices(values[first:first + window], bucket_size) for first in range(0, len(values), window)]
+    assert np.array_equal(np.concatenate(windows), get_bucket_min_max_indices(values, bucket_size))
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from consumption_calculator import Schedule
+
+def get_random_intervals(rng, duration, number_of_intervals):
+    # Integer bounds, so every sample is either fully inside or fully outside of every interval
+    starts = rng.integers(0, duration, number_of_intervals)
+    ends = starts + rng.integers(1, 20, number_of_intervals)
+    return starts, ends
+
+def get_dense(starts, ends, duration):
+    dense = np.zeros(duration, dtype=bool)
+    for start, end in zip(starts, ends):
+        dense[start:min(end, duration)] = True
+    return dense
+
+@pytest.mark.parametrize("seed", range(5))
+def test_to_dense_matches_intervals(seed):
+    rng = np.random.default_rng(seed)
+    starts, ends = get_random_intervals(rng, 1000, 50)
+    schedule = Schedule(starts, ends, 1000)
+    dense = get_dense(starts, ends, 1000)
+    assert np.array_equal(schedule.to_dense(), dense)
+    assert schedule.get_total_active_time() == np.count_nonzero(dense)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_union_and_intersection_match_dense(seed):
+    rng = np.random.default_rng(seed)
+    intervals = [get_random_intervals(rng, 500, number_of_intervals) for number_of_intervals in (40, 30, 60)]
+    schedules = [Schedule(starts, ends, 500) for starts, ends in intervals]
+    denses = [get_dense(starts, ends, 500) for starts, ends in intervals]
+    assert np.array_equal(schedules[0].union(*schedules[1:]).to_dense(), np.logical_or.reduce(denses))
+    assert np.array_equal(schedules[0].intersection(*schedules[1:]).to_dense(), np.logical_and.reduce(denses))
+
+def test_windows_of_to_dense_match_the_whole_timeline():
+    rng = np.random.default_rng(0)
+    starts = np.sort(rng.uniform(0, 100, 40))
+    schedule = Schedule(starts, starts + rng.uniform(0, 2, 40), 100, resolution=10)
+    dense = schedule.to_dense()
+    windows = [schedule.to_dense(first_sample=first, last_sample=min(first + 70, len(dense))) for first in range(0, len(dense), 70)]
+    assert np.array_equal(np.concatenate(windows), dense)
+
+def test_active_time_per_bucket():
+    schedule = Schedule([5, 58, 130], [10, 65, 200], 200)
+    assert np.allclose(schedule.get_active_time_per_bucket(60), [7, 5, 50, 20])
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import time
+from http import HTTPStatus
+
+from consumption_calculator import service
+from consumption_calculator.service import ConsumptionService
+from consumption_calculator.__main__ import run_config
+
+class ResponseWriter:
+    # Collects what the service writes to a connection
+    def __init__(self):
+        self.data = b""
+    def write(self, data):
+        self.data += data
+    async def drain(self):
+        pass
+
+def get_service(sensors, microcontroller, radio_interface):
+    # Runs go to the default thread pool of the event loop, as the service has no worker processes until it serves
+    return ConsumptionService({
+        "sensor": {sensor.name: vars(sensor) for sensor in sensors},
+        "microcontroller": {microcontroller.name: vars(microcontroller)},
+        "radio_interface": {radio_interface.name: vars(radio_interface)}})
+
+def get_config(sensors, microcontroller, radio_interface):
+    return {"duration": 86400, "sensors": [sensor.name for sensor in sensors], "microcontroller": microcontroller.name, "radio_interface": vars(radio_interface)}
+
+def test_run_with_components_by_name(sensors, microcontroller, radio_interface):
+    consumption_service = get_service(sensors, microcontroller, radio_interface)
+    config = get_config(sensors, microcontroller, radio_interface)
+    status, response = asyncio.run(consumption_service.handle_request("POST", "/run", json.dumps(config).encode()))
+    assert status == HTTPStatus.OK
+    assert response == run_config({**config, "sensors": [vars(sensor) for sensor in sensors], "microcontroller": vars(microcontroller)})
+
+def test_catalog_and_health(sensors, microcontroller, radio_interface):
+    consumption_service = get_service(sensors, microcontroller, radio_interface)
+    async def get(target, method="GET", body=b""):
+        return await consumption_service.handle_request(method, target, body)
+    assert asyncio.run(get("/catalog/sensor")) == (HTTPStatus.OK, [vars(sensor) for sensor in sensors])
+    assert asyncio.run(get("/catalog/sensor/humidity%20sensor")) == (HTTPStatus.OK, vars(sensors[0]))
+    assert asyncio.run(get("/catalog/sensor/pressure"))[0] == HTTPStatus.NOT_FOUND
+    assert asyncio.run(get("/catalog/battery"))[0] == HTTPStatus.NOT_FOUND
+    assert asyncio.run(get("/run"))[0] == HTTPStatus.METHOD_NOT_ALLOWED
+    assert asyncio.run(get("/health", "POST"))[0] == HTTPStatus.METHOD_NOT_ALLOWED
+    status, health = asyncio.run(get("/health"))
+    assert status == HTTPStatus.OK and health["catalog"] == {"sensor": 3, "microcontroller": 1, "radio_interface": 1}
+
+def test_bad_requests(sensors, microcontroller, radio_interface):
+    consumption_service = get_service(sensors, microcontroller, radio_interface)
+    config = {**get_config(sensors, microcontroller, radio_interface), "microcontroller": "ESP8266"}
+    for body in (b"{", b"[1, 2]", json.dumps(config).encode()):
+        status, response = asyncio.run(consumption_service.handle_request("POST", "/run", body))
+        assert status == HTTPStatus.BAD_REQUEST and "error" in response
+
+def test_identical_runs_in_flight_are_coalesced(sensors, microcontroller, radio_interface, monkeypatch):
+    calls = []
+    def evaluate_config(config):
+        calls.append(config)
+        time.sleep(0.1)
+        return {"total_energy": 1.0}
+    monkeypatch.setattr(service, "evaluate_config", evaluate_config)
+    consumption_service = get_service(sensors, microcontroller, radio_interface)
+    config = get_config(sensors, microcontroller, radio_interface)
+    # The same configuration with the components by name and by their fields
+    same_config = {**config, "microcontroller": vars(microcontroller)}
+    async def run_all():
+        return await asyncio.gather(consumption_service.run(config), consumption_service.run(same_config), consumption_service.run({**config, "duration": 3600}))
+    results = asyncio.run(run_all())
+    assert results == [{"total_energy": 1.0}] * 3
+    assert len(calls) == 2
+    assert (consumption_service.requests, consumption_service.coalesced_requests) == (3, 1)
+    assert consumption_service.in_flight == {}
+
+def test_responses_are_valid_json(sensors, microcontroller, radio_interface):
+    consumption_service = get_service(sensors, microcontroller, radio_interface)
+    writer = ResponseWriter()
+    asyncio.run(consumption_service.write_response(writer, HTTPStatus.OK, {"battery_lifetime": float("inf")}, False))
+    headers, _, body = writer.data.partition(b"\r\n\r\n")
+    assert headers.startswith(b"HTTP/1.1 500")
+    assert "error" in json.loads(body)
+
+def test_battery_without_load_over_http(microcontroller, radio_interface):
+    consumption_service = ConsumptionService({"sensor": {}, "microcontroller": {}, "radio_interface": {}})
+    config = {"duration": 86400, "sensors": [],
+              "microcontroller": {**vars(microcontroller), "active_consumption": 0, "light_sleep_consumption": 0, "deep_sleep_consumption": 0},
+              "radio_interface": {**vars(radio_interface), "transmit_consumption": 0, "receive_consumption": 0, "inactive_consumption": 0},
+              "battery": {"name": "18650", "capacity": 2000, "full_voltage": 4.2, "empty_voltage": 3.0, "cutoff_voltage": 3.3, "self_discharge": 0}}
+    async def request():
+        status, response = await consumption_service.handle_request("POST", "/run", json.dumps(config).encode())
+        writer = ResponseWriter()
+        await consumption_service.write_response(writer, status, response, False)
+        return writer.data
+    headers, _, body = asyncio.run(request()).partition(b"\r\n\r\n")
+    assert headers.startswith(b"HTTP/1.1 200")
+    assert json.loads(body)["battery_lifetime"] is None
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from consumption_calculator import get_system_energy_consumption, simulate_consumption
+
+def test_windows_match_a_single_window(sensors, microcontroller, radio_interface):
+    system_consumption = get_system_energy_consumption(sensors, microcontroller, radio_interface, 86400)
+    whole = list(simulate_consumption(system_consumption, window=86400))
+    windows = list(simulate_consumption(system_consumption, window=3600))
+    assert len(whole) == 1 and len(windows) == 24
+    assert np.array_equal(np.concatenate([window.currents for window in windows], axis=1), whole[0].currents)
+    assert windows[-1].aggregate.get_charge() == pytest.approx(whole[0].aggregate.get_charge())
+    assert np.array_equal(windows[-1].aggregate.get_peak_current(), whole[0].aggregate.get_peak_current())
+
+def test_last_window_is_cut_at_the_duration(sensors, microcontroller, radio_interface):
+    system_consumption = get_system_energy_consumption(sensors, microcontroller, radio_interface, 5000)
+    windows = list(simulate_consumption(system_consumption, window=3600))
+    assert [(window.start, window.end) for window in windows] == [(0, 3600), (3600, 5000)]
+    assert windows[-1].aggregate.number_of_samples == 5000
+
+def test_timeline_functions_reject_analytic_results(sensors, microcontroller, radio_interface):
+    system_consumption = get_system_energy_consumption(sensors, microcontroller, radio_interface, 3600, "analytic")
+    with pytest.raises(ValueError, match="mode='timeline'"):
+        next(simulate_consumption(system_consumption))
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from consumption_calculator import (Schedule, get_system_energy_consumption, get_microcontroller_state_model, get_radio_interface_state_model,
+                                    get_sensor_state_model, get_state_consumption, get_periodic_state_consumption)
+
+@pytest.mark.parametrize("period, active_time", [(100, 2), (10, 3), (1000, 0.5)])
+def test_periodic_count_matches_a_periodic_schedule(radio_interface, period, active_time):
+    # Every gap of the analytic count ends with a wake-up, the last one of the timeline does not: they differ by one wake-up
+    state_model = get_radio_interface_state_model(radio_interface, receive_time=1.0, wake_up_energy=1, wake_up_latency=0.25)
+    starts = np.arange(0, 86400, period, dtype=float)
+    timeline = get_state_consumption(state_model, Schedule(starts, starts + active_time, 86400))
+    analytic = get_periodic_state_consumption(state_model, len(starts), len(starts) * active_time, 86400)
+    for state, dwell_time in timeline.dwell_times.items():
+        assert analytic.dwell_times[state] == pytest.approx(dwell_time, abs=0.25 + 1e-9)
+    assert analytic.transition_counts[("inactive", "transmit")] == timeline.transition_counts[("inactive", "transmit")] + 1
+    assert analytic.get_total_energy() == pytest.approx(timeline.get_total_energy(), abs=1 + 0.25 * radio_interface.transmit_consumption)
+
+def test_deep_sleep_threshold(microcontroller):
+    state_model = get_microcontroller_state_model(microcontroller, deep_sleep_threshold=30, wake_up_energy=0.5, wake_up_latency=0.01)
+    short_gaps = get_periodic_state_consumption(state_model, 100, 100, 2000)
+    long_gaps = get_periodic_state_consumption(state_model, 10, 10, 2000)
+    assert short_gaps.dwell_times["deep_sleep"] == 0 and short_gaps.dwell_times["light_sleep"] == pytest.approx(1900)
+    assert long_gaps.dwell_times["light_sleep"] == 0 and long_gaps.get_transition_energy() == pytest.approx(10 * 0.5)
+
+def test_periodic_count_broadcasts(sensors):
+    state_model = get_sensor_state_model(sensors[0], wake_up_energy=0.2, wake_up_latency=0.05)
+    number_of_activities = np.array([10, 100, 0])
+    energies = get_periodic_state_consumption(state_model, number_of_activities, number_of_activities * 1.0, 3600).get_total_energy()
+    for energy, activities in zip(energies, number_of_activities):
+        assert energy == pytest.approx(get_periodic_state_consumption(state_model, activities, activities * 1.0, 3600).get_total_energy())
+
+def test_dwell_times_cover_the_duration(microcontroller, sensors, radio_interface):
+    state_model = get_microcontroller_state_model(microcontroller, deep_sleep_threshold=30, wake_up_energy=0.5, wake_up_latency=0.01)
+    system_consumption = get_system_energy_consumption(sensors, microcontroller, radio_interface, 86400, microcontroller_state_model=state_model)
+    state_consumption = system_consumption.get_microcontroller_consumption().state_consumption
+    assert sum(state_consumption.dwell_times.values()) == pytest.approx(86400)
+
+def test_analytic_state_models_follow_the_timeline(sensors, microcontroller, radio_interface):
+    # Sensors and the radio interface are periodic, so they only differ at the end of the duration, where the
+    # timeline cuts the last transmission. Overlapping activities of the microcontroller are not merged in the analytic mode
+    state_models = {
+        "microcontroller_state_model": get_microcontroller_state_model(microcontroller, deep_sleep_threshold=30, wake_up_energy=0.5, wake_up_latency=0.01),
+        "radio_interface_state_model": get_radio_interface_state_model(radio_interface, receive_time=0.5, wake_up_energy=1, wake_up_latency=0.002),
+        "sensor_state_models": [get_sensor_state_model(sensor, wake_up_energy=0.2, wake_up_latency=0.05) for sensor in sensors]}
+    timeline = get_system_energy_consumption(sensors, microcontroller, radio_interface, 7 * 86400, "timeline", **state_models)
+    analytic = get_system_energy_consumption(sensors, microcontroller, radio_interface, 7 * 86400, "analytic", **state_models)
+    for timeline_element, analytic_element in zip(timeline.get_sensoring_consumption(), analytic.get_sensoring_consumption()):
+        assert analytic_element.get_total_energy() == pytest.approx(timeline_element.get_total_energy(), rel=1e-3)
+    assert analytic.get_communications_energy_consumption() == pytest.approx(timeline.get_communications_energy_consumption(), rel=1e-2)
+    assert analytic.get_microcontroller_energy_consumption() == pytest.approx(timeline.get_microcontroller_energy_consumption(), rel=0.05)
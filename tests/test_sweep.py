@@ -0,0 +1,30 @@
+import itertools
+import pytest
+
+from consumption_calculator import Sensor, RadioInterface, get_system_energy_consumption, sweep_system_energy_consumption
+
+def test_sweep_matches_every_configuration(sensors, microcontroller, radio_interface):
+    sensor_subsets = [sensors[:1], sensors]
+    sampling_rates = [None, 0.01]
+    data_refresh_rates = [0.0003, 0.001]
+    durations = [3600, 86400]
+    # Small batches so that the configurations are split over several tasks
+    results = sweep_system_energy_consumption(sensor_subsets, [microcontroller], [radio_interface], sampling_rates, data_refresh_rates, durations,
+                                              max_workers=2, batch_size=3)
+    assert len(results) == 16
+    configurations = itertools.product(sensor_subsets, sampling_rates, data_refresh_rates, durations)
+    for (_, row), (sensor_subset, sampling_rate, data_refresh_rate, duration) in zip(results.iterrows(), configurations):
+        if sampling_rate is not None:
+            sensor_subset = [Sensor(**{**vars(sensor), "sampling_rate": sampling_rate}) for sensor in sensor_subset]
+        expected = get_system_energy_consumption(sensor_subset, microcontroller, RadioInterface(**{**vars(radio_interface), "data_refresh_rate": data_refresh_rate}),
+                                                 duration, "analytic")
+        assert row["data_refresh_rate"] == data_refresh_rate and row["duration"] == duration
+        assert row["total_energy"] == pytest.approx(expected.get_total_energy())
+        assert row["communications_energy"] == pytest.approx(expected.get_communications_energy_consumption())
+
+def test_sweep_with_state_options(sensors, microcontroller, radio_interface):
+    results = sweep_system_energy_consumption([sensors], [microcontroller], [radio_interface], max_workers=1,
+                                              microcontroller_state_options={"deep_sleep_threshold": 30, "wake_up_energy": 0.5})
+    plain = sweep_system_energy_consumption([sensors], [microcontroller], [radio_interface], max_workers=1)
+    assert results["sensoring_energy"][0] == pytest.approx(plain["sensoring_energy"][0])
+    assert results["microcontroller_energy"][0] != pytest.approx(plain["microcontroller_energy"][0])
@@ -0,0 +1,50 @@
+import math
+import numpy as np
+import pytest
+
+from consumption_calculator import Sensor, RadioInterface, PacketModel, get_transmission_events, get_transmission_time_arrays
+
+def get_buffered_payloads(sensors, radio_interface, duration):
+    # Reference: every measure (scheduled as in get_sensor_consumption) is sent by the first transmission that ends after it
+    number_of_transmissions = math.ceil(duration * radio_interface.data_refresh_rate)
+    period_ends = np.minimum(np.arange(1, number_of_transmissions + 1) / radio_interface.data_refresh_rate, duration)
+    count_times = np.append(period_ends[:-1], np.inf)
+    payloads = np.zeros(number_of_transmissions)
+    first_measure_time = 0
+    for sensor in sensors:
+        number_of_measures = sensor.sampling_rate * duration
+        measure_times = first_measure_time + duration / number_of_measures * np.arange(math.ceil(number_of_measures))
+        for measure_time in measure_times[measure_times <= duration]:
+            payloads[np.searchsorted(count_times, measure_time, side='right')] += sensor.data_volume
+        first_measure_time += sensor.active_time
+    return period_ends, payloads
+
+@pytest.mark.parametrize("seed", range(10))
+def test_payloads_match_the_measures_of_every_period(seed):
+    rng = np.random.default_rng(seed)
+    sensors = [Sensor(f"sensor {i}", 3.3, 10, 1, rng.uniform(1 / 3600, 1 / 10), rng.uniform(0.1, 20), rng.integers(1, 64)) for i in range(rng.integers(1, 4))]
+    radio_interface = RadioInterface("radio interface", 3.3, 100, 50, 0.01, 250, rng.uniform(1 / 7200, 1 / 60))
+    duration = int(rng.integers(3600, 86400))
+    events = get_transmission_events(sensors, radio_interface, duration, PacketModel())
+    period_ends, payloads = get_buffered_payloads(sensors, radio_interface, duration)
+    sent = payloads > 0
+    assert np.array_equal(events.payloads, payloads[sent])
+    assert events.start_times + events.airtimes == pytest.approx(period_ends[sent])
+
+def test_packets_headers_and_retries(sensors, radio_interface):
+    packet_model = PacketModel(header_size=40, mtu=25, retry_probability=0.2, max_retries=2)
+    events = get_transmission_events(sensors, radio_interface, 86400, packet_model)
+    assert np.array_equal(events.packets, np.ceil(events.payloads / 25))
+    expected_attempts = 1 + 0.2 + 0.2**2
+    assert events.attempts == pytest.approx(events.packets * expected_attempts)
+    assert events.airtimes == pytest.approx((events.payloads + 40 * events.packets) * 8 / radio_interface.datarate * expected_attempts)
+    assert events.get_delivery_ratio() == pytest.approx(1 - 0.2**3)
+
+def test_without_packet_limit_every_transmission_is_one_packet(sensors, radio_interface):
+    events = get_transmission_events(sensors, radio_interface, 86400, PacketModel())
+    assert np.all(events.packets == 1)
+    assert events.get_total_payload() == pytest.approx(sum(sensor.data_volume * math.floor(sensor.sampling_rate * 86400 + 1) for sensor in sensors))
+    assert events.get_delivery_ratio() == 1.0
+
+def test_empty_payloads_send_nothing():
+    assert get_transmission_time_arrays([0, 100], 250, header_size=40, mtu=100).tolist() == [0, 140 * 8 / 250]